@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Two-pass archive scan for long recordings
+Pass 1 samples sparse frames (about 2 per second, by seeking) and runs only the nano plate
+detector on them. Pass 2 runs the full OCR and stability pipeline on every frame of short
+windows around the pass-1 hits, so hours without traffic are never decoded at full rate.
+"""
+
+import time
+from collections import namedtuple
+
+from async_runtime import CaptureSource, FrameItem
+from plate_pipeline import detect_plate_boxes
+
+# phase: 'sparse' or 'dense'; eta in seconds (None until the first unit of work is done)
+ScanProgress = namedtuple('ScanProgress', ['phase', 'done', 'total', 'elapsed', 'eta', 'hits'])
+
+CAP_PROP_POS_FRAMES = 1  # cv2.CAP_PROP_POS_FRAMES, without importing cv2 for seeking
+
+
+def sample_positions(frame_count, fps, sample_fps=2.0):
+    """Frame indices sampled at about sample_fps"""
+    step = max(1, int(round(fps / sample_fps))) if fps > 0 and sample_fps > 0 else 1
+    return list(range(0, max(0, frame_count), step))
+
+
+def hit_windows(hit_frames, fps, frame_count, before=2.0, after=3.0):
+    """Merged [start, end) frame windows around each hit frame, clipped to the video"""
+    windows = []
+    for frame in sorted(hit_frames):
+        start = max(0, frame - int(before * fps))
+        end = min(frame_count, frame + int(after * fps) + 1)
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+        else:
+            windows.append((start, end))
+    return windows
+
+
+def window_frames(windows):
+    return sum(end - start for start, end in windows)
+
+
+def eta_seconds(done, total, elapsed):
+    """Remaining time at the average rate so far; None before any progress"""
+    if done <= 0:
+        return None
+    return elapsed * max(0, total - done) / done
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def seek(cap, position, target, max_grab=5):
+    """Move cap from frame index `position` (None if unknown) to `target`: grab short gaps, seek longer ones"""
+    gap = target - position if position is not None else -1
+    if 0 <= gap <= max_grab:
+        for _ in range(gap):
+            if not cap.grab():
+                return False
+        return True
+    return cap.set(CAP_PROP_POS_FRAMES, target)
+
+
+def sparse_scan(cap, detector, positions, conf, image_size, batch_size=8, max_grab=5,
+                progress=None, should_stop=None):
+    """Pass 1: frame indices among `positions` where the detector finds at least one plate"""
+    hits = []
+    position = 0  # index of the next frame cap will return
+    start = time.perf_counter()
+
+    def flush(frames, indices):
+        for index, boxes in zip(indices, detect_plate_boxes(detector, frames, conf, image_size)):
+            if boxes:
+                hits.append(index)
+
+    frames, indices = [], []
+    for done, target in enumerate(positions, 1):
+        if should_stop and should_stop():
+            break
+        if not seek(cap, position, target, max_grab):
+            break
+        ok, frame = cap.read()
+        if not ok:
+            break
+        position = target + 1
+        frames.append(frame)
+        indices.append(target)
+        if len(frames) >= batch_size:
+            flush(frames, indices)
+            frames, indices = [], []
+            if progress:
+                elapsed = time.perf_counter() - start
+                progress(ScanProgress('sparse', done, len(positions), elapsed,
+                                      eta_seconds(done, len(positions), elapsed), len(hits)))
+    if frames:
+        flush(frames, indices)
+    return hits
+
+
+class WindowedCaptureSource(CaptureSource):
+    """Pass 2: a CaptureSource that only decodes frames inside the given [start, end) windows
+
+    `position` is the index of the next frame cap will return; None (e.g. a capture left
+    wherever pass 1 stopped) makes the first window start with a real seek.
+    """
+
+    def __init__(self, name, cap, windows, frame_skip=1, max_grab=30, position=None):
+        super().__init__(name, cap, frame_skip=frame_skip, live=False)
+        self.position = position
+        self.windows = list(windows)
+        self.window_index = 0
+        self.max_grab = max_grab
+        self.total = window_frames(self.windows)
+        self.finished_frames = 0  # frames of windows already passed
+        self.start_time = time.perf_counter()
+
+    def read(self):
+        step = max(1, int(self.frame_skip()))
+        while self.window_index < len(self.windows):
+            start, end = self.windows[self.window_index]
+            target = start if self.frame_number <= start else self.frame_number + step - 1
+            if target >= end:
+                self.finished_frames += end - start
+                self.window_index += 1
+                continue
+            if not seek(self.cap, self.position, target, self.max_grab):
+                return None
+            ok, frame = self.cap.read()
+            if not ok:
+                return None
+            self.frame_number = self.position = target + 1
+            return FrameItem(self.name, self.frame_number, frame, time.time())
+        return None
+
+    def progress(self):
+        done = self.finished_frames
+        if self.window_index < len(self.windows):
+            start, end = self.windows[self.window_index]
+            done += max(0, min(self.frame_number, end) - start)
+        elapsed = time.perf_counter() - self.start_time
+        return ScanProgress('dense', done, self.total, elapsed, eta_seconds(done, self.total, elapsed),
+                            len(self.windows))
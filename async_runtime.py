@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Asyncio runtime for video sources, inference and sinks
+Sources, inference workers and sinks (export, alerts, ...) run as cooperating asyncio tasks
+connected by bounded queues, so a slow stage applies backpressure instead of piling up frames.
+Blocking work (cv2 reads, model calls, disk writes) runs in executors via run_in_executor.
+Stopping cancels the sources, drains the workers and sinks and releases every capture.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+FrameItem = namedtuple('FrameItem', ['source', 'frame_number', 'frame', 'timestamp'])
+
+
+class TaskStats:
+    """Rolling latency window for one task"""
+
+    def __init__(self, window=500):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def snapshot(self):
+        samples = sorted(self.samples)
+        if not samples:
+            return {'count': self.count, 'errors': self.errors, 'mean_ms': 0.0, 'p95_ms': 0.0}
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'mean_ms': 1000.0 * sum(samples) / len(samples),
+            'p95_ms': 1000.0 * samples[min(len(samples) - 1, int(0.95 * len(samples)))],
+        }
+
+
+class CaptureSource:
+    """Frames from a cv2.VideoCapture-like object
+
+    Skipped frames are only grabbed, not decoded. Live sources drop the oldest queued frame
+    when inference falls behind; file sources wait so every (non-skipped) frame is processed.
+    """
+
+    def __init__(self, name, cap, frame_skip=1, live=False):
+        self.name = name
+        self.cap = cap
+        self.frame_skip = frame_skip if callable(frame_skip) else (lambda: frame_skip)
+        self.live = live
+        self.frame_number = 0
+
+    def read(self):
+        """Blocking read of the next frame to process (runs on the source's reader thread)"""
+        for _ in range(max(1, int(self.frame_skip())) - 1):
+            if not self.cap.grab():
+                return None
+            self.frame_number += 1
+        ok, frame = self.cap.read()
+        if not ok:
+            return None
+        self.frame_number += 1
+        return FrameItem(self.name, self.frame_number, frame, time.time())
+
+    def close(self):
+        if self.cap is not None:
+            self.cap.release()
+
+
+class _Sink:
+    def __init__(self, name, handler, blocking, queue_size):
+        self.name = name
+        self.handler = handler
+        self.blocking = blocking
+        self.queue_size = queue_size
+        self.queue = None
+        self.dropped = 0
+
+
+class AsyncRuntime:
+    """Runs sources -> inference -> result callbacks, plus event sinks, on one event loop"""
+
+    def __init__(self, process, max_workers=1, frame_queue_size=4, sink_queue_size=256):
+        self.process = process  # blocking fn(FrameItem) -> result, runs in the inference executor
+        self.max_workers = max(1, max_workers)
+        self.frame_queue_size = frame_queue_size
+        self.sink_queue_size = sink_queue_size
+        self.sources = []
+        self.sinks = []
+        self.result_callbacks = []
+        self.on_finished = None
+
+        self.loop = None
+        self.thread = None
+        self.stop_event = None
+        self.ready = threading.Event()
+        self.finished = threading.Event()
+        self.stats_by_task = {}
+        self.dropped_frames = 0
+        self.processed_times = deque(maxlen=240)
+
+    # ------------------------------------------------------------------ setup
+    def add_source(self, source):
+        self.sources.append(source)
+        return source
+
+    def add_sink(self, name, handler, blocking=True, queue_size=None):
+        """Register an event consumer; blocking handlers run in the sink executor"""
+        self.sinks.append(_Sink(name, handler, blocking, queue_size or self.sink_queue_size))
+
+    def add_result_callback(self, callback):
+        """Called on the loop thread with every processed result (keep it cheap)"""
+        self.result_callbacks.append(callback)
+
+    def _stats(self, name):
+        stats = self.stats_by_task.get(name)
+        if stats is None:
+            stats = self.stats_by_task[name] = TaskStats()
+        return stats
+
+    # ---------------------------------------------------------------- control
+    def start(self):
+        """Run the event loop on a background thread (for Tk, which owns the main thread)"""
+        self.thread = threading.Thread(target=lambda: asyncio.run(self.run()), name="async-runtime")
+        self.thread.daemon = True
+        self.thread.start()
+        return self.thread
+
+    def stop(self, wait=False, timeout=5.0):
+        """Request shutdown from any thread"""
+        if self.loop is not None and self.stop_event is not None and not self.finished.is_set():
+            try:
+                self.loop.call_soon_threadsafe(self.stop_event.set)
+            except RuntimeError:
+                pass  # loop already closed
+        if wait and self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+
+    def publish(self, event):
+        """Hand an event (e.g. a saved detection) to every sink; safe from any thread, never blocks"""
+        if self.loop is None or self.finished.is_set():
+            return False
+        try:
+            self.loop.call_soon_threadsafe(self._publish_nowait, event)
+        except RuntimeError:
+            return False
+        return True
+
+    def _publish_nowait(self, event):
+        for sink in self.sinks:
+            try:
+                sink.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                sink.dropped += 1
+
+    # ------------------------------------------------------------------ tasks
+    async def _run_source(self, source, frames):
+        stats = self._stats(f"{source.name}:read")
+        # One reader thread per source: reads and the final release never overlap
+        reader = ThreadPoolExecutor(1, thread_name_prefix=f"read-{source.name}")
+        try:
+            while True:
+                start = time.perf_counter()
+                item = await self.loop.run_in_executor(reader, source.read)
+                if item is None:
+                    return
+                stats.record(time.perf_counter() - start)
+                if source.live and frames.full():
+                    # Stay close to real time: replace the oldest frame instead of waiting
+                    try:
+                        frames.get_nowait()
+                        self.dropped_frames += 1
+                    except asyncio.QueueEmpty:
+                        pass
+                await frames.put(item)
+        finally:
+            # Released here, on cancellation too, after any in-flight read has returned
+            await self.loop.run_in_executor(reader, source.close)
+            reader.shutdown(wait=False)
+
+    async def _run_worker(self, frames):
+        stats = self._stats("inference")
+        while True:
+            item = await frames.get()
+            if item is None:
+                return
+            start = time.perf_counter()
+            try:
+                result = await self.loop.run_in_executor(self.inference_executor, self.process, item)
+            except Exception as e:
+                stats.errors += 1
+                print(f"Inference error: {e}")
+                continue
+            stats.record(time.perf_counter() - start)
+            self.processed_times.append(time.perf_counter())
+            for callback in self.result_callbacks:
+                try:
+                    callback(result)
+                except Exception as e:
+                    print(f"Result callback error: {e}")
+
+    async def _run_sink(self, sink):
+        stats = self._stats(f"sink:{sink.name}")
+        while True:
+            event = await sink.queue.get()
+            if event is None:
+                return
+            start = time.perf_counter()
+            try:
+                if sink.blocking:
+                    await self.loop.run_in_executor(self.io_executor, sink.handler, event)
+                else:
+                    sink.handler(event)
+            except Exception as e:
+                stats.errors += 1
+                print(f"Sink '{sink.name}' error: {e}")
+                continue
+            stats.record(time.perf_counter() - start)
+
+    async def run(self):
+        """Run until every source is exhausted or stop() is called"""
+        self.loop = asyncio.get_running_loop()
+        self.stop_event = asyncio.Event()
+        self.inference_executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="inference")
+        self.io_executor = ThreadPoolExecutor(len(self.sinks) + 1, thread_name_prefix="runtime-io")
+        frames = asyncio.Queue(self.frame_queue_size)
+        for sink in self.sinks:
+            sink.queue = asyncio.Queue(sink.queue_size)
+        self.ready.set()
+
+        source_tasks = [asyncio.create_task(self._run_source(s, frames), name=f"source:{s.name}")
+                        for s in self.sources]
+        worker_tasks = [asyncio.create_task(self._run_worker(frames), name=f"inference:{i}")
+                        for i in range(self.max_workers)]
+        sink_tasks = [asyncio.create_task(self._run_sink(s), name=f"sink:{s.name}") for s in self.sinks]
+        stop_task = asyncio.create_task(self.stop_event.wait())
+
+        try:
+            sources_done = asyncio.gather(*source_tasks, return_exceptions=True)
+            await asyncio.wait([stop_task, sources_done], return_when=asyncio.FIRST_COMPLETED)
+
+            # Sources first (releases captures), then let workers finish what is queued
+            for task in source_tasks:
+                task.cancel()
+            for result in await asyncio.gather(*source_tasks, return_exceptions=True):
+                if isinstance(result, Exception) and not isinstance(result, asyncio.CancelledError):
+                    print(f"Source error: {result}")
+            if self.stop_event.is_set():
+                while not frames.empty():
+                    frames.get_nowait()
+            for _ in worker_tasks:
+                await frames.put(None)
+            await asyncio.gather(*worker_tasks, return_exceptions=True)
+
+            # Sinks drain everything published so far, then exit
+            for sink in self.sinks:
+                await sink.queue.put(None)
+            await asyncio.gather(*sink_tasks, return_exceptions=True)
+        finally:
+            stop_task.cancel()
+            self.inference_executor.shutdown(wait=False)
+            self.io_executor.shutdown(wait=False)
+            self.finished.set()
+            if self.on_finished:
+                self.on_finished()
+
+    # ------------------------------------------------------------------ stats
+    def fps(self):
+        """Processed frames per second over the last couple of seconds"""
+        now = time.perf_counter()
+        recent = [t for t in self.processed_times if now - t <= 2.0]
+        return len(recent) / 2.0
+
+    def stats(self):
+        return {
+            'fps': self.fps(),
+            'dropped_frames': self.dropped_frames,
+            'tasks': {name: stats.snapshot() for name, stats in list(self.stats_by_task.items())},
+            'sink_dropped': {sink.name: sink.dropped for sink in self.sinks},
+        }
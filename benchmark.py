@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the license plate pipeline on an image corpus
+Runs plate detection + character recognition over a folder of images (default: sample-images/)
+and reports images/sec and per-image latency. Also drives the CPU thread auto-tuner and
+compares single-pass against tiled detection (recall vs. latency).
+
+Usage:
+    python benchmark.py --model-size n --imgsz 640 --inference-workers 2
+    python benchmark.py --autotune
+    python benchmark.py --model-size n --cascade s
+    python benchmark.py --compare-tiling --corpus path/to/4k-images
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import cv2
+
+from plate_pipeline import detect_plate_boxes, recognize_crops
+from tiled_detection import detect_tiled
+from ocr_cascade import CascadeStats, recognize_cascade
+from cpu_tuning import add_thread_arguments, settings_from_args, apply_thread_settings, autotune
+
+IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def corpus_names(corpus_dir, max_images=None):
+    names = sorted(f for f in os.listdir(corpus_dir) if f.lower().endswith(IMAGE_EXTS))
+    return names[:max_images] if max_images else names
+
+
+def load_corpus(corpus_dir, max_images=None):
+    """Read benchmark images into memory so disk I/O is not measured"""
+    names = corpus_names(corpus_dir, max_images)
+    images = []
+    for name in names:
+        image = cv2.imread(os.path.join(corpus_dir, name))
+        if image is not None:
+            images.append(image)
+    if not images:
+        raise FileNotFoundError(f"No readable images in {corpus_dir}")
+    return images
+
+
+def recognize_image(models, image, conf, image_size):
+    """Detector pass plus one batched OCR pass over the plate crops; returns the number of reads"""
+    crops = []
+    for x1, y1, x2, y2 in detect_plate_boxes(models.detector, [image], conf, image_size)[0]:
+        crop = image[y1:y2, x1:x2]
+        if crop.size > 0:
+            crops.append(crop)
+    reads = recognize_crops(models.recognizer, crops, conf, image_size)
+    return sum(1 for text, _, _ in reads if text)
+
+
+def recognize_image_cascade(models, escalation, image, conf, image_size, min_confidence, stats):
+    """recognize_image with cascaded OCR: uncertain fast reads are re-read by the escalation model"""
+    crops = []
+    for x1, y1, x2, y2 in detect_plate_boxes(models.detector, [image], conf, image_size)[0]:
+        crop = image[y1:y2, x1:x2]
+        if crop.size > 0:
+            crops.append(crop)
+    reads = recognize_cascade(models.recognizer, escalation.recognizer, crops, conf, image_size,
+                              min_confidence=min_confidence, stats=stats,
+                              tiers=(models.size, escalation.size))
+    return sum(1 for text, _, _ in reads if text)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_benchmark(base_dir, images, model_size='n', image_size=640, workers=1, device=None,
+                  conf=0.25, min_iterations=20, recognize=recognize_image, escalation_size=None,
+                  min_confidence=0.6):
+    """Process the corpus with `workers` threads, each owning its own model pair
+
+    With escalation_size, OCR is cascaded: model_size reads every crop and the
+    escalation_size OCR model re-reads the uncertain ones.
+    """
+    from model_manager import load_model_pair, load_recognizer, warmup_model_pair
+
+    workers = max(1, int(workers))
+    # Models are not shared between threads: ultralytics predictors keep per-call state
+    pairs = [load_model_pair(base_dir, model_size, device=device) for _ in range(workers)]
+    for pair in pairs:
+        warmup_model_pair(pair, image_size, conf=conf)
+    escalations = [None] * workers
+    cascade_stats = None
+    if escalation_size:
+        cascade_stats = CascadeStats()
+        escalations = [load_recognizer(base_dir, escalation_size, device=pair.device) for pair in pairs]
+        for tier in escalations:
+            warmup_model_pair(tier, image_size, conf=conf)
+
+    total = max(min_iterations, len(images))
+    next_index = [0]
+    lock = threading.Lock()
+    latencies = []
+    reads = [0]
+
+    def worker(models, escalation):
+        while True:
+            with lock:
+                index = next_index[0]
+                if index >= total:
+                    return
+                next_index[0] += 1
+            start = time.perf_counter()
+            image = images[index % len(images)]
+            if escalation is None:
+                found = recognize(models, image, conf, image_size)
+            else:
+                found = recognize_image_cascade(models, escalation, image, conf, image_size,
+                                                min_confidence, cascade_stats)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                reads[0] += found
+
+    threads = [threading.Thread(target=worker, args=(pair, escalation))
+               for pair, escalation in zip(pairs, escalations)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    result = {
+        'model_size': model_size,
+        'image_size': image_size,
+        'workers': workers,
+        'device': pairs[0].device,
+        'images': total,
+        'reads': reads[0],
+        'seconds': wall,
+        'images_per_sec': total / wall if wall > 0 else 0.0,
+        'mean_latency_ms': 1000.0 * sum(latencies) / len(latencies),
+        'p95_latency_ms': 1000.0 * percentile(latencies, 95),
+    }
+    if cascade_stats is not None:
+        result['cascade'] = cascade_stats.snapshot()
+    return result
+
+
+def load_yolo_boxes(corpus_dir, name, width, height):
+    """Ground-truth boxes for an image from a YOLO label file next to it or in ../labels/
+
+    Returns None when the image has no label file.
+    """
+    stem = os.path.splitext(name)[0] + '.txt'
+    for path in (os.path.join(corpus_dir, stem),
+                 os.path.join(os.path.dirname(os.path.abspath(corpus_dir)), 'labels', stem)):
+        if os.path.exists(path):
+            break
+    else:
+        return None
+    boxes = []
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 5:
+                continue
+            cx, cy, w, h = (float(v) for v in parts[1:5])
+            boxes.append(((cx - w / 2) * width, (cy - h / 2) * height,
+                          (cx + w / 2) * width, (cy + h / 2) * height))
+    return boxes
+
+
+def box_iou(a, b):
+    inter_w = min(a[2], b[2]) - max(a[0], b[0])
+    inter_h = min(a[3], b[3]) - max(a[1], b[1])
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    inter = inter_w * inter_h
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def matched_boxes(predicted, truth, iou_threshold=0.5):
+    """Number of ground-truth boxes matched by a prediction (greedy, one prediction per box)"""
+    unused = list(predicted)
+    matched = 0
+    for gt in truth:
+        best = max(unused, key=lambda p: box_iou(p, gt), default=None)
+        if best is not None and box_iou(best, gt) >= iou_threshold:
+            unused.remove(best)
+            matched += 1
+    return matched
+
+
+def compare_tiling(base_dir, corpus_dir, model_size='n', image_size=640, max_images=None,
+                   device=None, conf=0.25, overlap=0.2, large_size=1280):
+    """Plate recall (IoU 0.5, when YOLO labels exist) and detector latency for
+    a single pass at image_size, a single pass at large_size, and tiled detection"""
+    from model_manager import load_model_pair, warmup_model_pair
+
+    names = corpus_names(corpus_dir, max_images)
+    samples = []
+    for name in names:
+        image = cv2.imread(os.path.join(corpus_dir, name))
+        if image is not None:
+            height, width = image.shape[:2]
+            samples.append((image, load_yolo_boxes(corpus_dir, name, width, height)))
+    if not samples:
+        raise FileNotFoundError(f"No readable images in {corpus_dir}")
+
+    models = load_model_pair(base_dir, model_size, device=device)
+    warmup_model_pair(models, image_size, conf=conf)
+    modes = [
+        (f"single {image_size}px", lambda im: detect_plate_boxes(models.detector, [im], conf, image_size)[0]),
+        (f"single {large_size}px", lambda im: detect_plate_boxes(models.detector, [im], conf, large_size)[0]),
+        (f"tiled {image_size}px", lambda im: detect_tiled(models.detector, im, conf, image_size, overlap)),
+    ]
+
+    results = []
+    for label, detect in modes:
+        detect(samples[0][0])  # first call at a new size pays for setup
+        latencies, found, matched, labeled = [], 0, 0, 0
+        for image, truth in samples:
+            start = time.perf_counter()
+            boxes = detect(image)
+            latencies.append(time.perf_counter() - start)
+            found += len(boxes)
+            if truth is not None:
+                labeled += len(truth)
+                matched += matched_boxes(boxes, truth)
+        results.append({
+            'mode': label,
+            'images': len(samples),
+            'boxes': found,
+            'recall': matched / labeled if labeled else None,
+            'mean_latency_ms': 1000.0 * sum(latencies) / len(latencies),
+            'p95_latency_ms': 1000.0 * percentile(latencies, 95),
+        })
+    return results
+
+
+def print_result(result):
+    print(f"  {result['images']} images in {result['seconds']:.2f}s "
+          f"({result['images_per_sec']:.1f} images/s, {result['reads']} reads) | "
+          f"latency mean {result['mean_latency_ms']:.1f} ms, p95 {result['p95_latency_ms']:.1f} ms")
+    cascade = result.get('cascade')
+    if cascade:
+        calls = ", ".join(f"{tier.upper()} {count} calls/{cascade['crops'][tier]} crops"
+                          for tier, count in cascade['calls'].items())
+        print(f"  cascade: {calls} | {cascade['escalation_rate']:.0%} escalated {cascade['reasons']}, "
+              f"{cascade['changed']} reads changed")
+
+
+def main():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Benchmark the license plate pipeline")
+    parser.add_argument('--corpus', default=os.path.join(base_dir, 'sample-images'),
+                        help="folder of benchmark images")
+    parser.add_argument('--model-size', default='n', choices=['n', 's', 'm'])
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--device', default=None, help="cpu, cuda (default: auto)")
+    parser.add_argument('--max-images', type=int, default=50)
+    parser.add_argument('--autotune', action='store_true',
+                        help="sweep CPU thread settings and save the fastest for this host")
+    parser.add_argument('--compare-tiling', action='store_true',
+                        help="compare single-pass and tiled plate detection (recall vs. latency)")
+    parser.add_argument('--tile-overlap', type=float, default=0.2)
+    parser.add_argument('--cascade', choices=['s', 'm'], default=None,
+                        help="re-read uncertain OCR results with this larger model")
+    parser.add_argument('--cascade-min-confidence', type=float, default=0.6)
+    add_thread_arguments(parser)
+    args = parser.parse_args()
+
+    if args.autotune:
+        best, results = autotune(base_dir, args.corpus, model_size=args.model_size,
+                                 image_size=args.imgsz, max_images=args.max_images, progress=print)
+        print("\nAuto-tune results (fastest first):")
+        for settings, result in results:
+            print(f"- workers={settings['inference_workers']} intra={settings['torch_intra_threads']} "
+                  f"inter={settings['torch_inter_threads']} cv2={settings['cv2_threads']}")
+            print_result(result)
+        print(f"\n✅ Saved fastest settings for this host: {best}")
+        return
+
+    settings = settings_from_args(args, base_dir)
+    applied = apply_thread_settings(settings)
+    if applied:
+        print(f"Thread settings: {applied}")
+
+    if args.compare_tiling:
+        print(f"Comparing detection modes with model {args.model_size.upper()} on {args.corpus}...")
+        for result in compare_tiling(base_dir, args.corpus, model_size=args.model_size,
+                                     image_size=args.imgsz, max_images=args.max_images,
+                                     device=args.device, overlap=args.tile_overlap):
+            recall = "n/a (no labels)" if result['recall'] is None else f"{result['recall']:.1%}"
+            print(f"- {result['mode']:<14} recall {recall:<16} boxes {result['boxes']:<5} "
+                  f"latency mean {result['mean_latency_ms']:.1f} ms, p95 {result['p95_latency_ms']:.1f} ms")
+        return
+
+    images = load_corpus(args.corpus, max_images=args.max_images)
+    cascade = f" (cascade to {args.cascade.upper()})" if args.cascade else ""
+    print(f"Benchmarking model {args.model_size.upper()}{cascade} at {args.imgsz}px on {len(images)} images "
+          f"with {settings['inference_workers']} worker(s)...")
+    result = run_benchmark(base_dir, images, model_size=args.model_size, image_size=args.imgsz,
+                           workers=settings['inference_workers'], device=args.device,
+                           escalation_size=args.cascade, min_confidence=args.cascade_min_confidence)
+    print_result(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+CPU threading controls for torch, OpenCV and the recognition pipeline
+Applies thread counts and CPU affinity, and stores the fastest settings found by the
+benchmark auto-tuner per host in cpu_profile.json.
+"""
+
+import json
+import os
+import socket
+
+# 0 means "leave the library default"
+DEFAULT_THREAD_SETTINGS = {
+    'torch_intra_threads': 0,
+    'torch_inter_threads': 0,
+    'cv2_threads': 0,
+    'inference_workers': 1,
+    'cpu_affinity': '',
+}
+
+PROFILE_FILE = 'cpu_profile.json'
+
+
+def parse_affinity(spec):
+    """Parse a core list like '0-3,6' into a set of CPU ids (empty set = no pinning)
+
+    Raises ValueError for anything else, e.g. '3-0' or 'all'.
+    """
+    cores = set()
+    for part in (spec or '').replace(' ', '').split(','):
+        if not part:
+            continue
+        if '-' in part:
+            start, end = (int(value) for value in part.split('-', 1))
+            if start > end:
+                raise ValueError(f"Empty core range: {part}")
+            cores.update(range(start, end + 1))
+        else:
+            cores.add(int(part))
+    return cores
+
+
+def format_affinity(cores):
+    """Inverse of parse_affinity: {0, 1, 2, 3, 6} -> '0-3,6'"""
+    parts = []
+    for core in sorted(cores):
+        if parts and core == parts[-1][1] + 1:
+            parts[-1][1] = core
+        else:
+            parts.append([core, core])
+    return ','.join(str(start) if start == end else f"{start}-{end}" for start, end in parts)
+
+
+def apply_process_settings(settings):
+    """Apply OpenCV threads and CPU affinity (cheap, safe to call at startup)
+
+    Raises ValueError for a malformed affinity and OSError for cores the machine does not have.
+    """
+    applied = {}
+    if settings.get('cv2_threads'):
+        import cv2
+
+        cv2.setNumThreads(int(settings['cv2_threads']))
+        applied['cv2_threads'] = cv2.getNumThreads()
+
+    cores = parse_affinity(settings.get('cpu_affinity'))
+    if cores:
+        if hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, cores)
+            applied['cpu_affinity'] = sorted(os.sched_getaffinity(0))
+        else:
+            print("CPU affinity is not supported on this platform")
+    return applied
+
+
+def apply_torch_settings(settings):
+    """Apply torch intra-/inter-op thread counts (imports torch)
+
+    torch only accepts a new inter-op count before its first parallel work, so a late
+    change is reported and takes effect on the next launch.
+    """
+    import torch
+
+    applied = {}
+    if settings.get('torch_intra_threads'):
+        torch.set_num_threads(int(settings['torch_intra_threads']))
+        applied['torch_intra_threads'] = torch.get_num_threads()
+    if settings.get('torch_inter_threads'):
+        try:
+            torch.set_num_interop_threads(int(settings['torch_inter_threads']))
+            applied['torch_inter_threads'] = torch.get_num_interop_threads()
+        except RuntimeError as e:
+            print(f"Could not change torch inter-op threads now (restart to apply): {e}")
+    return applied
+
+
+def apply_thread_settings(settings):
+    """Apply every thread/affinity setting"""
+    applied = apply_process_settings(settings)
+    applied.update(apply_torch_settings(settings))
+    return applied
+
+
+def load_host_profile(base_dir):
+    """Return the tuned settings saved for this host, or None"""
+    path = os.path.join(base_dir, PROFILE_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            profiles = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return profiles.get(socket.gethostname())
+
+
+def save_host_profile(base_dir, settings, result=None):
+    """Store tuned settings for this host (other hosts' entries are kept)"""
+    path = os.path.join(base_dir, PROFILE_FILE)
+    profiles = {}
+    if os.path.exists(path):
+        try:
+            with open(path) as f:
+                profiles = json.load(f)
+        except (OSError, ValueError):
+            profiles = {}
+    entry = {key: settings.get(key, default) for key, default in DEFAULT_THREAD_SETTINGS.items()}
+    if result:
+        entry['benchmark'] = result
+    profiles[socket.gethostname()] = entry
+    with open(path, 'w') as f:
+        json.dump(profiles, f, indent=2)
+    return path
+
+
+def candidate_settings(cpu_count=None, available_cores=None):
+    """Thread configurations swept by the auto-tuner
+
+    When the usable cores are known (by default from os.sched_getaffinity), worker counts that
+    do not divide them evenly are also tried pinned to the cores they can fill.
+    """
+    if cpu_count is None and available_cores is None and hasattr(os, 'sched_getaffinity'):
+        available_cores = os.sched_getaffinity(0)
+    available_cores = sorted(available_cores or ())
+    cores = cpu_count or len(available_cores) or os.cpu_count() or 1
+    candidates = []
+    seen = set()
+    for workers in (1, 2, 4):
+        if workers > cores:
+            continue
+        per_worker = max(1, cores // workers)
+        # All cores, plus the first per_worker * workers cores when that leaves some idle
+        layouts = ['']
+        if per_worker * workers < len(available_cores):
+            layouts.append(format_affinity(available_cores[:per_worker * workers]))
+        for intra in sorted({per_worker, max(1, per_worker // 2)}):
+            for inter in (1, 2):
+                for affinity in layouts:
+                    key = (workers, intra, inter, affinity)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    candidates.append({
+                        'torch_intra_threads': intra,
+                        'torch_inter_threads': inter,
+                        # Let OpenCV use spare cores only when there is a single worker
+                        'cv2_threads': per_worker if workers == 1 else 1,
+                        'inference_workers': workers,
+                        'cpu_affinity': affinity,
+                    })
+    return candidates
+
+
+def _benchmark_candidate(settings, base_dir, corpus_dir, model_size, image_size, max_images):
+    """Run one candidate in a fresh process (torch thread pools are fixed per process)"""
+    from benchmark import load_corpus, run_benchmark
+
+    apply_thread_settings(settings)
+    images = load_corpus(corpus_dir, max_images=max_images)
+    return run_benchmark(base_dir, images, model_size=model_size, image_size=image_size,
+                         workers=settings['inference_workers'], device='cpu')
+
+
+def autotune(base_dir, corpus_dir, model_size='n', image_size=640, max_images=50,
+             candidates=None, progress=None, save=True):
+    """Sweep thread settings on the benchmark corpus and save the fastest for this host"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    candidates = candidates or candidate_settings()
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for i, settings in enumerate(candidates, 1):
+        if progress:
+            progress(f"Auto-tune {i}/{len(candidates)}: {settings['inference_workers']} workers, "
+                     f"{settings['torch_intra_threads']} intra, {settings['torch_inter_threads']} inter, "
+                     f"cores {settings['cpu_affinity'] or 'all'}")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            try:
+                result = pool.submit(_benchmark_candidate, settings, base_dir, corpus_dir,
+                                     model_size, image_size, max_images).result()
+            except Exception as e:
+                print(f"Auto-tune candidate failed ({settings}): {e}")
+                continue
+        results.append((result['images_per_sec'], settings, result))
+
+    if not results:
+        raise RuntimeError("Auto-tune failed for every candidate")
+
+    results.sort(key=lambda item: item[0], reverse=True)
+    best_rate, best_settings, best_result = results[0]
+    if save:
+        save_host_profile(base_dir, best_settings, best_result)
+    if progress:
+        progress(f"Auto-tune done: {best_rate:.1f} images/s")
+    return best_settings, [(settings, result) for _, settings, result in results]
+
+
+def add_thread_arguments(parser):
+    """Add the CPU threading options to an argparse parser"""
+    group = parser.add_argument_group("CPU threading")
+    group.add_argument('--torch-threads', type=int, dest='torch_intra_threads',
+                       help="torch intra-op threads (0 = default)")
+    group.add_argument('--torch-interop-threads', type=int, dest='torch_inter_threads',
+                       help="torch inter-op threads (0 = default)")
+    group.add_argument('--cv2-threads', type=int, dest='cv2_threads',
+                       help="OpenCV threads (0 = default)")
+    group.add_argument('--inference-workers', type=int, dest='inference_workers',
+                       help="parallel inference workers")
+    group.add_argument('--cpu-affinity', dest='cpu_affinity',
+                       help="pin the process to these cores, e.g. '0-3,6'")
+    group.add_argument('--no-tuned-profile', action='store_true',
+                       help="ignore the auto-tuned profile saved for this host")
+    return group
+
+
+def settings_from_args(args, base_dir):
+    """Merge defaults, the saved host profile and explicit CLI options"""
+    settings = dict(DEFAULT_THREAD_SETTINGS)
+    if not getattr(args, 'no_tuned_profile', False):
+        profile = load_host_profile(base_dir)
+        if profile:
+            settings.update({key: profile[key] for key in DEFAULT_THREAD_SETTINGS if key in profile})
+    for key in DEFAULT_THREAD_SETTINGS:
+        value = getattr(args, key, None)
+        if value is not None:
+            settings[key] = value
+    return settings
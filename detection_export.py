@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Streaming export of saved license plate detections
+Appends every accepted detection to rotating JSONL/CSV files or Parquet row groups
+from a background writer thread, so capture and inference never wait on disk I/O.
+"""
+
+import abc
+import csv
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+# Columns written for every detection (fixed so CSV/Parquet have a stable schema)
+EXPORT_FIELDS = ['plate', 'timestamp', 'confidence', 'filter_pattern', 'filter_enabled',
+                 'evidence_crop', 'evidence_context', 'source', 'frame_number', 'media_time']
+
+EXPORT_FORMATS = ['jsonl', 'csv', 'parquet']
+
+
+def _row(detection):
+    """Project a detection dict onto EXPORT_FIELDS"""
+    return {field: detection.get(field) for field in EXPORT_FIELDS}
+
+
+class _RotatingFileWriter(abc.ABC):
+    """Base class for line-oriented writers that roll over to a new file by size"""
+
+    extension = ''
+
+    def __init__(self, output_dir, prefix, max_bytes):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.file = None
+        self.path = None
+        self.part = 0
+        self.files_written = []
+
+    def _open_next(self):
+        """Close the current file and open the next part"""
+        self.close()
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.part += 1
+        self.path = os.path.join(self.output_dir, f"{self.prefix}_{stamp}_{self.part:03d}.{self.extension}")
+        self.file = open(self.path, 'a', newline='', encoding='utf-8')
+        self.files_written.append(self.path)
+        self._on_open()
+
+    def _on_open(self):
+        """Hook for writing a header into a freshly opened file"""
+
+    def write(self, detection):
+        """Write one detection, rotating first if the file is full"""
+        if self.file is None or (self.max_bytes and self.file.tell() >= self.max_bytes):
+            self._open_next()
+        self._write_row(_row(detection))
+
+    @abc.abstractmethod
+    def _write_row(self, row):
+        """Write one EXPORT_FIELDS row to the open file"""
+
+    def flush(self):
+        if self.file:
+            self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+class JsonlWriter(_RotatingFileWriter):
+    """One JSON object per line"""
+
+    extension = 'jsonl'
+
+    def _write_row(self, row):
+        self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+class CsvWriter(_RotatingFileWriter):
+    """CSV with a header row at the top of every part"""
+
+    extension = 'csv'
+
+    def _on_open(self):
+        self.writer = csv.DictWriter(self.file, fieldnames=EXPORT_FIELDS)
+        self.writer.writeheader()
+
+    def _write_row(self, row):
+        self.writer.writerow(row)
+
+
+class ParquetWriter:
+    """Buffers detections and flushes them as Parquet row groups (requires pyarrow)
+
+    A Parquet file is only readable once its footer is written on close, so files are also
+    closed after rotate_seconds: a crash loses at most the file being written, not the session.
+    """
+
+    def __init__(self, output_dir, prefix, row_group_size=1000, flush_seconds=60.0, rotate_seconds=600.0):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from e
+
+        self.pa = pa
+        self.pq = pq
+        self.schema = pa.schema([
+            ('plate', pa.string()),
+            ('timestamp', pa.string()),
+            ('confidence', pa.float64()),
+            ('filter_pattern', pa.string()),
+            ('filter_enabled', pa.bool_()),
+            ('evidence_crop', pa.string()),
+            ('evidence_context', pa.string()),
+            ('source', pa.string()),
+            ('frame_number', pa.int64()),
+            ('media_time', pa.float64()),
+        ])
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.row_group_size = row_group_size
+        self.flush_seconds = flush_seconds
+        self.rotate_seconds = rotate_seconds
+        self.buffer = []
+        self.buffer_started = None
+        self.writer = None
+        self.opened = None
+        self.path = None
+        self.part = 0
+        self.files_written = []
+
+    def write(self, detection):
+        if not self.buffer:
+            self.buffer_started = time.monotonic()
+        self.buffer.append(_row(detection))
+        if len(self.buffer) >= self.row_group_size:
+            self._write_group()
+
+    def _write_group(self):
+        """Write buffered rows as one row group, opening the next part if needed"""
+        if not self.buffer:
+            return
+        if self.writer is None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.part += 1
+            self.path = os.path.join(self.output_dir, f"{self.prefix}_{stamp}_{self.part:03d}.parquet")
+            self.writer = self.pq.ParquetWriter(self.path, self.schema)
+            self.opened = time.monotonic()
+            self.files_written.append(self.path)
+        table = self.pa.Table.from_pylist(self.buffer, schema=self.schema)
+        self.writer.write_table(table)
+        self.buffer = []
+
+    def flush(self):
+        """Periodic tick: write rows buffered for flush_seconds, finish files older than rotate_seconds"""
+        now = time.monotonic()
+        if self.buffer and now - self.buffer_started >= self.flush_seconds:
+            self._write_group()
+        if self.writer is not None and time.monotonic() - self.opened >= self.rotate_seconds:
+            self._write_group()
+            self._close_file()
+
+    def _close_file(self):
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+
+    def close(self):
+        self._write_group()
+        self._close_file()
+
+
+def create_writer(fmt, output_dir, prefix='detections', max_bytes=10 * 1024 * 1024, row_group_size=1000):
+    """Create a writer for the given export format"""
+    if fmt == 'jsonl':
+        return JsonlWriter(output_dir, prefix, max_bytes)
+    if fmt == 'csv':
+        return CsvWriter(output_dir, prefix, max_bytes)
+    if fmt == 'parquet':
+        return ParquetWriter(output_dir, prefix, row_group_size)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+class StreamingExporter:
+    """Background thread that drains a bounded queue of detections into a writer"""
+
+    def __init__(self, output_dir, fmt='jsonl', max_bytes=10 * 1024 * 1024, row_group_size=1000,
+                 queue_size=10000, flush_interval=1.0, prefix='detections'):
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.flush_interval = flush_interval
+        self.writer = create_writer(fmt, output_dir, prefix, max_bytes, row_group_size)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        self.running = False
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def start(self):
+        """Start the writer thread"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="detection-export")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def submit(self, detection):
+        """Queue a detection for export; never blocks, drops when the queue is full"""
+        if not self.running:
+            return False
+        try:
+            self.queue.put_nowait(dict(detection))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while self.running or not self.queue.empty():
+            try:
+                detection = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                detection = None
+
+            if detection is not None:
+                try:
+                    self.writer.write(detection)
+                    self.written += 1
+                except Exception as e:
+                    self.errors += 1
+                    print(f"Export error: {e}")
+
+            # Line formats flush their files; Parquet writes old buffers and finishes old files
+            now = time.monotonic()
+            if now - last_flush >= self.flush_interval:
+                self.writer.flush()
+                last_flush = now
+
+        try:
+            self.writer.close()
+        except Exception as e:
+            self.errors += 1
+            print(f"Export error: {e}")
+
+    def stop(self, timeout=5.0):
+        """Drain pending detections, close the current file and stop the thread"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout)
+            self.thread = None
+
+    def stats(self):
+        """Counters for display in the GUI"""
+        return {
+            'written': self.written,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'pending': self.queue.qsize(),
+            'current_file': getattr(self.writer, 'path', None),
+        }
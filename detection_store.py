@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+In-memory store of saved detections with plate and time indexes
+Backs the saved-detections view: records are kept in time order with a plate-text index, so the
+view can page through tens of thousands of rows and filter by plate text or time range without
+scanning every record.
+"""
+
+import bisect
+import threading
+from datetime import datetime, timedelta
+
+TIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d", "%H:%M:%S", "%H:%M")
+
+
+def plate_key(plate):
+    """Search form of a plate: no spaces, lower case"""
+    return plate.replace(' ', '').lower()
+
+
+def parse_time_bound(text, now=None, end=False):
+    """Epoch seconds for 'YYYY-MM-DD[ HH:MM[:SS]]' or 'HH:MM[:SS]' (today); None when empty
+
+    An upper bound (end=True) covers the whole day/minute it names. Raises ValueError for
+    anything else.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    now = now or datetime.now()
+    for fmt in TIME_FORMATS:
+        try:
+            parsed = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if not fmt.startswith("%Y"):
+            parsed = parsed.replace(year=now.year, month=now.month, day=now.day)
+        if end:
+            if fmt == "%Y-%m-%d":
+                parsed += timedelta(days=1)
+            elif not fmt.endswith("%S"):
+                parsed += timedelta(minutes=1)
+            else:
+                parsed += timedelta(seconds=1)
+            return parsed.timestamp() - 1e-6
+        return parsed.timestamp()
+    raise ValueError(f"Unrecognized time: {text}")
+
+
+class DetectionStore:
+    """Thread-safe, time-ordered DetectionRecord store with a plate-text index
+
+    Every change bumps `version`, so views can tell cheaply whether they need to re-render.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = {}  # id -> DetectionRecord
+        self.ids = []  # ids sorted by (timestamp, id)
+        self.times = []  # timestamps parallel to ids
+        self.by_plate = {}  # plate_key -> ids
+        self.keys = {}  # id -> plate_key
+        self.next_id = 0
+        self.version = 0
+
+    def __len__(self):
+        with self.lock:
+            return len(self.ids)
+
+    def add(self, record):
+        """Store a record; returns its id"""
+        key = plate_key(record.plate)
+        with self.lock:
+            record_id = self.next_id
+            self.next_id += 1
+            self.records[record_id] = record
+            self.keys[record_id] = key
+            self.by_plate.setdefault(key, []).append(record_id)
+            # Records normally arrive in time order, so this is an append
+            position = bisect.bisect_right(self.times, record.timestamp)
+            self.times.insert(position, record.timestamp)
+            self.ids.insert(position, record_id)
+            self.version += 1
+        return record_id
+
+    def remove(self, record_ids):
+        with self.lock:
+            for record_id in record_ids:
+                record = self.records.pop(record_id, None)
+                if record is None:
+                    continue
+                key = self.keys.pop(record_id)
+                plate_ids = self.by_plate[key]
+                plate_ids.remove(record_id)
+                if not plate_ids:
+                    del self.by_plate[key]
+                lo = bisect.bisect_left(self.times, record.timestamp)
+                position = self.ids.index(record_id, lo)
+                del self.ids[position]
+                del self.times[position]
+            self.version += 1
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+            self.ids.clear()
+            self.times.clear()
+            self.by_plate.clear()
+            self.keys.clear()
+            self.version += 1
+
+    def get(self, record_id):
+        with self.lock:
+            return self.records.get(record_id)
+
+    def has_plate(self, plate):
+        with self.lock:
+            return plate_key(plate) in self.by_plate
+
+    def all_records(self):
+        """Snapshot of every record in time order"""
+        with self.lock:
+            return [self.records[record_id] for record_id in self.ids]
+
+    def query(self, text='', start=None, end=None):
+        """Ids (in time order) whose plate contains `text` and whose time is within [start, end]"""
+        with self.lock:
+            lo = 0 if start is None else bisect.bisect_left(self.times, start)
+            hi = len(self.times) if end is None else bisect.bisect_right(self.times, end)
+            if not text:
+                return self.ids[lo:hi]
+            # Match against distinct plates (far fewer than records), then filter by time
+            needle = plate_key(text)
+            matches = set()
+            for key, plate_ids in self.by_plate.items():
+                if needle in key:
+                    matches.update(plate_ids)
+            if hi - lo <= len(matches):
+                return [record_id for record_id in self.ids[lo:hi] if record_id in matches]
+            lo_time = self.times[lo] if lo < len(self.times) else float('inf')
+            hi_time = self.times[hi - 1] if hi > 0 else float('-inf')
+            found = [(self.records[i].timestamp, i) for i in matches
+                     if lo_time <= self.records[i].timestamp <= hi_time]
+            return [record_id for _, record_id in sorted(found)]
+
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Offline accuracy and throughput evaluation of the full recognition pipeline
+Runs detector -> OCR -> text assembly -> plate filter over a labeled set and reports exact-match
+rate and character error rate (CER) for every model size / backend / image size combination.
+
+Ground truth comes from either
+- a YOLO OCR dataset (the dataset-process-ocr layout: images/<split>/ + labels/<split>/ with one
+  box per character); images are plate crops, so only OCR + filter run, or
+- a CSV with `image,plate` columns (image paths relative to the CSV); the detector runs first
+  and the most confident plate read that passes the filter is the prediction.
+
+Usage:
+    python evaluate.py --yolo Only_License_Plate --split val --sizes n s m --imgsz 416 640
+    python evaluate.py --csv ground_truth.csv --sizes n s --backends pt onnx --jobs 4
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import time
+
+from model_manager import MODEL_BACKENDS, model_paths
+from plate_pipeline import (CHAR_MAP, DEFAULT_FILTER_SETTINGS, LICENSE_PATTERNS, assemble_plate_text,
+                            detect_plate_boxes, recognize_crops, validate_plate)
+
+IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def normalize_plate(text):
+    """Case- and whitespace-insensitive form used for scoring"""
+    return " ".join(text.split()).lower()
+
+
+def edit_distance(a, b):
+    """Levenshtein distance between two sequences"""
+    previous = list(range(len(b) + 1))
+    for i, item_a in enumerate(a, 1):
+        current = [i]
+        for j, item_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (item_a != item_b)))
+        previous = current
+    return previous[-1]
+
+
+def label_plate_text(label_path, char_map=CHAR_MAP):
+    """Ground-truth plate string from a YOLO OCR label file (class cx cy w h per character)"""
+    chars = []
+    with open(label_path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 5:
+                chars.append((float(parts[1]), int(parts[0]), 1.0))
+    return assemble_plate_text(chars, char_map)
+
+
+def load_yolo_samples(root, split='val', max_samples=None):
+    """(image_path, plate) pairs from a YOLO OCR dataset; images without labels are skipped"""
+    image_dir = os.path.join(root, 'images', split)
+    label_dir = os.path.join(root, 'labels', split)
+    samples = []
+    for name in sorted(os.listdir(image_dir)):
+        if not name.lower().endswith(IMAGE_EXTS):
+            continue
+        label_path = os.path.join(label_dir, os.path.splitext(name)[0] + '.txt')
+        if os.path.exists(label_path):
+            samples.append((os.path.join(image_dir, name), label_plate_text(label_path)))
+    return samples[:max_samples] if max_samples else samples
+
+
+def load_csv_samples(csv_path, max_samples=None):
+    """(image_path, plate) pairs from a CSV with image and plate columns"""
+    base = os.path.dirname(os.path.abspath(csv_path))
+    samples = []
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            samples.append((os.path.join(base, row['image']), row['plate'].strip()))
+    return samples[:max_samples] if max_samples else samples
+
+
+def filter_settings_for(pattern):
+    """Plate filter settings for --pattern (a LICENSE_PATTERNS name, 'all' or 'none')"""
+    settings = dict(DEFAULT_FILTER_SETTINGS)
+    if pattern == 'none':
+        settings['enabled'] = False
+    elif pattern == 'all':
+        settings['allow_multiple_patterns'] = True
+    else:
+        settings['pattern_type'] = pattern
+    return settings
+
+
+def predict(models, image, mode, conf, image_size, filter_settings):
+    """Pipeline output for one image: the best filtered read, or '' (also returns whether the
+    filter rejected a read)"""
+    if mode == 'crop':
+        crops = [image]
+    else:
+        crops = []
+        for x1, y1, x2, y2 in detect_plate_boxes(models.detector, [image], conf, image_size)[0]:
+            crop = image[y1:y2, x1:x2]
+            if crop.size > 0:
+                crops.append(crop)
+    reads = [r for r in recognize_crops(models.recognizer, crops, conf, image_size) if r[0]]
+    valid = [r for r in reads if validate_plate(r[0], filter_settings)]
+    if not valid:
+        return '', bool(reads)
+    return max(valid, key=lambda r: r[1])[0], False
+
+
+def _evaluate_shard(base_dir, samples, mode, model_size, backend, image_size, conf, filter_settings,
+                    device):
+    """Evaluate a slice of the samples in a worker process; returns per-sample outcomes"""
+    import cv2
+    from model_manager import load_model_pair, warmup_model_pair
+
+    models = load_model_pair(base_dir, model_size, backend, device=device)
+    warmup_model_pair(models, image_size, conf=conf)
+    outcomes = []
+    for path, truth in samples:
+        image = cv2.imread(path)
+        if image is None:
+            outcomes.append({'path': path, 'truth': truth, 'prediction': '', 'filtered': False,
+                             'seconds': 0.0, 'error': 'unreadable'})
+            continue
+        start = time.perf_counter()
+        prediction, filtered = predict(models, image, mode, conf, image_size, filter_settings)
+        outcomes.append({'path': path, 'truth': truth, 'prediction': prediction, 'filtered': filtered,
+                         'seconds': time.perf_counter() - start})
+    return outcomes
+
+
+def score(outcomes):
+    """Exact-match rate, CER (total edits / total ground-truth characters) and filter rejections"""
+    exact = edits = chars = filtered = 0
+    for outcome in outcomes:
+        truth = normalize_plate(outcome['truth'])
+        prediction = normalize_plate(outcome['prediction'])
+        exact += truth == prediction
+        edits += edit_distance(truth, prediction)
+        chars += len(truth)
+        filtered += outcome['filtered']
+    count = len(outcomes)
+    return {
+        'samples': count,
+        'exact_match': exact / count if count else 0.0,
+        'cer': edits / chars if chars else 0.0,
+        'filtered_out': filtered,
+    }
+
+
+def evaluate_config(base_dir, samples, mode, model_size, backend, image_size, conf=0.25,
+                    filter_settings=None, jobs=1, device=None):
+    """Score one configuration, sharding the samples over a pool of `jobs` processes"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    filter_settings = filter_settings or dict(DEFAULT_FILTER_SETTINGS)
+    jobs = max(1, min(jobs, len(samples)))
+    shards = [samples[i::jobs] for i in range(jobs)]
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+        futures = [pool.submit(_evaluate_shard, base_dir, shard, mode, model_size, backend, image_size,
+                               conf, filter_settings, device) for shard in shards]
+        shard_outcomes = [future.result() for future in futures]
+    outcomes = [outcome for shard in shard_outcomes for outcome in shard]
+    # Throughput excludes model loading: the slowest shard's inference time bounds the run
+    busy = max(sum(o['seconds'] for o in shard) for shard in shard_outcomes)
+
+    latencies = [o['seconds'] for o in outcomes if 'error' not in o]
+    result = score(outcomes)
+    result.update({
+        'model_size': model_size,
+        'backend': backend,
+        'image_size': image_size,
+        'jobs': jobs,
+        'images_per_sec': len(outcomes) / busy if busy > 0 else 0.0,
+        'mean_latency_ms': 1000.0 * sum(latencies) / len(latencies) if latencies else 0.0,
+        'misreads': [o for o in outcomes
+                     if 'error' in o or normalize_plate(o['prediction']) != normalize_plate(o['truth'])],
+    })
+    return result
+
+
+def print_table(results):
+    header = f"{'size':<5} {'backend':<9} {'imgsz':>5} {'exact':>7} {'CER':>7} {'filtered':>8} {'img/s':>7} {'ms/img':>7}"
+    print(header)
+    print('-' * len(header))
+    for r in sorted(results, key=lambda r: (-r['exact_match'], r['cer'])):
+        print(f"{r['model_size']:<5} {r['backend']:<9} {r['image_size']:>5} {r['exact_match']:>7.1%} "
+              f"{r['cer']:>7.1%} {r['filtered_out']:>8} {r['images_per_sec']:>7.1f} {r['mean_latency_ms']:>7.1f}")
+
+
+def main():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Evaluate plate-string accuracy of the pipeline")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--yolo', help="YOLO OCR dataset root (images/<split>, labels/<split>)")
+    source.add_argument('--csv', help="CSV with image,plate columns")
+    parser.add_argument('--split', default='val')
+    parser.add_argument('--sizes', nargs='+', default=['n', 's', 'm'], choices=['n', 's', 'm'])
+    parser.add_argument('--backends', nargs='+', default=['pt'], choices=list(MODEL_BACKENDS))
+    parser.add_argument('--imgsz', nargs='+', type=int, default=[640])
+    parser.add_argument('--conf', type=float, default=0.25)
+    parser.add_argument('--pattern', default='all',
+                        choices=[p for p in LICENSE_PATTERNS if p != 'custom'] + ['all', 'none'],
+                        help="plate filter applied to reads ('none' disables it)")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument('--device', default=None, help="cpu, cuda (default: auto)")
+    parser.add_argument('--max-samples', type=int, default=None)
+    parser.add_argument('--json', help="also write full results (including misreads) to this file")
+    args = parser.parse_args()
+
+    if args.yolo:
+        samples, mode = load_yolo_samples(args.yolo, args.split, args.max_samples), 'crop'
+    else:
+        samples, mode = load_csv_samples(args.csv, args.max_samples), 'image'
+    if not samples:
+        parser.error("no labeled samples found")
+    filter_settings = filter_settings_for(args.pattern)
+    print(f"Evaluating {len(samples)} samples ({'OCR on plate crops' if mode == 'crop' else 'full pipeline'}) "
+          f"with {args.jobs} worker process(es)")
+
+    results = []
+    for model_size, backend, image_size in itertools.product(args.sizes, args.backends, args.imgsz):
+        missing = [p for p in model_paths(base_dir, model_size, backend) if not os.path.exists(p)]
+        if missing:
+            print(f"- skipping {model_size}/{backend}: {missing[0]} not found")
+            continue
+        print(f"- {model_size}/{backend} at {image_size}px...")
+        results.append(evaluate_config(base_dir, samples, mode, model_size, backend, image_size,
+                                       conf=args.conf, filter_settings=filter_settings,
+                                       jobs=args.jobs, device=args.device))
+
+    if not results:
+        print("No configuration could be evaluated")
+        return
+    print()
+    print_table(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nFull results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Evidence snapshot writer for saved license plates
+Encodes the plate crop and a downscaled context frame on a thread pool, stores them
+in a date-sharded folder layout and evicts the oldest files to stay under a disk budget.
+"""
+
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import cv2
+
+EVIDENCE_FORMATS = ['jpg', 'webp']
+
+
+def safe_filename(text):
+    """Turn plate text into something usable in a file name"""
+    return re.sub(r'[^A-Za-z0-9]+', '_', text).strip('_') or 'plate'
+
+
+def _has_pixels(image):
+    return image is not None and image.size > 0
+
+
+class EvidenceWriter:
+    """Saves plate crops and context images off the detection thread"""
+
+    def __init__(self, output_dir, fmt='jpg', quality=85, context_max_width=960,
+                 max_bytes=500 * 1024 * 1024, max_workers=2, max_pending=32):
+        if fmt not in EVIDENCE_FORMATS:
+            raise ValueError(f"Unknown evidence format: {fmt}")
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.quality = quality
+        self.context_max_width = context_max_width
+        self.max_bytes = max_bytes
+        self.max_pending = max_pending
+
+        if fmt == 'webp':
+            self.encode_params = [cv2.IMWRITE_WEBP_QUALITY, quality]
+        else:
+            self.encode_params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="evidence")
+        self.lock = threading.Lock()
+        self.files = deque()  # (path, size), oldest first
+        self.total_bytes = 0
+        self.pending = 0
+        self.saved = 0
+        self.dropped = 0
+        self.evicted = 0
+        self.errors = 0
+
+        # Pick up files from previous runs so the budget covers them too
+        self.executor.submit(self._scan_existing)
+
+    def _scan_existing(self):
+        """Index evidence already on disk, oldest first"""
+        found = []
+        for dirpath, _, filenames in os.walk(self.output_dir):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                found.append((st.st_mtime, path, st.st_size))
+        found.sort()
+        with self.lock:
+            # Files written while scanning are newer than anything found here
+            known = {path for path, _ in self.files}
+            older = [(path, size) for _, path, size in found if path not in known]
+            self.files = deque(older + list(self.files))
+            self.total_bytes = sum(size for _, size in self.files)
+        self._enforce_budget()
+
+    def submit(self, plate_text, plate_crop, frame, when=None):
+        """Queue crop + context encoding; returns the paths the files will be written to
+
+        A path is None when there is nothing to write for it (no or empty crop/frame).
+        """
+        if not _has_pixels(plate_crop) and not _has_pixels(frame):
+            return None, None
+        with self.lock:
+            if self.pending >= self.max_pending:
+                self.dropped += 1
+                return None, None
+            self.pending += 1
+
+        when = when or datetime.now()
+        shard = os.path.join(self.output_dir, when.strftime("%Y"), when.strftime("%m"), when.strftime("%d"))
+        stem = f"{when.strftime('%H%M%S_%f')}_{safe_filename(plate_text)}"
+        crop_path = os.path.join(shard, f"{stem}_crop.{self.fmt}") if _has_pixels(plate_crop) else None
+        context_path = os.path.join(shard, f"{stem}_context.{self.fmt}") if _has_pixels(frame) else None
+
+        self.executor.submit(self._write, shard, crop_path, plate_crop, context_path, frame)
+        return crop_path, context_path
+
+    def _write(self, shard, crop_path, plate_crop, context_path, frame):
+        try:
+            os.makedirs(shard, exist_ok=True)
+            if crop_path is not None:
+                self._encode_to(crop_path, plate_crop)
+            if context_path is not None:
+                height, width = frame.shape[:2]
+                if width > self.context_max_width:
+                    scale = self.context_max_width / width
+                    frame = cv2.resize(frame, (self.context_max_width, int(height * scale)),
+                                       interpolation=cv2.INTER_AREA)
+                self._encode_to(context_path, frame)
+            with self.lock:
+                self.saved += 1
+        except Exception as e:
+            with self.lock:
+                self.errors += 1
+            print(f"Evidence write error: {e}")
+        finally:
+            with self.lock:
+                self.pending -= 1
+        self._enforce_budget()
+
+    def _encode_to(self, path, image):
+        ok, buffer = cv2.imencode(f".{self.fmt}", image, self.encode_params)
+        if not ok:
+            raise RuntimeError(f"Failed to encode {path}")
+        data = buffer.tobytes()
+        with open(path, 'wb') as f:
+            f.write(data)
+        with self.lock:
+            self.files.append((path, len(data)))
+            self.total_bytes += len(data)
+
+    def _enforce_budget(self):
+        """Delete oldest files until total size is within max_bytes"""
+        if not self.max_bytes:
+            return
+        while True:
+            with self.lock:
+                if self.total_bytes <= self.max_bytes or not self.files:
+                    return
+                path, size = self.files.popleft()
+                self.total_bytes -= size
+                self.evicted += 1
+            try:
+                os.remove(path)
+                self._remove_empty_dirs(os.path.dirname(path))
+            except OSError:
+                pass
+
+    def _remove_empty_dirs(self, directory):
+        """Prune empty day/month/year folders left behind by eviction"""
+        root = os.path.abspath(self.output_dir)
+        directory = os.path.abspath(directory)
+        while directory != root and directory.startswith(root):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                return
+            directory = os.path.dirname(directory)
+
+    def stats(self):
+        """Counters for display in the GUI"""
+        with self.lock:
+            return {
+                'saved': self.saved,
+                'dropped': self.dropped,
+                'evicted': self.evicted,
+                'errors': self.errors,
+                'pending': self.pending,
+                'disk_mb': self.total_bytes / (1024 * 1024),
+            }
+
+    def close(self, wait=True):
+        """Finish pending writes and shut the pool down"""
+        self.executor.shutdown(wait=wait)
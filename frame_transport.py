@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Shared-memory frame transport between capture and inference processes
+Frames are written once into fixed-size slots of a multiprocessing.shared_memory ring; only small
+descriptors (slot, source, frame number, timestamp, shape) travel through the queues. Inference
+processes read frames in place and send back plate boxes and OCR reads for the same slot, so the
+owner can cut plate crops from the slot without any pixel data being pickled either way.
+
+The owning process allocates and releases slots; a slot is reused only after its result has been
+handled, so workers never see a frame being overwritten.
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# sequence numbers submissions, so results can be handed out in submission order
+FrameDescriptor = namedtuple('FrameDescriptor', ['sequence', 'slot', 'source', 'frame_number', 'timestamp',
+                                                 'shape'])
+# reads: [(box, (text, confidence, chars)), ...] for every detected plate
+ResultDescriptor = namedtuple('ResultDescriptor', ['sequence', 'slot', 'source', 'frame_number', 'timestamp',
+                                                   'shape', 'reads', 'error'])
+
+
+class FrameRing:
+    """Fixed-size uint8 frame slots in one shared memory block"""
+
+    def __init__(self, slots, max_shape, name=None):
+        self.slots = slots
+        self.max_shape = tuple(max_shape)
+        self.slot_bytes = int(np.prod(self.max_shape))
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=slots * self.slot_bytes)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.name = self.shm.name
+
+    def view(self, slot, shape):
+        """ndarray over a slot's pixels (no copy)"""
+        return np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+
+    def write(self, slot, frame):
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame {frame.shape} does not fit slots of {self.max_shape}")
+        self.view(slot, frame.shape)[...] = frame
+        return frame.shape
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _inference_worker(ring_name, slots, max_shape, model_args, tasks, results):
+    """Worker process: load models, then read descriptors until a None sentinel"""
+    from cpu_tuning import apply_torch_settings
+    from model_manager import load_model_pair, warmup_model_pair
+    from plate_pipeline import detect_plate_boxes, recognize_crops
+    from tiled_detection import detect_tiled
+
+    if model_args['thread_settings']:
+        apply_torch_settings(model_args['thread_settings'])
+    ring = FrameRing(slots, max_shape, name=ring_name)
+    conf, image_size = model_args['conf'], model_args['image_size']
+    try:
+        models = load_model_pair(model_args['base_dir'], model_args['model_size'], model_args['backend'],
+                                 device=model_args['device'])
+        warmup_model_pair(models, image_size, conf=conf)
+    except Exception as e:
+        ring.shm.close()
+        results.put(f"{type(e).__name__}: {e}")
+        return
+    results.put(None)  # ready
+    frame = crops = None
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            reads, error = [], None
+            try:
+                frame = ring.view(task.slot, task.shape)
+                if model_args['tiled']:
+                    boxes = detect_tiled(models.detector, frame, conf, tile_size=image_size,
+                                         overlap=model_args['tile_overlap'])
+                else:
+                    boxes = detect_plate_boxes(models.detector, [frame], conf, image_size)[0]
+                boxes = [(x1, y1, x2, y2) for x1, y1, x2, y2 in boxes if x2 > x1 and y2 > y1]
+                crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in boxes]
+                reads = list(zip(boxes, recognize_crops(models.recognizer, crops, conf, image_size,
+                                                        model_args['min_detection_length'])))
+            except Exception as e:
+                error = str(e)
+            results.put(ResultDescriptor(task.sequence, task.slot, task.source, task.frame_number,
+                                         task.timestamp, task.shape, reads, error))
+    finally:
+        frame = crops = None  # views must go before the mapping is closed
+        ring.shm.close()
+
+
+class SharedMemoryInference:
+    """Owner side: frames in through a shared ring, plate reads back from inference processes"""
+
+    def __init__(self, base_dir, model_size='n', backend='pt', device=None, image_size=640, conf=0.25,
+                 min_detection_length=3, tiled=False, tile_overlap=0.2, thread_settings=None, workers=1,
+                 slots=8, max_shape=(1080, 1920, 3)):
+        self.workers = max(1, int(workers))
+        # Enough slots for every worker to have one in flight and one queued
+        self.ring = FrameRing(max(slots, 2 * self.workers), max_shape)
+        self.model_args = {
+            'base_dir': base_dir, 'model_size': model_size, 'backend': backend, 'device': device,
+            'image_size': image_size, 'conf': conf, 'min_detection_length': min_detection_length,
+            'tiled': tiled, 'tile_overlap': tile_overlap, 'thread_settings': thread_settings,
+        }
+        context = multiprocessing.get_context('spawn')
+        self.tasks = context.Queue()
+        self.results = context.Queue()
+        self.processes = [
+            context.Process(target=_inference_worker, name=f"inference-{i}", daemon=True,
+                            args=(self.ring.name, self.ring.slots, self.ring.max_shape, self.model_args,
+                                  self.tasks, self.results))
+            for i in range(self.workers)
+        ]
+        self.free = list(range(self.ring.slots))
+        self.slot_available = threading.Condition()
+        self.in_flight = 0
+        self.next_sequence = 0  # next sequence to submit
+        self.next_result = 0  # next sequence to hand out
+        self.reorder = {}  # results that arrived ahead of next_result
+        self.submitted = 0
+        self.dropped = 0
+        self.closed = False
+        self.failed = None  # why the run can no longer complete (an inference process died)
+
+    def start(self, timeout=300):
+        """Start the workers and wait until all of them have loaded their models"""
+        for process in self.processes:
+            process.start()
+        deadline = time.monotonic() + timeout
+        ready = 0
+        while ready < len(self.processes):
+            try:
+                error = self.results.get(timeout=0.5)
+            except queue.Empty:
+                self.check_workers()
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"Inference processes not ready after {timeout}s")
+                continue
+            if error is not None:
+                raise RuntimeError(f"Inference process failed to start: {error}")
+            ready += 1
+        return self
+
+    def check_workers(self):
+        """Raise RuntimeError if an inference process has died
+
+        Its in-flight frame would never come back, so waiting for results in order would hang.
+        Blocked and later submits return False from then on.
+        """
+        with self.slot_available:
+            if self.failed is None and not self.closed:
+                dead = [process for process in self.processes if process.exitcode is not None]
+                if dead:
+                    self.failed = ", ".join(f"{process.name} exited with code {process.exitcode}"
+                                            for process in dead)
+                    self.slot_available.notify_all()
+            if self.failed is not None:
+                raise RuntimeError(f"Inference process died: {self.failed}")
+
+    def submit(self, source, frame_number, frame, timestamp, block=True, timeout=None):
+        """Copy a frame into a free slot and queue it; False if no slot freed up (frame dropped)"""
+        with self.slot_available:
+            if not self.free and block:
+                self.slot_available.wait_for(lambda: self.free or self.closed or self.failed, timeout)
+            if not self.free or self.closed or self.failed:
+                self.dropped += 1
+                return False
+            slot = self.free.pop()
+            self.in_flight += 1
+            sequence = self.next_sequence
+            self.next_sequence += 1
+            self.submitted += 1
+            # Written under the lock so stop() never unmaps the ring mid-copy
+            try:
+                shape = self.ring.write(slot, frame)
+            except ValueError as e:
+                # Keep the sequence gap-free: an oversized frame comes back as an error result
+                self.results.put(ResultDescriptor(sequence, slot, source, frame_number, timestamp, None, [],
+                                                  str(e)))
+                return True
+        self.tasks.put(FrameDescriptor(sequence, slot, source, frame_number, timestamp, shape))
+        return True
+
+    def get_result(self, timeout=None):
+        """Next ResultDescriptor in submission order, or None on timeout (single consumer)
+
+        release() each result when done with its frame. Raises RuntimeError (see check_workers)
+        instead of waiting forever for a frame whose inference process died.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.next_result not in self.reorder:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            wait = 0.5 if remaining is None else min(0.5, remaining)
+            try:
+                result = self.results.get(timeout=wait)
+            except queue.Empty:
+                self.check_workers()
+                if remaining is not None and remaining <= wait:
+                    return None
+                continue
+            self.reorder[result.sequence] = result
+        result = self.reorder.pop(self.next_result)
+        self.next_result += 1
+        return result
+
+    def pending(self):
+        """Submitted frames whose results have not been handed out yet"""
+        with self.slot_available:
+            return self.next_sequence - self.next_result
+
+    def frame(self, result):
+        """The result's frame, read in place from its slot (None if it never made it into the slot)"""
+        if result.shape is None:
+            return None
+        return self.ring.view(result.slot, result.shape)
+
+    def release(self, result):
+        with self.slot_available:
+            self.free.append(result.slot)
+            self.in_flight -= 1
+            self.slot_available.notify()
+
+    def stats(self):
+        with self.slot_available:
+            return {'workers': self.workers, 'slots': self.ring.slots, 'in_flight': self.in_flight,
+                    'submitted': self.submitted, 'dropped': self.dropped}
+
+    def stop(self, timeout=5.0):
+        """Stop the workers and free the shared memory (no frame views may be used afterwards)"""
+        with self.slot_available:
+            if self.closed:
+                return
+            self.closed = True
+            self.slot_available.notify_all()
+        started = [process for process in self.processes if process.pid is not None]
+        for _ in started:
+            self.tasks.put(None)
+        for process in started:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self.ring.close()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Hard-example mining for OCR training data
+Plate crops whose reads fail the plate filter or never stabilize are saved with the current OCR
+boxes as YOLO pre-labels, ready to be corrected and added to the OCR training set.
+Sampling is rate-limited and deduplicated by perceptual hash before any copy or encode happens,
+and the on-disk queue is bounded: the oldest samples are dropped first.
+
+Queue layout (stem = <time>_<reason>_<hash>):
+    images/<stem>.jpg   plate crop
+    labels/<stem>.txt   YOLO pre-labels from the OCR boxes (class cx cy w h, normalized)
+    meta/<stem>.json    reason, read text, confidence and time
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import cv2
+
+from ocr_cache import dhash, hamming
+
+QUEUE_DIRS = ('images', 'labels', 'meta')
+
+
+def yolo_label_lines(chars, width, height):
+    """YOLO label lines for OCR character boxes (center_x, class_id, conf, xyxy) in crop pixels"""
+    lines = []
+    for char in chars:
+        class_id, (x1, y1, x2, y2) = char[1], char[3]
+        cx, cy = (x1 + x2) / 2 / width, (y1 + y2) / 2 / height
+        w, h = (x2 - x1) / width, (y2 - y1) / height
+        lines.append(f"{class_id} {cx:.6f} {cy:.6f} {w:.6f} {h:.6f}")
+    return lines
+
+
+class HardExampleMiner:
+    """Samples hard plate crops into a bounded on-disk queue off the detection thread"""
+
+    def __init__(self, output_dir, max_items=5000, rate_per_minute=30, max_distance=4,
+                 recent_hashes=512, max_pending=16, quality=95, clock=time.monotonic, hash_crop=dhash):
+        self.output_dir = output_dir
+        self.clock = clock  # injectable for tests, like hash_crop
+        self.hash_crop = hash_crop
+        self.max_items = max_items
+        self.max_distance = max_distance
+        self.max_pending = max_pending
+        self.encode_params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+
+        # Token bucket: bursts of up to rate_per_minute samples, refilled continuously
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, float(rate_per_minute))
+        self.tokens = self.capacity
+        self.last_refill = clock()
+
+        self.lock = threading.Lock()
+        self.recent = deque(maxlen=recent_hashes)
+        self.items = deque()  # queued stems, oldest first
+        self.pending = 0
+        self.saved = 0
+        self.rate_limited = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self.evicted = 0
+        self.errors = 0
+
+        for name in QUEUE_DIRS:
+            os.makedirs(os.path.join(output_dir, name), exist_ok=True)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hard-examples")
+        self.executor.submit(self._scan_existing)
+
+    def _scan_existing(self):
+        """Index samples from previous runs (stems start with a timestamp, so names sort by age)"""
+        image_dir = os.path.join(self.output_dir, 'images')
+        stems = sorted(os.path.splitext(name)[0] for name in os.listdir(image_dir) if name.endswith('.jpg'))
+        with self.lock:
+            known = set(self.items)
+            self.items = deque([s for s in stems if s not in known] + list(self.items))
+        self._enforce_limit()
+
+    def _take_token(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+    def submit(self, crop, chars, reason, text='', confidence=0.0):
+        """Offer a hard crop; returns True if it was queued for writing
+
+        Cheap when rejected: the rate limit is checked before hashing (so at most
+        rate_per_minute crops are hashed per minute), and a crop is only copied once it is new.
+        """
+        if crop is None or crop.size == 0:
+            return False
+        with self.lock:
+            if self.pending >= self.max_pending:
+                self.dropped += 1
+                return False
+            if not self._take_token():
+                self.rate_limited += 1
+                return False
+
+        crop_hash = self.hash_crop(crop)
+        with self.lock:
+            if any(hamming(crop_hash, seen) <= self.max_distance for seen in self.recent):
+                self.duplicates += 1
+                return False
+            self.recent.append(crop_hash)
+            self.pending += 1
+
+        now = datetime.now()
+        stem = f"{now.strftime('%Y%m%d_%H%M%S_%f')}_{reason}_{crop_hash:016x}"
+        meta = {'reason': reason, 'text': text, 'confidence': round(float(confidence), 4),
+                'timestamp': now.strftime("%Y-%m-%d %H:%M:%S")}
+        self.executor.submit(self._write, stem, crop.copy(), list(chars), meta)
+        return True
+
+    def _write(self, stem, crop, chars, meta):
+        try:
+            height, width = crop.shape[:2]
+            ok, buffer = cv2.imencode('.jpg', crop, self.encode_params)
+            if not ok:
+                raise RuntimeError(f"Failed to encode {stem}")
+            with open(os.path.join(self.output_dir, 'labels', stem + '.txt'), 'w') as f:
+                f.write("\n".join(yolo_label_lines(chars, width, height)) + "\n")
+            with open(os.path.join(self.output_dir, 'meta', stem + '.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            # Image last: a sample counts as queued once its image exists
+            with open(os.path.join(self.output_dir, 'images', stem + '.jpg'), 'wb') as f:
+                f.write(buffer.tobytes())
+            with self.lock:
+                self.items.append(stem)
+                self.saved += 1
+        except Exception as e:
+            with self.lock:
+                self.errors += 1
+            print(f"Hard example write error: {e}")
+        finally:
+            with self.lock:
+                self.pending -= 1
+        self._enforce_limit()
+
+    def _enforce_limit(self):
+        """Drop the oldest samples until at most max_items remain"""
+        while True:
+            with self.lock:
+                if len(self.items) <= self.max_items:
+                    return
+                stem = self.items.popleft()
+                self.evicted += 1
+            for name, ext in zip(QUEUE_DIRS, ('.jpg', '.txt', '.json')):
+                try:
+                    os.remove(os.path.join(self.output_dir, name, stem + ext))
+                except OSError:
+                    pass
+
+    def stats(self):
+        """Counters for display in the GUI"""
+        with self.lock:
+            return {
+                'queued': len(self.items),
+                'saved': self.saved,
+                'rate_limited': self.rate_limited,
+                'duplicates': self.duplicates,
+                'dropped': self.dropped,
+                'evicted': self.evicted,
+                'errors': self.errors,
+            }
+
+    def close(self, wait=True):
+        """Finish pending writes and shut the worker down"""
+        self.executor.shutdown(wait=wait)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Headless plate reading with inference in worker processes
+Capture and decoding stay in this process; frames go to the inference processes through the
+shared-memory frame ring (frame_transport), and plate reads come back as small descriptors.
+
+Usage:
+    python headless_runner.py traffic.mp4 --inference-workers 3 --output reads.jsonl
+    python headless_runner.py 0 --live --model-size n     # camera 0, drops frames to stay real time
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+import cv2
+
+from cpu_tuning import add_thread_arguments, settings_from_args, apply_process_settings
+from frame_transport import SharedMemoryInference
+
+
+def open_capture(source):
+    """cv2.VideoCapture for a camera index ('0') or a file/stream path"""
+    cap = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Could not open {source}")
+    return cap
+
+
+def consume_results(transport, output, finished, counts):
+    """Write one JSON line per plate read, in frame order, until capture ended and all results are in"""
+    while True:
+        try:
+            result = transport.get_result(timeout=0.2)
+        except RuntimeError as e:  # an inference process died; its frames will never arrive
+            counts['failed'] = str(e)
+            return
+        if result is None:
+            if finished.is_set() and not transport.pending():
+                return
+            continue
+        transport.release(result)  # only the descriptors are needed here
+        counts['frames'] += 1
+        if result.error:
+            counts['errors'] += 1
+            print(f"Inference error on frame {result.frame_number}: {result.error}", file=sys.stderr)
+            continue
+        for box, (text, confidence, _) in result.reads:
+            if not text:
+                continue
+            counts['reads'] += 1
+            output.write(json.dumps({
+                'source': result.source, 'frame': result.frame_number,
+                'timestamp': round(result.timestamp, 3), 'plate': text,
+                'confidence': round(float(confidence), 4), 'box': [int(v) for v in box],
+            }, ensure_ascii=False) + "\n")
+        output.flush()
+
+
+def run(source, transport, output, frame_skip=1, live=False, max_frames=0):
+    """Capture in this thread, read plates in the worker processes; returns run counters"""
+    cap = open_capture(source)
+    finished = threading.Event()
+    counts = {'frames': 0, 'reads': 0, 'errors': 0, 'failed': None}
+    consumer = threading.Thread(target=consume_results, args=(transport, output, finished, counts),
+                                name="results", daemon=True)
+    consumer.start()
+    name = os.path.basename(source) if not source.isdigit() else f"camera{source}"
+    start = time.perf_counter()
+    frame_number = 0
+    try:
+        while not max_frames or transport.submitted + transport.dropped < max_frames:
+            for _ in range(max(1, frame_skip) - 1):
+                if not cap.grab():
+                    break
+                frame_number += 1
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frame_number += 1
+            # File sources wait for a free slot; live sources drop the frame instead
+            if not transport.submit(name, frame_number, frame, time.time(), block=not live) and transport.failed:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cap.release()
+        finished.set()
+    consumer.join()
+    elapsed = time.perf_counter() - start
+    counts.update(transport.stats())
+    counts['seconds'] = elapsed
+    counts['fps'] = counts['frames'] / elapsed if elapsed > 0 else 0.0
+    return counts
+
+
+def main():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Read plates from a video or camera with multi-process inference")
+    parser.add_argument('source', help="video file, stream URL, or camera index")
+    parser.add_argument('--model-size', default='s', choices=['n', 's', 'm'])
+    parser.add_argument('--backend', default='pt', choices=['pt', 'onnx', 'openvino'])
+    parser.add_argument('--device', default=None, help="cpu, cuda (default: auto)")
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--conf', type=float, default=0.25)
+    parser.add_argument('--min-length', type=int, default=3, help="minimum characters for a read")
+    parser.add_argument('--tiled', action='store_true', help="tiled plate detection for small/distant plates")
+    parser.add_argument('--tile-overlap', type=float, default=0.2)
+    parser.add_argument('--frame-skip', type=int, default=1, help="process every Nth frame")
+    parser.add_argument('--live', action='store_true', help="drop frames instead of waiting (cameras/streams)")
+    parser.add_argument('--slots', type=int, default=8, help="shared-memory frame slots")
+    parser.add_argument('--max-frames', type=int, default=0, help="stop after this many frames (0 = all)")
+    parser.add_argument('--output', default=None, help="JSONL file for plate reads (default: stdout)")
+    add_thread_arguments(parser)
+    args = parser.parse_args()
+
+    settings = settings_from_args(args, base_dir)
+    apply_process_settings(settings)
+    try:
+        cap = open_capture(args.source)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 1920
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 1080
+    cap.release()
+
+    workers = settings['inference_workers'] or 1
+    transport = SharedMemoryInference(base_dir, model_size=args.model_size, backend=args.backend,
+                                      device=args.device, image_size=args.imgsz, conf=args.conf,
+                                      min_detection_length=args.min_length, tiled=args.tiled,
+                                      tile_overlap=args.tile_overlap, thread_settings=settings,
+                                      workers=workers, slots=args.slots, max_shape=(height, width, 3))
+    output = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    try:
+        print(f"Starting {workers} inference process(es) with model {args.model_size.upper()}...", file=sys.stderr)
+        transport.start()
+        counts = run(args.source, transport, output, frame_skip=args.frame_skip, live=args.live,
+                     max_frames=args.max_frames)
+    finally:
+        transport.stop()
+        if output is not sys.stdout:
+            output.close()
+    if counts['failed']:
+        print(f"❌ {counts['failed']} after {counts['frames']} frames", file=sys.stderr)
+        sys.exit(1)
+    print(f"✅ {counts['frames']} frames in {counts['seconds']:.1f}s ({counts['fps']:.1f} FPS), "
+          f"{counts['reads']} reads, {counts['dropped']} dropped, {counts['errors']} errors", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
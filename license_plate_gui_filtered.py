@@ -4,22 +4,40 @@ Bengali License Plate Recognition GUI with Regex Filter
 Enhanced version with license plate format validation
 """
 
+import time
+_START_TIME = time.perf_counter()  # process launch reference for startup timing
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import cv2
 from PIL import Image, ImageTk
 import threading
-import time
 from collections import Counter, deque
 import json
 import os
-import re
 from datetime import datetime
-from ultralytics import YOLO
-import torch
+from model_manager import ModelManager
+from plate_pipeline import (CHAR_MAP, LICENSE_PATTERNS, DEFAULT_FILTER_SETTINGS, validate_plate,
+                            detect_plate_boxes, recognize_crops, ordered_class_ids, DetectionRecord)
+from cpu_tuning import (DEFAULT_THREAD_SETTINGS, apply_process_settings, apply_torch_settings,
+                        add_thread_arguments, settings_from_args, autotune)
+from detection_export import StreamingExporter, EXPORT_FORMATS
+from evidence_writer import EvidenceWriter, EVIDENCE_FORMATS
+from async_runtime import AsyncRuntime, CaptureSource
+from ocr_cache import OCRCache
+from tiled_detection import detect_tiled
+from ocr_cascade import CascadeStats, recognize_cascade
+from hard_example_miner import HardExampleMiner
+from detection_store import DetectionStore
+from saved_list_view import DetectionListView
+from frame_transport import SharedMemoryInference
+from plate_index import PlateIndex, MATCH_MODES
+from video_recorder import VideoRecorder, RECORD_MODES
+from archive_scan import (WindowedCaptureSource, sample_positions, sparse_scan, hit_windows,
+                          window_frames, format_duration)
 
 class LicensePlateGUI:
-    def __init__(self, root):
+    def __init__(self, root, thread_settings=None):
         self.root = root
         self.root.title("Bengali License Plate Recognition System with Filter")
         
@@ -42,65 +60,125 @@ class LicensePlateGUI:
         
         # Initialize variables
         self.cap = None
+        self.runtime = None
+        self.shared_inference = None  # SharedMemoryInference while inference runs in worker processes
+        self.archive_source = None  # WindowedCaptureSource during pass 2 of an archive scan
         self.is_running = False
+        self.pending_display = None  # latest processed frame waiting for the Tk thread
         self.current_frame = None
         self.detection_history = deque(maxlen=50)
         self.stable_detections = []
-        self.saved_plates = []
+        self.detection_store = DetectionStore()  # saved DetectionRecords, indexed by plate and time
+        self.last_read = None  # (chars, confidence, box, position) of the first plate in the latest frame
+        
+        # Current source for the plate index: path (or camera id), fps and (frame, seconds) being processed
+        self.source_path = None
+        self.source_fps = 0.0
+        self.frame_position = (None, None)
+        
+        self.base_dir = os.path.dirname(os.path.abspath(__file__))
+        
+        # CPU threading (CLI/host profile values; torch settings apply on the loader thread)
+        self.thread_settings = dict(DEFAULT_THREAD_SETTINGS)
+        self.thread_settings.update(thread_settings or {})
+        try:
+            apply_process_settings(self.thread_settings)
+        except (ValueError, OSError) as e:
+            # e.g. a bad --cpu-affinity: start anyway and report it once the window is up
+            error = str(e)
+            self.root.after(0, lambda: messagebox.showerror("Error", f"Invalid thread settings: {error}"))
+        
+        # Model variables (the active detector/OCR pair lives in the manager)
+        self.model_manager = ModelManager(self.base_dir, cache_size=2,
+                                          setup=lambda: apply_torch_settings(self.thread_settings))
+        
+        # Startup timing (seconds since launch) and capture start for first-frame latency
+        self.startup_times = {}
+        self.capture_start_time = None
+        
+        # Streaming exporter (created when streaming export is enabled)
+        self.exporter = None
+        
+        # OCR result cache (None when disabled) and the recognizer its reads came from
+        self.ocr_cache = None
+        self.ocr_cache_recognizer = None
+        
+        # Evidence snapshot writer and the crop of the most recent read
+        self.evidence_writer = None
+        self.last_plate_crop = None
         
-        # Model variables
-        self.plate_detector = None
-        self.char_recognizer = None
+        # Hard-example sampler for OCR training data (None when disabled)
+        self.hard_example_miner = None
+        
+        # Annotated video recorder (None when disabled)
+        self.recorder = None
+        
+        # Persistent index of accepted reads (source, frame, media time) for search-and-jump
+        self.plate_index = None
+        self.index_hits = []
+        
+        # Per-tier OCR call counts in cascade mode
+        self.cascade_stats = CascadeStats()
         
         # Configuration parameters
         self.config = {
             'model_size': 's',
+            'model_backend': 'pt',
+            'warmup': True,
             'frame_skip': 1,
             'confidence_threshold': 0.25,
             'image_size': 640,
             'stability_threshold': 5,
             'min_detection_length': 3,
+            'export_format': 'jsonl',
+            'export_dir': os.path.join(self.base_dir, 'exports'),
+            'export_max_mb': 10,
+            'export_row_group_size': 1000,
+            'evidence_dir': os.path.join(self.base_dir, 'evidence'),
+            'evidence_format': 'jpg',
+            'evidence_max_mb': 500,
+            'alert_watchlist': '',
+            'index_path': os.path.join(self.base_dir, 'plate_index.sqlite'),
+            'recording_dir': os.path.join(self.base_dir, 'recordings'),
+            'recording_mode': 'clips',
+            'recording_pre_roll': 3.0,
+            'recording_post_roll': 3.0,
+            'mining_dir': os.path.join(self.base_dir, 'hard_examples'),
+            'mining_max_items': 5000,
+            'mining_rate_per_minute': 30,
+            'shared_memory_inference': False,
+            'scan_sample_fps': 2.0,
+            'scan_before_seconds': 2.0,
+            'scan_after_seconds': 3.0,
+            'tiled_detection': False,
+            'tile_overlap': 0.2,
+            'cascade': False,
+            'cascade_size': 's',
+            'cascade_min_confidence': 0.6,
+            'ocr_cache_size': 256,
+            'ocr_cache_tolerance': 2,
+            'ocr_cache_verify_every': 0,
         }
         
         # License plate format patterns (NEW FEATURE!)
-        self.license_patterns = {
-            'standard': r'^[A-Za-z]+Metro[A-Za-z]+\s+\d{6}$',  # ChattoMetroGa 138707
-            'metro_basic': r'^[A-Za-z]+Metro\s+\d{6}$',        # DhakaMetro 115636
-            'district_simple': r'^(?!.*Metro)[A-Za-z]+\s+\d{2,6}$',  # Chatto 13 (excludes Metro)
-            'custom': r'',
-        }
+        self.license_patterns = dict(LICENSE_PATTERNS)
         
         # Filter settings (NEW FEATURE!)
-        self.filter_settings = {
-            'enabled': True,
-            'pattern_type': 'standard',
-            'custom_pattern': '',
-            'allow_multiple_patterns': False,
-        }
+        self.filter_settings = dict(DEFAULT_FILTER_SETTINGS)
         
         # Character mapping
-        self.char_map = {
-            0: '0', 1: '1', 2: '2', 3: '3', 4: '4', 5: '5', 6: '6', 7: '7', 8: '8', 9: '9',
-            10: 'Metro', 11: 'A', 12: 'Bha', 13: 'Cha', 14: 'Chha', 15: 'Da', 16: 'DA', 17: 'E',
-            18: 'Ga', 19: 'Gha', 20: 'Ha', 21: 'Ja', 22: 'Jha', 23: 'Ka', 24: 'Kha', 25: 'La',
-            26: 'Ma', 27: 'Na', 28: 'Pa', 29: 'Sa', 30: 'Sha', 31: 'Ta', 32: 'THA', 33: 'Tha',
-            34: 'U', 35: 'Bagerhat', 36: 'Bagura', 37: 'Bandarban', 38: 'Barguna', 39: 'Barisal',
-            40: 'Bhola', 41: 'Brahmanbaria', 42: 'Chandpur', 43: 'Chapainawabganj', 44: 'Chatto',
-            45: 'Chattogram', 46: 'Chuadanga', 47: 'Coxs Bazar', 48: 'Cumilla', 49: 'Dhaka',
-            50: 'Dinajpur', 51: 'Faridpur', 52: 'Feni', 53: 'Gaibandha', 54: 'Gazipur',
-            55: 'Gopalganj', 56: 'Habiganj', 57: 'Jamalpur', 58: 'Jessore', 59: 'Jhalokati',
-            60: 'Jhenaidah', 61: 'Joypurhat', 62: 'Khagrachari', 63: 'Khulna', 64: 'Kishoreganj',
-            65: 'Kurigram', 66: 'Kustia', 67: 'Lakshmipur', 68: 'Lalmonirhat', 69: 'Madaripur',
-            70: 'Magura', 71: 'Manikganj', 72: 'Meherpur', 73: 'Moulvibazar', 74: 'Mymensingh',
-            75: 'Naogaon', 76: 'Narail', 77: 'Narayanganj', 78: 'Narsingdi', 79: 'Natore',
-            80: 'Netrokona', 81: 'Nilphamari', 82: 'Noakhali', 83: 'Pabna', 84: 'panchagarh',
-            85: 'Patuakhali', 86: 'Pirojpur', 87: 'Raj', 88: 'Rajbari', 89: 'Rajshahi',
-            90: 'Rangamati', 91: 'Rangpur', 92: 'Satkhira', 93: 'Shariatpur', 94: 'Sherpur',
-            95: 'Sirajganj', 96: 'Sunamganj', 97: 'Sylhet', 98: 'Tangail', 99: 'Thakurgaon',
-            100: 'Dha', 101: 'Ba'
-        }
+        self.char_map = CHAR_MAP
+        
+        try:
+            self.plate_index = PlateIndex(self.config['index_path'])
+        except Exception as e:
+            print(f"Plate index unavailable: {e}")
         
         self.create_widgets()
+        
+        # Show the window right away; models import and load in the background
+        self.root.update_idletasks()
+        self.record_startup('window')
         self.load_models()
         
     def create_widgets(self):
@@ -133,6 +211,9 @@ class LicensePlateGUI:
         self.load_video_btn = ttk.Button(control_frame, text="Load Video", command=self.load_video)
         self.load_video_btn.pack(side=tk.LEFT, padx=5)
         
+        self.scan_btn = ttk.Button(control_frame, text="Scan Archive", command=self.scan_archive)
+        self.scan_btn.pack(side=tk.LEFT, padx=5)
+        
         self.stop_btn = ttk.Button(control_frame, text="Stop", command=self.stop_capture)
         self.stop_btn.pack(side=tk.LEFT, padx=5)
         
@@ -146,6 +227,10 @@ class LicensePlateGUI:
         self.fps_label = ttk.Label(status_frame, text="FPS: 0")
         self.fps_label.pack()
         
+        # Per-task latency from the runtime
+        self.runtime_stats_label = ttk.Label(status_frame, text="", font=('Arial', 8))
+        self.runtime_stats_label.pack()
+        
         # Right side - Scrollable control panel
         right_main_frame = ttk.Frame(main_paned)
         main_paned.add(right_main_frame, weight=1)  # Less weight for control panel
@@ -216,9 +301,102 @@ class LicensePlateGUI:
         stability_spin = ttk.Spinbox(config_frame, from_=3, to=20, textvariable=self.stability_var, width=15)
         stability_spin.grid(row=4, column=1, pady=2, padx=(5, 0))
         
+        # Tiled detection (tiles are Image Size pixels, for small plates in high-res frames)
+        self.tiled_var = tk.BooleanVar(value=self.config['tiled_detection'])
+        tiled_check = ttk.Checkbutton(config_frame, text="Tiled Detection (high-res cameras)",
+                                      variable=self.tiled_var)
+        tiled_check.grid(row=5, column=0, columnspan=3, sticky=tk.W, pady=2)
+        
+        # Cascade: nano models on every frame, uncertain reads re-read by a larger OCR model
+        self.cascade_var = tk.BooleanVar(value=self.config['cascade'])
+        cascade_check = ttk.Checkbutton(config_frame, text="Cascade (n, escalate uncertain reads)",
+                                        variable=self.cascade_var, command=self.on_cascade_change)
+        cascade_check.grid(row=6, column=0, columnspan=3, sticky=tk.W, pady=2)
+        
+        ttk.Label(config_frame, text="Escalate To:").grid(row=7, column=0, sticky=tk.W, pady=2)
+        self.cascade_size_var = tk.StringVar(value=self.config['cascade_size'])
+        cascade_combo = ttk.Combobox(config_frame, textvariable=self.cascade_size_var,
+                                     values=['s', 'm'], state='readonly', width=15)
+        cascade_combo.grid(row=7, column=1, pady=2, padx=(5, 0))
+        cascade_combo.bind('<<ComboboxSelected>>', self.on_cascade_change)
+        
+        ttk.Label(config_frame, text="Escalate Below:").grid(row=8, column=0, sticky=tk.W, pady=2)
+        self.cascade_confidence_var = tk.DoubleVar(value=self.config['cascade_min_confidence'])
+        ttk.Spinbox(config_frame, from_=0.1, to=0.95, increment=0.05, textvariable=self.cascade_confidence_var,
+                    width=15).grid(row=8, column=1, pady=2, padx=(5, 0))
+        
         # Apply button
         apply_btn = ttk.Button(config_frame, text="Apply Settings", command=self.apply_settings)
-        apply_btn.grid(row=5, column=0, columnspan=2, pady=10)
+        apply_btn.grid(row=9, column=0, columnspan=2, pady=10)
+        
+        # CPU threading panel
+        threads_frame = ttk.LabelFrame(right_frame, text="⚙ CPU Threads", padding=10)
+        threads_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.thread_vars = {}
+        thread_fields = [
+            ('torch_intra_threads', "Torch Threads:"),
+            ('torch_inter_threads', "Torch Inter-op:"),
+            ('cv2_threads', "OpenCV Threads:"),
+            ('inference_workers', "Worker Processes:"),
+        ]
+        cores = os.cpu_count() or 1
+        self.thread_spinboxes = {}
+        for row, (key, label) in enumerate(thread_fields):
+            ttk.Label(threads_frame, text=label).grid(row=row, column=0, sticky=tk.W, pady=2)
+            var = tk.IntVar(value=self.thread_settings[key])
+            spinbox = ttk.Spinbox(threads_frame, from_=0, to=cores * 2, textvariable=var, width=15)
+            spinbox.grid(row=row, column=1, pady=2, padx=(5, 0))
+            self.thread_vars[key] = var
+            self.thread_spinboxes[key] = spinbox
+        
+        ttk.Label(threads_frame, text="CPU Affinity:").grid(row=4, column=0, sticky=tk.W, pady=2)
+        self.affinity_var = tk.StringVar(value=self.thread_settings['cpu_affinity'])
+        ttk.Entry(threads_frame, textvariable=self.affinity_var, width=17).grid(row=4, column=1, pady=2, padx=(5, 0))
+        
+        self.shared_memory_var = tk.BooleanVar(value=self.config['shared_memory_inference'])
+        ttk.Checkbutton(threads_frame, text="Inference in worker processes", variable=self.shared_memory_var,
+                        command=self.on_shared_memory_change).grid(row=5, column=0, columnspan=2,
+                                                                   sticky=tk.W, pady=2)
+        self.on_shared_memory_change()
+        
+        threads_btn_frame = ttk.Frame(threads_frame)
+        threads_btn_frame.grid(row=6, column=0, columnspan=2, pady=5)
+        ttk.Button(threads_btn_frame, text="Apply", command=self.apply_thread_settings).pack(side=tk.LEFT, padx=(0, 5))
+        self.autotune_btn = ttk.Button(threads_btn_frame, text="Auto-Tune", command=self.run_autotune)
+        self.autotune_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.threads_status_label = ttk.Label(threads_frame, text="0 = library default", font=('Arial', 9),
+                                              wraplength=220)
+        self.threads_status_label.grid(row=7, column=0, columnspan=2, sticky=tk.W, pady=2)
+        
+        # OCR cache panel
+        cache_frame = ttk.LabelFrame(right_frame, text="⚡ OCR Cache", padding=10)
+        cache_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.ocr_cache_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(cache_frame, text="Reuse reads for repeated crops", variable=self.ocr_cache_var,
+                        command=self.apply_ocr_cache_settings).grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=2)
+        
+        ttk.Label(cache_frame, text="Hash Tolerance:").grid(row=1, column=0, sticky=tk.W, pady=2)
+        self.ocr_cache_tolerance_var = tk.IntVar(value=self.config['ocr_cache_tolerance'])
+        tolerance_spinbox = ttk.Spinbox(cache_frame, from_=0, to=16, textvariable=self.ocr_cache_tolerance_var,
+                                        width=15, command=self.apply_ocr_cache_settings)
+        tolerance_spinbox.grid(row=1, column=1, pady=2, padx=(5, 0))
+        
+        ttk.Label(cache_frame, text="Verify Every N:").grid(row=2, column=0, sticky=tk.W, pady=2)
+        self.ocr_cache_verify_var = tk.IntVar(value=self.config['ocr_cache_verify_every'])
+        verify_spinbox = ttk.Spinbox(cache_frame, from_=0, to=100, textvariable=self.ocr_cache_verify_var,
+                                     width=15, command=self.apply_ocr_cache_settings)
+        verify_spinbox.grid(row=2, column=1, pady=2, padx=(5, 0))
+        # command only fires on the arrows; typed values apply on Enter or when leaving the field
+        for spinbox in (tolerance_spinbox, verify_spinbox):
+            spinbox.bind('<Return>', lambda event: self.apply_ocr_cache_settings())
+            spinbox.bind('<FocusOut>', lambda event: self.apply_ocr_cache_settings())
+        
+        self.ocr_cache_status_label = ttk.Label(cache_frame, text="Cache: Off", font=('Arial', 9),
+                                                wraplength=220)
+        self.ocr_cache_status_label.grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=2)
         
         # ========================= NEW FILTER SECTION =========================
         # Filter configuration panel
@@ -304,21 +482,24 @@ class LicensePlateGUI:
                                            foreground='green' if self.filter_settings['enabled'] else 'red')
         self.filter_status_label.pack()
         
+        # Watchlist alerts
+        alert_frame = ttk.Frame(current_frame)
+        alert_frame.pack(fill=tk.X, pady=(5, 0))
+        ttk.Label(alert_frame, text="Watchlist:").pack(side=tk.LEFT)
+        self.watchlist_var = tk.StringVar(value=self.config['alert_watchlist'])
+        watchlist_entry = ttk.Entry(alert_frame, textvariable=self.watchlist_var, width=22)
+        watchlist_entry.pack(side=tk.LEFT, padx=(5, 0), fill=tk.X, expand=True)
+        self.watchlist_var.trace_add('write', self.on_watchlist_change)
+        self.alert_label = ttk.Label(current_frame, text="", font=('Arial', 9, 'bold'), foreground='red')
+        self.alert_label.pack()
+        
         # Saved detections panel with better height management
         saved_frame = ttk.LabelFrame(right_frame, text="Saved License Plates", padding=10)
         saved_frame.pack(fill=tk.X, pady=(0, 10))  # Changed from expand=True to fixed height
         
-        # Listbox with scrollbar and fixed height
-        list_frame = ttk.Frame(saved_frame)
-        list_frame.pack(fill=tk.X)
-        
-        # Set a reasonable height for the listbox
-        self.saved_listbox = tk.Listbox(list_frame, font=('Courier', 9), height=8)  # Courier font for better alignment
-        scrollbar_list = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.saved_listbox.yview)
-        self.saved_listbox.configure(yscrollcommand=scrollbar_list.set)
-        
-        self.saved_listbox.pack(side=tk.LEFT, fill=tk.X, expand=True)
-        scrollbar_list.pack(side=tk.RIGHT, fill=tk.Y)
+        # Virtualized list: only the visible page of the store is in the widget
+        self.saved_view = DetectionListView(saved_frame, self.detection_store, rows=8)
+        self.saved_view.pack(fill=tk.X)
         
         # Buttons for saved detections
         button_frame = ttk.Frame(saved_frame)
@@ -333,6 +514,122 @@ class LicensePlateGUI:
         delete_btn = ttk.Button(button_frame, text="Delete Selected", command=self.delete_selected)
         delete_btn.pack(side=tk.LEFT, padx=5)
         
+        # Plate index search panel
+        index_frame = ttk.LabelFrame(right_frame, text="🔎 Plate Index", padding=10)
+        index_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        query_frame = ttk.Frame(index_frame)
+        query_frame.pack(fill=tk.X)
+        self.index_query_var = tk.StringVar()
+        query_entry = ttk.Entry(query_frame, textvariable=self.index_query_var, width=14)
+        query_entry.pack(side=tk.LEFT)
+        query_entry.bind('<Return>', lambda event: self.search_index())
+        self.index_mode_var = tk.StringVar(value='prefix')
+        ttk.Combobox(query_frame, textvariable=self.index_mode_var, values=MATCH_MODES,
+                     state='readonly', width=7).pack(side=tk.LEFT, padx=5)
+        ttk.Button(query_frame, text="Search", command=self.search_index).pack(side=tk.LEFT)
+        
+        self.index_tree = ttk.Treeview(index_frame, columns=('plate', 'source', 'time'), show='headings',
+                                       height=6, selectmode='browse')
+        for column, title, width in (('plate', "Plate", 120), ('source', "Source", 90), ('time', "At", 55)):
+            self.index_tree.heading(column, text=title)
+            self.index_tree.column(column, width=width, stretch=column == 'plate')
+        self.index_tree.pack(fill=tk.X, pady=(5, 0))
+        self.index_tree.bind('<Double-1>', self.jump_to_hit)
+        
+        self.index_status_label = ttk.Label(index_frame, text="Double-click a match to play from its frame",
+                                            font=('Arial', 8), wraplength=220)
+        self.index_status_label.pack(anchor=tk.W)
+        
+        # Streaming export panel
+        stream_frame = ttk.LabelFrame(right_frame, text="💾 Streaming Export", padding=10)
+        stream_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.stream_export_var = tk.BooleanVar(value=False)
+        stream_check = ttk.Checkbutton(stream_frame, text="Stream detections to disk",
+                                       variable=self.stream_export_var,
+                                       command=self.toggle_streaming_export)
+        stream_check.grid(row=0, column=0, columnspan=3, sticky=tk.W, pady=2)
+        
+        ttk.Label(stream_frame, text="Format:").grid(row=1, column=0, sticky=tk.W, pady=2)
+        self.export_format_var = tk.StringVar(value=self.config['export_format'])
+        format_combo = ttk.Combobox(stream_frame, textvariable=self.export_format_var,
+                                    values=EXPORT_FORMATS, state='readonly', width=12)
+        format_combo.grid(row=1, column=1, pady=2, padx=(5, 0))
+        
+        folder_btn = ttk.Button(stream_frame, text="Folder...", command=self.choose_export_dir)
+        folder_btn.grid(row=1, column=2, pady=2, padx=(5, 0))
+        
+        self.export_status_label = ttk.Label(stream_frame, text="Export: Off", font=('Arial', 9),
+                                             wraplength=220)
+        self.export_status_label.grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=2)
+        
+        # Evidence snapshot panel
+        evidence_frame = ttk.LabelFrame(right_frame, text="📷 Evidence Snapshots", padding=10)
+        evidence_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.evidence_var = tk.BooleanVar(value=False)
+        evidence_check = ttk.Checkbutton(evidence_frame, text="Save plate crop + context image",
+                                         variable=self.evidence_var,
+                                         command=self.toggle_evidence)
+        evidence_check.grid(row=0, column=0, columnspan=3, sticky=tk.W, pady=2)
+        
+        ttk.Label(evidence_frame, text="Format:").grid(row=1, column=0, sticky=tk.W, pady=2)
+        self.evidence_format_var = tk.StringVar(value=self.config['evidence_format'])
+        evidence_format_combo = ttk.Combobox(evidence_frame, textvariable=self.evidence_format_var,
+                                             values=EVIDENCE_FORMATS, state='readonly', width=12)
+        evidence_format_combo.grid(row=1, column=1, pady=2, padx=(5, 0))
+        
+        ttk.Label(evidence_frame, text="Disk Cap (MB):").grid(row=2, column=0, sticky=tk.W, pady=2)
+        self.evidence_max_mb_var = tk.IntVar(value=self.config['evidence_max_mb'])
+        evidence_cap_spin = ttk.Spinbox(evidence_frame, from_=50, to=100000, increment=50,
+                                        textvariable=self.evidence_max_mb_var, width=12)
+        evidence_cap_spin.grid(row=2, column=1, pady=2, padx=(5, 0))
+        
+        self.evidence_status_label = ttk.Label(evidence_frame, text="Evidence: Off", font=('Arial', 9),
+                                               wraplength=220)
+        self.evidence_status_label.grid(row=3, column=0, columnspan=3, sticky=tk.W, pady=2)
+        
+        # Hard-example mining panel
+        mining_frame = ttk.LabelFrame(right_frame, text="⛏ Hard Examples", padding=10)
+        mining_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.mining_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(mining_frame, text="Collect failed/unstable reads for training",
+                        variable=self.mining_var, command=self.toggle_mining).grid(
+                            row=0, column=0, columnspan=3, sticky=tk.W, pady=2)
+        
+        ttk.Label(mining_frame, text="Max / Minute:").grid(row=1, column=0, sticky=tk.W, pady=2)
+        self.mining_rate_var = tk.IntVar(value=self.config['mining_rate_per_minute'])
+        ttk.Spinbox(mining_frame, from_=1, to=600, textvariable=self.mining_rate_var,
+                    width=12).grid(row=1, column=1, pady=2, padx=(5, 0))
+        
+        ttk.Label(mining_frame, text="Queue Limit:").grid(row=2, column=0, sticky=tk.W, pady=2)
+        self.mining_max_items_var = tk.IntVar(value=self.config['mining_max_items'])
+        ttk.Spinbox(mining_frame, from_=100, to=1000000, increment=100, textvariable=self.mining_max_items_var,
+                    width=12).grid(row=2, column=1, pady=2, padx=(5, 0))
+        
+        self.mining_status_label = ttk.Label(mining_frame, text="Mining: Off", font=('Arial', 9),
+                                             wraplength=220)
+        self.mining_status_label.grid(row=3, column=0, columnspan=3, sticky=tk.W, pady=2)
+        
+        # Annotated video recorder panel
+        recorder_frame = ttk.LabelFrame(right_frame, text="🎥 Recorder", padding=10)
+        recorder_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.recording_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(recorder_frame, text="Record annotated video", variable=self.recording_var,
+                        command=self.toggle_recording).grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=2)
+        
+        ttk.Label(recorder_frame, text="Mode:").grid(row=1, column=0, sticky=tk.W, pady=2)
+        self.recording_mode_var = tk.StringVar(value=self.config['recording_mode'])
+        ttk.Combobox(recorder_frame, textvariable=self.recording_mode_var, values=RECORD_MODES,
+                     state='readonly', width=12).grid(row=1, column=1, pady=2, padx=(5, 0))
+        
+        self.recording_status_label = ttk.Label(recorder_frame, text="Recorder: Off", font=('Arial', 9),
+                                                wraplength=220)
+        self.recording_status_label.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=2)
+        
         # Add some bottom padding to ensure scrolling works well
         bottom_spacer = ttk.Frame(right_frame, height=20)
         bottom_spacer.pack()
@@ -421,83 +718,79 @@ class LicensePlateGUI:
     
     def validate_license_plate(self, plate_text):
         """Validate license plate against regex patterns"""
-        if not self.filter_settings['enabled']:
-            return True  # If filter is disabled, all plates are valid
-        
-        plate_text = plate_text.strip()
-        if not plate_text:
-            return False
-        
-        if self.filter_settings['allow_multiple_patterns']:
-            # Check against all patterns
-            patterns_to_check = []
-            if self.filter_settings['pattern_type'] == 'custom':
-                if self.filter_settings['custom_pattern']:
-                    patterns_to_check.append(self.filter_settings['custom_pattern'])
-            else:
-                # Check against all predefined patterns
-                patterns_to_check.extend([
-                    self.license_patterns['standard'],
-                    self.license_patterns['metro_basic'],
-                    self.license_patterns['district_simple']
-                ])
-        else:
-            # Check against selected pattern only
-            if self.filter_settings['pattern_type'] == 'custom':
-                patterns_to_check = [self.filter_settings['custom_pattern']] if self.filter_settings['custom_pattern'] else []
-            else:
-                patterns_to_check = [self.license_patterns[self.filter_settings['pattern_type']]]
-        
-        # Test against patterns
-        for pattern in patterns_to_check:
-            if pattern:  # Only test non-empty patterns
-                try:
-                    if re.match(pattern, plate_text, re.IGNORECASE):
-                        return True
-                except re.error:
-                    # Invalid regex pattern
-                    continue
-        
-        return False
+        return validate_plate(plate_text, self.filter_settings, self.license_patterns)
+    
     # ===================================================================
         
+    @property
+    def plate_detector(self):
+        models = self.model_manager.active
+        return models.detector if models else None
+    
+    @property
+    def char_recognizer(self):
+        models = self.model_manager.active
+        return models.recognizer if models else None
+    
     def load_models(self):
-        """Load YOLO models based on current configuration"""
-        try:
-            model_size = self.config['model_size']
-            # Use absolute paths to ensure models are found
-            import os
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            detection_path = os.path.join(base_dir, f"model-{model_size}-detection", "best.pt")
-            ocr_path = os.path.join(base_dir, f"model-{model_size}-ocr", "best.pt")
-            
-            # Check if files exist
-            if not os.path.exists(detection_path):
-                raise FileNotFoundError(f"Detection model not found: {detection_path}")
-            if not os.path.exists(ocr_path):
-                raise FileNotFoundError(f"OCR model not found: {ocr_path}")
+        """Load YOLO models based on current configuration (in the background)"""
+        # Cascade mode runs the nano pair on every frame; the larger OCR model loads alongside
+        model_size = 'n' if self.config['cascade'] else self.config['model_size']
+        backend = self.config['model_backend']
+        self.status_label.config(text=f"Status: Loading models (Size: {model_size.upper()})...")
+        
+        def on_progress(message):
+            self.root.after(0, lambda: self.status_label.config(text=f"Status: {message}"))
+        
+        def on_done(models, cached):
+            source = "cached" if cached else "loaded"
+            self.record_startup('models_ready')
+            self.root.after(0, lambda: self.status_label.config(
+                text=f"Status: Models {source} (Size: {models.size.upper()}, Device: {models.device})"))
+        
+        def on_error(error):
+            def report():
+                messagebox.showerror("Error", f"Failed to load models: {str(error)}")
+                self.status_label.config(text="Status: Model loading failed")
+            self.root.after(0, report)
+        
+        warmup_size = self.config['image_size'] if self.config['warmup'] else None
+        self.model_manager.load_async(model_size, backend, warmup_size=warmup_size,
+                                      on_progress=on_progress, on_done=on_done, on_error=on_error)
+        
+        if self.config['cascade']:
+            def on_escalation_done(tier, cached):
+                print(f"Cascade escalation OCR ready (Size: {tier.size.upper()}, Device: {tier.device})")
             
-            self.plate_detector = YOLO(detection_path)
-            self.char_recognizer = YOLO(ocr_path)
-            
-            # Use GPU if available
-            device = 'cuda' if torch.cuda.is_available() else 'cpu'
-            self.plate_detector.to(device)
-            self.char_recognizer.to(device)
-            
-            self.status_label.config(text=f"Status: Models loaded (Size: {model_size.upper()}, Device: {device})")
-            return True
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load models: {str(e)}")
-            self.status_label.config(text="Status: Model loading failed")
-            return False
+            self.model_manager.load_escalation_async(self.config['cascade_size'], backend,
+                                                     warmup_size=warmup_size,
+                                                     on_done=on_escalation_done, on_error=on_error)
+        else:
+            self.model_manager.clear_escalation()
+    
+    def record_startup(self, stage):
+        """Record the first time a startup stage is reached and report it"""
+        if stage in self.startup_times:
+            return
+        elapsed = time.perf_counter() - _START_TIME
+        self.startup_times[stage] = elapsed
+        message = f"⏱ Startup: {stage} after {elapsed:.2f}s"
+        if stage == 'first_frame' and self.capture_start_time is not None:
+            message += f" ({time.perf_counter() - self.capture_start_time:.2f}s after capture start)"
+        print(message)
     
     def on_model_change(self, event=None):
         """Handle model size change"""
         self.config['model_size'] = self.model_size_var.get()
         self.load_models()
     
+    def on_cascade_change(self, event=None):
+        """Switch cascade mode or its escalation model"""
+        self.config['cascade'] = self.cascade_var.get()
+        self.config['cascade_size'] = self.cascade_size_var.get()
+        self.cascade_stats = CascadeStats()
+        self.load_models()
+    
     def update_confidence_label(self, value):
         """Update confidence label"""
         self.confidence_label.config(text=f"{float(value):.2f}")
@@ -508,19 +801,110 @@ class LicensePlateGUI:
         self.config['confidence_threshold'] = self.confidence_var.get()
         self.config['image_size'] = self.image_size_var.get()
         self.config['stability_threshold'] = self.stability_var.get()
+        self.config['tiled_detection'] = self.tiled_var.get()
+        self.config['cascade_min_confidence'] = self.cascade_confidence_var.get()
+        
+        # Cached reads were made with the old thresholds
+        if self.ocr_cache:
+            self.ocr_cache.clear()
         
         messagebox.showinfo("Settings", "Settings applied successfully!")
     
+    def apply_thread_settings(self):
+        """Apply CPU threading settings from the panel"""
+        for key, var in self.thread_vars.items():
+            self.thread_settings[key] = var.get()
+        self.thread_settings['cpu_affinity'] = self.affinity_var.get().strip()
+        try:
+            applied = apply_process_settings(self.thread_settings)
+            if self.model_manager.setup_done:
+                applied.update(apply_torch_settings(self.thread_settings))
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Error", f"Invalid thread settings: {str(e)}")
+            return
+        self.threads_status_label.config(text=f"Applied: {applied}" if applied else "Using library defaults")
+    
+    def on_shared_memory_change(self):
+        """Use shared-memory worker processes from the next capture
+        
+        In-process inference runs on one thread, so the process count only applies in this mode.
+        """
+        self.config['shared_memory_inference'] = self.shared_memory_var.get()
+        state = 'normal' if self.config['shared_memory_inference'] else 'disabled'
+        self.thread_spinboxes['inference_workers'].config(state=state)
+    
+    def run_autotune(self):
+        """Sweep thread settings on the benchmark corpus in the background"""
+        corpus_dir = os.path.join(self.base_dir, 'sample-images')
+        self.autotune_btn.config(state='disabled')
+        
+        def progress(message):
+            self.root.after(0, lambda: self.threads_status_label.config(text=message))
+        
+        def worker():
+            try:
+                best, _ = autotune(self.base_dir, corpus_dir, model_size=self.config['model_size'],
+                                   image_size=self.config['image_size'], progress=progress)
+            except Exception as e:
+                error = str(e)
+                self.root.after(0, lambda: messagebox.showerror("Error", f"Auto-tune failed: {error}"))
+                self.root.after(0, lambda: self.autotune_btn.config(state='normal'))
+                return
+            
+            def finish():
+                for key, var in self.thread_vars.items():
+                    var.set(best[key])
+                self.affinity_var.set(best['cpu_affinity'])
+                self.autotune_btn.config(state='normal')
+                self.apply_thread_settings()
+            self.root.after(0, finish)
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def apply_ocr_cache_settings(self):
+        """Enable/disable the OCR cache or change its tolerance"""
+        try:
+            tolerance = max(0, self.ocr_cache_tolerance_var.get())
+            verify_every = max(0, self.ocr_cache_verify_var.get())
+        except tk.TclError:
+            # Not a number: put the values in use back
+            self.ocr_cache_tolerance_var.set(self.config['ocr_cache_tolerance'])
+            self.ocr_cache_verify_var.set(self.config['ocr_cache_verify_every'])
+            return
+        self.config['ocr_cache_tolerance'] = tolerance
+        self.config['ocr_cache_verify_every'] = verify_every
+        if not self.ocr_cache_var.get():
+            self.ocr_cache = None
+            self.ocr_cache_status_label.config(text="Cache: Off")
+            return
+        if self.ocr_cache is None:
+            self.ocr_cache = OCRCache(capacity=self.config['ocr_cache_size'])
+            self.update_ocr_cache_status()
+        self.ocr_cache.max_distance = self.config['ocr_cache_tolerance']
+        self.ocr_cache.verify_every = self.config['ocr_cache_verify_every']
+    
+    def update_ocr_cache_status(self):
+        """Refresh cache counters once a second while enabled"""
+        if not self.ocr_cache:
+            return
+        stats = self.ocr_cache.stats()
+        text = (f"Cache: {stats['hit_rate']:.0%} hits ({stats['hits']}/{stats['hits'] + stats['misses']}), "
+                f"{stats['size']} entries, {stats['evictions']} evicted")
+        if stats['verified']:
+            text += f", {stats['mismatches']}/{stats['verified']} verify mismatches"
+        self.ocr_cache_status_label.config(text=text)
+        self.root.after(1000, self.update_ocr_cache_status)
+    
     def start_camera(self):
         """Start camera capture"""
         if not self.is_running:
             self.cap = cv2.VideoCapture(0)
             if self.cap.isOpened():
-                self.is_running = True
+                self.capture_start_time = time.perf_counter()
+                self.set_source('camera:0', fps=0.0)
                 self.start_btn.config(state='disabled')
-                self.detection_thread = threading.Thread(target=self.process_video)
-                self.detection_thread.daemon = True
-                self.detection_thread.start()
+                self.scan_btn.config(state='disabled')
+                self.process_video(self.cap, 'camera', live=True)
                 self.status_label.config(text="Status: Camera running")
             else:
                 messagebox.showerror("Error", "Could not open camera")
@@ -535,151 +919,485 @@ class LicensePlateGUI:
             if file_path:
                 self.cap = cv2.VideoCapture(file_path)
                 if self.cap.isOpened():
-                    self.is_running = True
+                    self.capture_start_time = time.perf_counter()
+                    self.set_source(file_path, self.cap.get(cv2.CAP_PROP_FPS))
                     self.start_btn.config(state='disabled')
                     self.load_video_btn.config(state='disabled')
-                    self.detection_thread = threading.Thread(target=self.process_video)
-                    self.detection_thread.daemon = True
-                    self.detection_thread.start()
+                    self.scan_btn.config(state='disabled')
+                    self.process_video(self.cap, os.path.basename(file_path), live=False)
                     self.status_label.config(text=f"Status: Processing video - {os.path.basename(file_path)}")
                 else:
                     messagebox.showerror("Error", "Could not open video file")
     
+    def scan_archive(self):
+        """Two-pass scan of a long recording: sparse nano detection, then full processing around hits"""
+        if self.is_running:
+            return
+        file_path = filedialog.askopenfilename(
+            title="Select Recording to Scan",
+            filetypes=[("Video files", "*.mp4 *.avi *.mov *.mkv"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        cap = cv2.VideoCapture(file_path)
+        if not cap.isOpened() or int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) <= 0:
+            cap.release()
+            messagebox.showerror("Error", "Archive scan needs a seekable video file")
+            return
+        self.cap = cap
+        self.is_running = True
+        self.capture_start_time = time.perf_counter()
+        self.set_source(file_path, cap.get(cv2.CAP_PROP_FPS))
+        for button in (self.start_btn, self.load_video_btn, self.scan_btn):
+            button.config(state='disabled')
+        self.status_label.config(text="Status: Scan pass 1 - loading nano detector...")
+        threading.Thread(target=self.run_archive_scan, args=(cap, os.path.basename(file_path)),
+                         daemon=True).start()
+    
+    def run_archive_scan(self, cap, name):
+        """Pass 1 on this thread; pass 2 runs on the normal runtime over the windows around hits"""
+        fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        
+        def progress(p):
+            text = (f"Status: Scan pass 1 - {p.done}/{p.total} samples, {p.hits} with plates, "
+                    f"ETA {format_duration(p.eta)}")
+            self.root.after(0, lambda: self.is_running and self.status_label.config(text=text))
+        
+        try:
+            detector = self.model_manager.get_detector('n', self.config['model_backend'])
+            positions = sample_positions(frame_count, fps, self.config['scan_sample_fps'])
+            hits = sparse_scan(cap, detector, positions, self.config['confidence_threshold'],
+                               self.config['image_size'], progress=progress,
+                               should_stop=lambda: not self.is_running)
+        except Exception as e:
+            cap.release()
+            error = str(e)
+            self.root.after(0, lambda: messagebox.showerror("Error", f"Archive scan failed: {error}"))
+            self.root.after(0, self.stop_capture)
+            return
+        windows = hit_windows(hits, fps, frame_count, self.config['scan_before_seconds'],
+                              self.config['scan_after_seconds'])
+        
+        def begin():
+            if not self.is_running:  # stopped during pass 1
+                cap.release()
+                return
+            if not windows:
+                cap.release()
+                self.stop_capture()
+                self.status_label.config(text=f"Status: Scan finished - no plates in {name}")
+                return
+            self.archive_source = WindowedCaptureSource(name, cap, windows,
+                                                        frame_skip=lambda: self.config['frame_skip'])
+            self.detection_history.clear()
+            self.process_video(cap, name, live=False, source=self.archive_source)
+            self.status_label.config(text=f"Status: Scan pass 2 - {len(windows)} windows, "
+                                          f"{window_frames(windows)} of {frame_count} frames")
+        self.root.after(0, begin)
+    
+    def set_source(self, path, fps):
+        """Source recorded with every read in the plate index"""
+        self.source_path = os.path.abspath(path) if os.path.exists(path) else path
+        self.source_fps = fps or 0.0
+    
     def stop_capture(self):
-        """Stop video capture"""
+        """Stop video capture (the runtime releases the capture when its source task ends)"""
         self.is_running = False
-        if self.cap:
-            self.cap.release()
+        if self.runtime:
+            self.runtime.stop()
+        # A finishing shared-memory run must not stop whatever is started next
+        self.shared_inference = None
+        self.archive_source = None
         self.start_btn.config(state='normal')
         self.load_video_btn.config(state='normal')
+        self.scan_btn.config(state='normal')
         self.status_label.config(text="Status: Stopped")
         self.video_canvas.delete("all")
     
-    def process_video(self):
-        """Main video processing loop"""
-        frame_count = 0
-        last_time = time.time()
+    def process_video(self, cap, source_name, live, source=None):
+        """Run capture -> detection -> display/export/alerts on the asyncio runtime"""
+        if source is None:
+            source = CaptureSource(source_name, cap, frame_skip=lambda: self.config['frame_skip'], live=live)
+        if self.config['shared_memory_inference']:
+            # Worker processes load their own models first; capture starts once they are ready
+            self.is_running = True
+            threading.Thread(target=self.start_shared_inference, args=(source,), daemon=True).start()
+            return
+        self.start_runtime(source, self.process_frame)
+    
+    def start_runtime(self, source, process):
+        # Detection state (history, stability) is sequential, so the GUI uses one inference worker
+        runtime = AsyncRuntime(process, max_workers=1)
+        runtime.add_source(source)
+        runtime.add_result_callback(self.record_frame)
+        runtime.add_result_callback(self.queue_display)
+        runtime.add_sink('export', self.export_sink)
+        runtime.add_sink('alerts', self.alert_sink, blocking=False)
+        runtime.add_sink('index', self.index_sink)
+        runtime.add_sink('recorder', self.recorder_sink, blocking=False)
+        runtime.on_finished = lambda: self.root.after(0, self.on_runtime_finished, runtime)
+        
+        self.runtime = runtime
+        self.is_running = True
+        runtime.start()
+        self.update_runtime_stats()
+        return runtime
+    
+    def start_shared_inference(self, source):
+        """Start inference processes behind a shared-memory frame ring sized for this source"""
+        cap = source.cap
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 1920
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 1080
+        self.root.after(0, lambda: self.status_label.config(text="Status: Starting inference processes..."))
+        transport = SharedMemoryInference(self.base_dir, model_size=self.config['model_size'],
+                                          backend=self.config['model_backend'],
+                                          image_size=self.config['image_size'],
+                                          conf=self.config['confidence_threshold'],
+                                          min_detection_length=self.config['min_detection_length'],
+                                          tiled=self.config['tiled_detection'],
+                                          tile_overlap=self.config['tile_overlap'],
+                                          thread_settings=self.thread_settings,
+                                          workers=self.thread_settings['inference_workers'] or 1,
+                                          max_shape=(height, width, 3))
+        try:
+            transport.start()
+        except Exception as e:
+            transport.stop()
+            cap.release()
+            error = str(e)
+            self.root.after(0, lambda: messagebox.showerror("Error", f"Inference processes failed: {error}"))
+            self.root.after(0, self.stop_capture)
+            return
+        
+        def begin():
+            if not self.is_running:  # stopped while the workers were loading
+                transport.stop()
+                cap.release()
+                return
+            self.shared_inference = transport
+            runtime = self.start_runtime(source, lambda item: self.submit_shared(transport, item, source.live))
+            threading.Thread(target=self.shared_result_loop, args=(transport, runtime), daemon=True).start()
+            self.status_label.config(text=f"Status: Processing {source.name} in {transport.workers} "
+                                          f"inference process(es)")
+        self.root.after(0, begin)
+    
+    def submit_shared(self, transport, item, live):
+        """Runtime process step in shared-memory mode: copy the frame into the ring and move on
         
-        while self.is_running and self.cap and self.cap.isOpened():
-            ret, frame = self.cap.read()
-            if not ret:
+        File sources wait for a free slot; live sources drop the frame instead.
+        """
+        transport.submit(item.source, item.frame_number, item.frame, item.timestamp, block=not live)
+        return None
+    
+    def shared_result_loop(self, transport, runtime):
+        """Hand reads from the inference processes to the detection logic, in frame order"""
+        while True:
+            try:
+                result = transport.get_result(timeout=0.2)
+            except RuntimeError as e:  # an inference process died; its frames will never arrive
+                error = str(e)
+                self.root.after(0, lambda: messagebox.showerror("Error", error))
                 break
-            
-            frame_count += 1
-            
-            # Skip frames based on configuration
-            if frame_count % self.config['frame_skip'] != 0:
+            if result is None:
+                if not self.is_running or (runtime.finished.is_set() and not transport.pending()):
+                    break
                 continue
+            # Copy out of the slot so it can be reused at once (current_frame outlives this result)
+            frame = transport.frame(result)
+            frame = frame.copy() if frame is not None else None
+            transport.release(result)
+            if result.error or frame is None:
+                print(f"Inference error: {result.error}")
+                continue
+            self.current_frame = frame
+            self.frame_position = self.media_position(result.frame_number)
+            annotated = frame.copy()
+            plate_boxes = [box for box, _ in result.reads]
+            plate_crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in plate_boxes]
+            try:
+                self.handle_reads(annotated, plate_boxes, plate_crops, [read for _, read in result.reads])
+            except Exception as e:
+                print(f"Detection error: {e}")
+            self.record_frame(annotated)
+            self.queue_display(annotated)
+        transport.stop()
+        self.root.after(0, self.on_shared_finished, transport)
+    
+    def on_shared_finished(self, transport):
+        """Every submitted frame has been handled (or capture was stopped)"""
+        if transport is self.shared_inference:
+            self.shared_inference = None
+            if self.is_running:
+                self.stop_capture()
+    
+    def process_frame(self, item):
+        """Inference step for one frame (runs in the runtime's inference executor)"""
+        # Process frame for license plate detection (keep the clean frame for evidence)
+        self.current_frame = item.frame
+        self.frame_position = self.media_position(item.frame_number)
+        return self.detect_license_plate(item.frame.copy())
+    
+    def media_position(self, frame_number):
+        """(frame number, seconds into the video) of a frame; seconds is None for live sources"""
+        if self.source_fps > 0:
+            return frame_number, (frame_number - 1) / self.source_fps
+        return frame_number, None
+    
+    def queue_display(self, frame):
+        """Hand the newest processed frame to the Tk thread, coalescing if it is behind"""
+        if frame is None:  # shared-memory mode: frames come back through shared_result_loop
+            return
+        already_pending = self.pending_display is not None
+        self.pending_display = frame
+        if not already_pending:
+            self.root.after(0, self.show_pending_frame)
+    
+    def show_pending_frame(self):
+        frame, self.pending_display = self.pending_display, None
+        if frame is not None and self.is_running:
+            self.display_frame(frame)
+    
+    def on_runtime_finished(self, runtime):
+        """Runtime ended (video finished or stopped)"""
+        if runtime is self.runtime:
+            self.runtime = None
+            # In shared-memory mode the result loop stops capture once the last frame is handled
+            if self.is_running and self.shared_inference is None:
+                self.stop_capture()
+    
+    def update_runtime_stats(self):
+        """Show FPS and per-task latency once a second while running"""
+        runtime = self.runtime
+        if not runtime or not self.is_running:
+            return
+        stats = runtime.stats()
+        self.fps_label.config(text=f"FPS: {stats['fps']:.1f}")
+        parts = [f"{name} {task['mean_ms']:.1f}ms" for name, task in stats['tasks'].items() if task['count']]
+        if stats['dropped_frames']:
+            parts.append(f"dropped {stats['dropped_frames']}")
+        if self.archive_source:
+            scan = self.archive_source.progress()
+            parts.append(f"scan {scan.done}/{scan.total} frames, ETA {format_duration(scan.eta)}")
+        if self.shared_inference:
+            shared = self.shared_inference.stats()
+            parts.append(f"{shared['workers']} proc, {shared['in_flight']}/{shared['slots']} slots busy, "
+                         f"dropped {shared['dropped']}")
+        if self.config['cascade']:
+            cascade = self.cascade_stats.snapshot()
+            calls = " ".join(f"{tier}:{count}" for tier, count in cascade['calls'].items())
+            parts.append(f"OCR calls {calls} ({cascade['escalation_rate']:.0%} escalated)")
+        self.runtime_stats_label.config(text=" | ".join(parts))
+        self.root.after(1000, self.update_runtime_stats)
+    
+    def export_sink(self, detection):
+        """Runtime sink: pass saved detections to the streaming exporter"""
+        if self.exporter:
+            self.exporter.submit(detection.to_dict())
+    
+    def record_frame(self, frame):
+        """Result callback: hand the annotated frame to the recorder (never blocks)"""
+        recorder = self.recorder
+        if recorder and frame is not None:
+            recorder.submit(frame)
+    
+    def recorder_sink(self, detection):
+        """Runtime sink: start or extend a clip around each saved detection"""
+        recorder = self.recorder
+        if recorder:
+            recorder.mark(detection.plate, detection.timestamp)
+    
+    def index_sink(self, detection):
+        """Runtime sink: add saved detections to the persistent plate index"""
+        if self.plate_index and detection.source is not None:
+            self.plate_index.add(detection.plate, detection.source, detection.frame_number,
+                                 detection.media_time, detection.timestamp, detection.confidence)
+    
+    def search_index(self):
+        """Query the plate index and list the matches"""
+        if not self.plate_index:
+            self.index_status_label.config(text="Plate index unavailable")
+            return
+        start = time.perf_counter()
+        try:
+            self.index_hits = self.plate_index.search(self.index_query_var.get(), self.index_mode_var.get())
+        except Exception as e:
+            self.index_status_label.config(text=f"Search failed: {e}")
+            return
+        elapsed_ms = 1000 * (time.perf_counter() - start)
+        self.index_tree.delete(*self.index_tree.get_children())
+        for i, hit in enumerate(self.index_hits):
+            at = format_duration(hit.media_time) if hit.media_time is not None else f"#{hit.frame_number}"
+            self.index_tree.insert('', tk.END, iid=str(i), values=(hit.plate, os.path.basename(hit.source), at))
+        self.index_status_label.config(text=f"{len(self.index_hits)} matches in {elapsed_ms:.1f} ms")
+    
+    def jump_to_hit(self, event=None):
+        """Play the selected match's video from the frame the plate was read in"""
+        selection = self.index_tree.selection()
+        if not selection:
+            return
+        hit = self.index_hits[int(selection[0])]
+        if not os.path.isfile(hit.source):
+            messagebox.showerror("Error", f"Source video not found: {hit.source}")
+            return
+        if self.is_running:
+            self.stop_capture()
+        cap = cv2.VideoCapture(hit.source)
+        if not cap.isOpened():
+            messagebox.showerror("Error", f"Could not open {hit.source}")
+            return
+        # CaptureSource numbers frames from 1, so frame N is at position N - 1
+        start = max(0, (hit.frame_number or 1) - 1)
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        self.cap = cap
+        self.capture_start_time = time.perf_counter()
+        self.set_source(hit.source, cap.get(cv2.CAP_PROP_FPS))
+        name = os.path.basename(hit.source)
+        source = CaptureSource(name, cap, frame_skip=lambda: self.config['frame_skip'], live=False)
+        source.frame_number = start
+        for button in (self.start_btn, self.load_video_btn, self.scan_btn):
+            button.config(state='disabled')
+        self.process_video(cap, name, live=False, source=source)
+        self.status_label.config(text=f"Status: Playing {name} from frame {start + 1}")
+    
+    def on_watchlist_change(self, *args):
+        """Comma-separated plates that raise an alert when saved"""
+        self.config['alert_watchlist'] = self.watchlist_var.get()
+    
+    def alert_sink(self, detection):
+        """Runtime sink: notify when a saved plate is on the watchlist"""
+        watchlist = {w.strip().replace(' ', '').lower() for w in self.config['alert_watchlist'].split(',') if w.strip()}
+        plate = detection.plate
+        if plate.replace(' ', '').lower() in watchlist:
+            timestamp = detection.time_text()
+            print(f"🚨 Watchlist plate detected: {plate} at {timestamp}")
             
-            # Calculate FPS
-            current_time = time.time()
-            if current_time - last_time >= 1.0:
-                fps = frame_count / (current_time - last_time)
-                self.fps_label.config(text=f"FPS: {fps:.1f}")
-                frame_count = 0
-                last_time = current_time
-            
-            # Process frame for license plate detection
-            processed_frame = self.detect_license_plate(frame.copy())
-            
-            # Display frame
-            self.display_frame(processed_frame)
-            
-            # Small delay to prevent overwhelming the system
-            time.sleep(0.01)
-        
-        self.stop_capture()
+            def notify():
+                self.alert_label.config(text=f"🚨 {plate} at {timestamp}")
+                self.root.bell()
+            self.root.after(0, notify)
     
     def detect_license_plate(self, frame):
         """Detect and recognize license plates in frame"""
-        if not self.plate_detector or not self.char_recognizer:
+        # Take one snapshot of the active pair so a model swap only applies from the next frame
+        models = self.model_manager.active
+        if models is None:
             return frame
+        plate_detector, char_recognizer = models.detector, models.recognizer
+        escalation = self.model_manager.escalation if self.config['cascade'] else None
+        recognizers = (char_recognizer, escalation.recognizer if escalation else None)
+        
+        ocr_cache = self.ocr_cache
+        if ocr_cache and self.ocr_cache_recognizer != recognizers:
+            # Reads from another model are not valid for this one
+            ocr_cache.clear()
+            self.ocr_cache_recognizer = recognizers
         
         try:
-            # Detect license plates
-            plate_results = self.plate_detector(
-                frame, 
-                conf=self.config['confidence_threshold'],
-                imgsz=self.config['image_size'],
-                verbose=False
-            )
-            
-            current_detections = []
+            # Detect license plates (whole frame, or overlapping tiles merged with cross-tile NMS)
+            if self.config['tiled_detection']:
+                boxes = detect_tiled(plate_detector, frame,
+                                     self.config['confidence_threshold'],
+                                     tile_size=self.config['image_size'],
+                                     overlap=self.config['tile_overlap'])
+            else:
+                boxes = detect_plate_boxes(plate_detector, [frame],
+                                           self.config['confidence_threshold'],
+                                           self.config['image_size'])[0]
             
-            for plate in plate_results:
-                if not hasattr(plate.boxes, 'xyxy') or len(plate.boxes.xyxy) == 0:
+            plate_boxes, plate_crops = [], []
+            for x1, y1, x2, y2 in boxes:
+                plate_img = frame[y1:y2, x1:x2]
+                if plate_img.size == 0:
                     continue
-                    
-                boxes = plate.boxes.xyxy
-                
-                for box in boxes:
-                    x1, y1, x2, y2 = map(int, box)
-                    plate_img = frame[y1:y2, x1:x2]
-                    
-                    if plate_img.size == 0:
-                        continue
-                    
-                    # Recognize characters in the plate
-                    char_results = self.char_recognizer(
-                        plate_img,
-                        conf=self.config['confidence_threshold'],
-                        imgsz=self.config['image_size'],
-                        verbose=False
-                    )
-                    
-                    detected_chars = []
-                    for char in char_results:
-                        if not hasattr(char.boxes, 'xyxy') or len(char.boxes.xyxy) == 0:
-                            continue
-                            
-                        for cbox in char.boxes:
-                            cx1, cy1, cx2, cy2 = cbox.xyxy[0]
-                            class_id = int(cbox.cls)
-                            center_x = (cx1 + cx2) / 2
-                            detected_chars.append((center_x, class_id))
-                    
-                    if len(detected_chars) >= self.config['min_detection_length']:
-                        # Separate and sort characters
-                        label1, label2 = [], []
-                        for center_x, class_id in detected_chars:
-                            if class_id in range(0, 10):  # Numbers
-                                label2.append((center_x, class_id))
-                            else:  # Letters
-                                label1.append((center_x, class_id))
-                        
-                        label1.sort(key=lambda x: x[0])
-                        label2.sort(key=lambda x: x[0])
-                        
-                        # Convert to text
-                        plate_text = "".join([self.char_map.get(c[1], '?') for c in label1]) + " " + \
-                                   "".join([self.char_map.get(c[1], '?') for c in label2])
-                        
-                        plate_text = plate_text.strip()
-                        if plate_text and plate_text != " ":
-                            current_detections.append(plate_text)
-                            
-                            # Draw bounding box and text
-                            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                            cv2.putText(frame, plate_text, (x1, y1 - 10), 
-                                      cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+                plate_boxes.append((x1, y1, x2, y2))
+                plate_crops.append(plate_img)
             
-            # Update current detection display
-            if current_detections:
-                self.update_detection_display(current_detections[0])
-                self.detection_confidence_label.config(text="Active Detection")
-                
-                # Add to detection history for stability analysis
-                self.detection_history.append(current_detections[0])
-                self.check_stable_detection()
+            # Recognize characters in all plates of this frame with one OCR call
+            # (cascade: plus one escalation call for the uncertain reads)
+            if escalation:
+                history = list(self.detection_history)[-self.config['stability_threshold']:]
+                reads = recognize_cascade(char_recognizer, escalation.recognizer, plate_crops,
+                                          self.config['confidence_threshold'],
+                                          self.config['image_size'],
+                                          self.config['min_detection_length'],
+                                          self.char_map,
+                                          min_confidence=self.config['cascade_min_confidence'],
+                                          validate=self.validate_license_plate,
+                                          history=history,
+                                          cache=ocr_cache,
+                                          stats=self.cascade_stats,
+                                          tiers=(models.size, escalation.size))
             else:
-                self.update_detection_display("No detection")
-                self.detection_confidence_label.config(text="--")
-                
+                reads = recognize_crops(char_recognizer, plate_crops,
+                                        self.config['confidence_threshold'],
+                                        self.config['image_size'],
+                                        self.config['min_detection_length'],
+                                        self.char_map,
+                                        cache=ocr_cache)
+            
+            self.handle_reads(frame, plate_boxes, plate_crops, reads)
         except Exception as e:
             print(f"Detection error: {e}")
         
         return frame
     
+    def handle_reads(self, frame, plate_boxes, plate_crops, reads):
+        """Detection bookkeeping for one frame's reads: evidence, mining, drawing, history and stability"""
+        current_detections = []
+        current_confidences = []
+        for box, plate_img, (plate_text, confidence, chars) in zip(plate_boxes, plate_crops, reads):
+            if not plate_text:
+                continue
+            current_detections.append(plate_text)
+            current_confidences.append(confidence)
+            
+            if len(current_detections) == 1:
+                # Raw read for the saved record; class ids are ordered only if it gets saved
+                self.last_read = (chars, confidence, box, self.frame_position)
+                # Keep a clean copy of the first crop for evidence snapshots
+                if self.evidence_writer:
+                    self.last_plate_crop = plate_img.copy()
+        
+        # Sample hard crops for training before drawing on the frame
+        if self.hard_example_miner:
+            self.mine_hard_examples(plate_crops, reads)
+        
+        # Draw after OCR so the crops stay clean
+        for (x1, y1, x2, y2), (plate_text, _, _) in zip(plate_boxes, reads):
+            if plate_text:
+                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+                cv2.putText(frame, plate_text, (x1, y1 - 10), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+        
+        # Update current detection display
+        if current_detections:
+            self.update_detection_display(current_detections[0])
+            self.detection_confidence_label.config(text=f"Confidence: {current_confidences[0]:.2f}")
+            
+            # Add to detection history for stability analysis
+            self.detection_history.append(current_detections[0])
+            self.check_stable_detection()
+        else:
+            self.update_detection_display("No detection")
+            self.detection_confidence_label.config(text="--")
+    
+    def mine_hard_examples(self, plate_crops, reads):
+        """Offer crops whose reads were too short, failed the filter, or keep the window from stabilizing"""
+        threshold = self.config['stability_threshold']
+        history = list(self.detection_history)
+        for plate_img, (plate_text, confidence, chars) in zip(plate_crops, reads):
+            if not plate_text:
+                reason = 'short' if chars else None
+            elif not self.validate_license_plate(plate_text):
+                reason = 'invalid'
+            else:
+                recent = (history + [plate_text])[-threshold:]
+                unstable = len(recent) == threshold and Counter(recent).most_common(1)[0][1] < threshold
+                reason = 'unstable' if unstable else None
+            if reason:
+                self.hard_example_miner.submit(plate_img, chars, reason, plate_text, confidence)
+    
     def check_stable_detection(self):
         """Check for stable detections and save them"""
         if len(self.detection_history) < self.config['stability_threshold']:
@@ -696,7 +1414,7 @@ class LicensePlateGUI:
             stable_plate = most_common[0][0]
             
             # Check if this plate is already in our saved list (avoid duplicates)
-            if stable_plate not in [item['plate'] for item in self.saved_plates]:
+            if not self.detection_store.has_plate(stable_plate):
                 self.save_detection(stable_plate)
     
     def save_detection(self, plate_text):
@@ -711,24 +1429,46 @@ class LicensePlateGUI:
         # ===================================================================
         
         # Check if this plate is already in our saved list
-        if plate_text in [item['plate'] for item in self.saved_plates]:
+        if self.detection_store.has_plate(plate_text):
             print(f"Plate already saved: {plate_text}")
             return False
         
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        detection = {
-            'plate': plate_text,
-            'timestamp': timestamp,
-            'confidence': 'Stable',
-            'filter_pattern': self.filter_settings['pattern_type'],  # NEW!
-            'filter_enabled': self.filter_settings['enabled']       # NEW!
-        }
-        
-        self.saved_plates.append(detection)
-        self.saved_listbox.insert(tk.END, f"{timestamp} - {plate_text}")
-        
-        # Auto-scroll to bottom
-        self.saved_listbox.see(tk.END)
+        # A stable plate is the latest read (the whole stability window agreed on it)
+        chars, confidence, box, (frame_number, media_time) = self.last_read
+        detection = DetectionRecord(
+            ordered_class_ids(chars, self.char_map),
+            time.time(),
+            confidence=confidence,
+            box=box,
+            filter_pattern=self.filter_settings['pattern_type'],
+            filter_enabled=self.filter_settings['enabled'],
+            source=self.source_path,
+            frame_number=frame_number,
+            media_time=media_time,
+            char_map=self.char_map,
+        )
+        if detection.plate != plate_text:
+            print(f"Skipping save, latest read does not match stable plate: {plate_text}")
+            return False
+        timestamp = detection.time_text()
+        
+        # Encoding happens on the evidence writer's pool; only the target paths come back
+        if self.evidence_writer:
+            crop_path, context_path = self.evidence_writer.submit(
+                plate_text, self.last_plate_crop, self.current_frame,
+                datetime.fromtimestamp(detection.timestamp))
+            detection.evidence_crop = crop_path
+            detection.evidence_context = context_path
+        
+        # The list view picks this up on its next refresh tick
+        self.detection_store.add(detection)
+        
+        # Hand off to the runtime's export/alert sinks (never blocks this thread)
+        if not (self.runtime and self.runtime.publish(detection)):
+            self.export_sink(detection)
+            self.alert_sink(detection)
+            self.index_sink(detection)
+            self.recorder_sink(detection)
         
         print(f"✅ Saved stable detection: {plate_text} at {timestamp}")
         return True
@@ -774,25 +1514,24 @@ class LicensePlateGUI:
             
             # Keep a reference to prevent garbage collection
             self.video_canvas.image = photo
+            
+            if 'first_frame' not in self.startup_times:
+                self.record_startup('first_frame')
     
     def clear_saved(self):
         """Clear all saved detections"""
         if messagebox.askyesno("Confirm", "Clear all saved detections?"):
-            self.saved_plates.clear()
-            self.saved_listbox.delete(0, tk.END)
+            self.detection_store.clear()
     
     def delete_selected(self):
-        """Delete selected detection"""
-        selection = self.saved_listbox.curselection()
+        """Delete selected detections"""
+        selection = self.saved_view.selected_ids()
         if selection:
-            index = selection[0]
-            self.saved_listbox.delete(index)
-            if index < len(self.saved_plates):
-                del self.saved_plates[index]
+            self.detection_store.remove(selection)
     
     def export_saved(self):
         """Export saved detections to JSON file"""
-        if not self.saved_plates:
+        if not len(self.detection_store):
             messagebox.showwarning("Warning", "No detections to export")
             return
         
@@ -803,31 +1542,204 @@ class LicensePlateGUI:
         )
         
         if file_path:
-            try:
-                export_data = {
-                    'export_timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'filter_settings': self.filter_settings,
-                    'detections': self.saved_plates
-                }
-                with open(file_path, 'w') as f:
-                    json.dump(export_data, f, indent=2)
-                messagebox.showinfo("Success", f"Detections exported to {file_path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to export: {str(e)}")
+            # Snapshot now, write in the background so the UI stays responsive
+            export_data = {
+                'export_timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'filter_settings': dict(self.filter_settings),
+                'detections': self.detection_store.all_records()
+            }
+            
+            def write_export():
+                try:
+                    export_data['detections'] = [d.to_dict() for d in export_data['detections']]
+                    with open(file_path, 'w') as f:
+                        json.dump(export_data, f, indent=2)
+                    self.root.after(0, lambda: messagebox.showinfo("Success", f"Detections exported to {file_path}"))
+                except Exception as e:
+                    error = str(e)
+                    self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to export: {error}"))
+            
+            threading.Thread(target=write_export, daemon=True).start()
+    
+    def choose_export_dir(self):
+        """Pick the folder used for streaming export"""
+        directory = filedialog.askdirectory(title="Select Export Folder",
+                                            initialdir=self.config['export_dir'])
+        if directory:
+            self.config['export_dir'] = directory
+            if self.exporter:
+                # Restart so new files go to the new folder
+                self.stop_streaming_export()
+                self.start_streaming_export()
+    
+    def toggle_streaming_export(self):
+        """Turn streaming export on/off"""
+        if self.stream_export_var.get():
+            self.start_streaming_export()
+        else:
+            self.stop_streaming_export()
+    
+    def start_streaming_export(self):
+        """Start the background exporter with the selected format"""
+        self.config['export_format'] = self.export_format_var.get()
+        try:
+            self.exporter = StreamingExporter(
+                self.config['export_dir'],
+                fmt=self.config['export_format'],
+                max_bytes=int(self.config['export_max_mb'] * 1024 * 1024),
+                row_group_size=self.config['export_row_group_size'],
+            )
+        except ImportError as e:
+            self.stream_export_var.set(False)
+            messagebox.showerror("Error", str(e))
+            return
+        self.exporter.start()
+        self.export_status_label.config(
+            text=f"Export: {self.config['export_format'].upper()} -> {self.config['export_dir']}")
+        self.update_export_status()
+    
+    def stop_streaming_export(self):
+        """Flush and stop the background exporter"""
+        if self.exporter:
+            exporter = self.exporter
+            self.exporter = None
+            exporter.stop()
+        self.export_status_label.config(text="Export: Off")
+    
+    def update_export_status(self):
+        """Refresh exporter counters once a second while streaming"""
+        if not self.exporter:
+            return
+        stats = self.exporter.stats()
+        self.export_status_label.config(
+            text=f"Export: {self.config['export_format'].upper()} - written {stats['written']}, "
+                 f"dropped {stats['dropped']}, pending {stats['pending']}")
+        self.root.after(1000, self.update_export_status)
+    
+    def toggle_evidence(self):
+        """Turn evidence snapshots on/off"""
+        if self.evidence_var.get():
+            self.config['evidence_format'] = self.evidence_format_var.get()
+            self.config['evidence_max_mb'] = self.evidence_max_mb_var.get()
+            self.evidence_writer = EvidenceWriter(
+                self.config['evidence_dir'],
+                fmt=self.config['evidence_format'],
+                max_bytes=self.config['evidence_max_mb'] * 1024 * 1024,
+            )
+            self.update_evidence_status()
+        else:
+            self.stop_evidence()
+    
+    def stop_evidence(self):
+        """Finish pending snapshot writes and stop the writer"""
+        if self.evidence_writer:
+            writer = self.evidence_writer
+            self.evidence_writer = None
+            self.last_plate_crop = None
+            writer.close()
+        self.evidence_status_label.config(text="Evidence: Off")
+    
+    def toggle_mining(self):
+        """Turn hard-example mining on/off"""
+        if self.mining_var.get():
+            self.config['mining_rate_per_minute'] = self.mining_rate_var.get()
+            self.config['mining_max_items'] = self.mining_max_items_var.get()
+            self.hard_example_miner = HardExampleMiner(
+                self.config['mining_dir'],
+                max_items=self.config['mining_max_items'],
+                rate_per_minute=self.config['mining_rate_per_minute'],
+            )
+            self.update_mining_status()
+        else:
+            self.stop_mining()
+    
+    def stop_mining(self):
+        """Finish pending sample writes and stop the miner"""
+        if self.hard_example_miner:
+            miner = self.hard_example_miner
+            self.hard_example_miner = None
+            miner.close()
+        self.mining_status_label.config(text="Mining: Off")
+    
+    def update_mining_status(self):
+        """Refresh mining counters once a second while enabled"""
+        if not self.hard_example_miner:
+            return
+        stats = self.hard_example_miner.stats()
+        self.mining_status_label.config(
+            text=f"Mining: {stats['queued']} queued ({stats['saved']} this run), "
+                 f"{stats['duplicates']} duplicates, {stats['rate_limited']} rate-limited")
+        self.root.after(1000, self.update_mining_status)
+    
+    def toggle_recording(self):
+        """Turn the annotated video recorder on/off"""
+        if self.recording_var.get():
+            self.config['recording_mode'] = self.recording_mode_var.get()
+            # Files are written at the rate frames actually arrive, which the recorder measures
+            self.recorder = VideoRecorder(
+                self.config['recording_dir'],
+                mode=self.config['recording_mode'],
+                pre_roll=self.config['recording_pre_roll'],
+                post_roll=self.config['recording_post_roll'],
+            )
+            self.update_recording_status()
+        else:
+            self.stop_recording()
+    
+    def stop_recording(self):
+        """Encode queued frames, finish the current file and stop the recorder"""
+        if self.recorder:
+            recorder = self.recorder
+            self.recorder = None
+            recorder.close()
+        self.recording_status_label.config(text="Recorder: Off")
+    
+    def update_recording_status(self):
+        """Refresh recorder counters once a second while enabled"""
+        if not self.recorder:
+            return
+        stats = self.recorder.stats()
+        state = "recording" if stats['recording'] else "waiting for a detection"
+        self.recording_status_label.config(
+            text=f"Recorder ({stats['mode']}, {state}): {stats['written']} frames in {stats['files']} file(s), "
+                 f"encoder {stats['encode_fps']:.0f} FPS, {stats['skipped']} skipped, {stats['dropped']} dropped")
+        self.root.after(1000, self.update_recording_status)
+    
+    def update_evidence_status(self):
+        """Refresh evidence counters once a second while enabled"""
+        if not self.evidence_writer:
+            return
+        stats = self.evidence_writer.stats()
+        self.evidence_status_label.config(
+            text=f"Evidence: {stats['saved']} saved, {stats['disk_mb']:.1f}/{self.config['evidence_max_mb']} MB, "
+                 f"{stats['evicted']} evicted, {stats['dropped']} dropped")
+        self.root.after(1000, self.update_evidence_status)
     
-    def __del__(self):
-        """Cleanup when object is destroyed"""
-        if self.cap:
-            self.cap.release()
 
 
 def main():
     """Main function to run the application"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Bengali License Plate Recognition GUI")
+    add_thread_arguments(parser)
+    args = parser.parse_args()
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    
     root = tk.Tk()
-    app = LicensePlateGUI(root)
+    app = LicensePlateGUI(root, thread_settings=settings_from_args(args, base_dir))
     
     def on_closing():
+        runtime = app.runtime
         app.stop_capture()
+        if runtime:
+            runtime.stop(wait=True, timeout=2.0)
+        app.stop_streaming_export()
+        app.stop_evidence()
+        app.stop_mining()
+        app.stop_recording()
+        if app.plate_index:
+            app.plate_index.close()
         root.destroy()
     
     root.protocol("WM_DELETE_WINDOW", on_closing)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Load generator for the local recognition server
+Sends images from a folder (default: sample-images/) with N concurrent clients and reports
+client-side throughput/latency together with the server's batching metrics.
+
+Usage:
+    python load_test_server.py --url http://127.0.0.1:8080 --concurrency 16 --requests 500
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def load_payloads(path):
+    """Read encoded images (bytes) from a file or folder"""
+    if os.path.isdir(path):
+        files = [os.path.join(path, f) for f in sorted(os.listdir(path)) if f.lower().endswith(IMAGE_EXTS)]
+    else:
+        files = [path]
+    payloads = []
+    for file_path in files:
+        with open(file_path, 'rb') as f:
+            payloads.append(f.read())
+    if not payloads:
+        raise FileNotFoundError(f"No images found in {path}")
+    return payloads
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))]
+
+
+def run_load(url, payloads, concurrency=8, total_requests=200, mode='image', timeout=30.0):
+    """Fire total_requests requests from `concurrency` threads; returns a summary dict"""
+    endpoint = f"{url.rstrip('/')}/recognize?mode={mode}"
+    counter = [0]
+    lock = threading.Lock()
+    latencies = []
+    statuses = {}
+    plates = [0]
+
+    def client():
+        while True:
+            with lock:
+                index = counter[0]
+                if index >= total_requests:
+                    return
+                counter[0] += 1
+            request = urllib.request.Request(endpoint, data=payloads[index % len(payloads)],
+                                             headers={'Content-Type': 'application/octet-stream'})
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    body = json.loads(response.read())
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                body, status = {}, e.code
+            except (urllib.error.URLError, OSError):
+                body, status = {}, 'connection error'
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+                plates[0] += len(body.get('plates', []))
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    return {
+        'requests': total_requests,
+        'concurrency': concurrency,
+        'seconds': wall,
+        'requests_per_sec': total_requests / wall if wall > 0 else 0.0,
+        'p50_ms': 1000.0 * percentile(latencies, 50),
+        'p95_ms': 1000.0 * percentile(latencies, 95),
+        'p99_ms': 1000.0 * percentile(latencies, 99),
+        'statuses': statuses,
+        'plates': plates[0],
+    }
+
+
+def fetch_metrics(url, timeout=5.0):
+    with urllib.request.urlopen(f"{url.rstrip('/')}/metrics", timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def main():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Load test the recognition server")
+    parser.add_argument('--url', default='http://127.0.0.1:8080')
+    parser.add_argument('--images', default=os.path.join(base_dir, 'sample-images'))
+    parser.add_argument('--mode', default='image', choices=['image', 'crop'])
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.images)
+    print(f"Sending {args.requests} requests with {args.concurrency} concurrent clients to {args.url}...")
+    summary = run_load(args.url, payloads, args.concurrency, args.requests, args.mode)
+
+    print(f"  {summary['requests_per_sec']:.1f} req/s over {summary['seconds']:.2f}s, "
+          f"latency p50 {summary['p50_ms']:.1f} ms, p95 {summary['p95_ms']:.1f} ms, p99 {summary['p99_ms']:.1f} ms")
+    print(f"  Status codes: {summary['statuses']}, plates returned: {summary['plates']}")
+
+    try:
+        metrics = fetch_metrics(args.url)
+        print(f"  Server: mean batch {metrics['mean_batch_size']:.2f} over {metrics['batches']} batches, "
+              f"histogram {metrics['batch_size_histogram']}, queue wait p95 {metrics['queue_wait_ms']['p95']:.1f} ms")
+    except (urllib.error.URLError, OSError) as e:
+        print(f"  Could not fetch server metrics: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Model loading and caching for the license plate pipeline
+Loads detector/OCR pairs on a background thread, keeps recently used pairs in a small
+LRU cache and swaps the active pair atomically so running streams never see a half-loaded model.
+torch and ultralytics are imported on first use so the GUI can show its window immediately.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# Weight file/folder name per export backend inside model-{size}-{task}/
+MODEL_BACKENDS = {
+    'pt': 'best.pt',
+    'onnx': 'best.onnx',
+    'engine': 'best.engine',
+    'openvino': 'best_openvino_model',
+}
+
+ModelPair = namedtuple('ModelPair', ['detector', 'recognizer', 'size', 'backend', 'device'])
+
+
+def default_device():
+    """Use GPU if available"""
+    import torch
+    return 'cuda' if torch.cuda.is_available() else 'cpu'
+
+
+def model_paths(base_dir, model_size, backend='pt'):
+    """Return (detection_path, ocr_path) for a model size and backend"""
+    weights = MODEL_BACKENDS.get(backend)
+    if weights is None:
+        raise ValueError(f"Unknown model backend: {backend}")
+    detection_path = os.path.join(base_dir, f"model-{model_size}-detection", weights)
+    ocr_path = os.path.join(base_dir, f"model-{model_size}-ocr", weights)
+    return detection_path, ocr_path
+
+
+def load_model_pair(base_dir, model_size, backend='pt', device=None, progress=None):
+    """Load a detector/OCR pair synchronously"""
+    device = device or default_device()
+    detection_path, ocr_path = model_paths(base_dir, model_size, backend)
+
+    # Check if files exist
+    if not os.path.exists(detection_path):
+        raise FileNotFoundError(f"Detection model not found: {detection_path}")
+    if not os.path.exists(ocr_path):
+        raise FileNotFoundError(f"OCR model not found: {ocr_path}")
+
+    if progress:
+        progress("Importing inference libraries...")
+    from ultralytics import YOLO
+
+    if progress:
+        progress(f"Loading detector ({model_size.upper()})...")
+    detector = YOLO(detection_path, task='detect')
+    if progress:
+        progress(f"Loading OCR ({model_size.upper()})...")
+    recognizer = YOLO(ocr_path, task='detect')
+
+    # Exported backends pick their device at predict time
+    if backend == 'pt':
+        if progress:
+            progress(f"Moving models to {device}...")
+        detector.to(device)
+        recognizer.to(device)
+
+    return ModelPair(detector, recognizer, model_size, backend, device)
+
+
+def load_recognizer(base_dir, model_size, backend='pt', device=None):
+    """Load only the OCR model of a size (e.g. a cascade escalation tier); detector is None"""
+    device = device or default_device()
+    ocr_path = model_paths(base_dir, model_size, backend)[1]
+    if not os.path.exists(ocr_path):
+        raise FileNotFoundError(f"OCR model not found: {ocr_path}")
+
+    from ultralytics import YOLO
+
+    recognizer = YOLO(ocr_path, task='detect')
+    if backend == 'pt':
+        recognizer.to(device)
+    return ModelPair(None, recognizer, model_size, backend, device)
+
+
+def load_detector(base_dir, model_size, backend='pt', device=None):
+    """Load only the detector of a size (e.g. an archive scan's first pass); recognizer is None"""
+    device = device or default_device()
+    detection_path = model_paths(base_dir, model_size, backend)[0]
+    if not os.path.exists(detection_path):
+        raise FileNotFoundError(f"Detection model not found: {detection_path}")
+
+    from ultralytics import YOLO
+
+    detector = YOLO(detection_path, task='detect')
+    if backend == 'pt':
+        detector.to(device)
+    return ModelPair(detector, None, model_size, backend, device)
+
+
+def warmup_model_pair(models, image_size, conf=0.25, runs=1):
+    """Run both models on blank images so graph setup/allocations happen before real frames"""
+    import numpy as np
+
+    dummy = np.zeros((image_size, image_size, 3), dtype=np.uint8)
+    start = time.perf_counter()
+    for _ in range(runs):
+        if models.detector is not None:
+            models.detector(dummy, conf=conf, imgsz=image_size, verbose=False)
+        models.recognizer(dummy, conf=conf, imgsz=image_size, verbose=False)
+    return time.perf_counter() - start
+
+
+class ModelManager:
+    """Background loader with an LRU cache of model pairs keyed by (size, backend, device)"""
+
+    def __init__(self, base_dir, cache_size=2, setup=None):
+        self.base_dir = base_dir
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.active = None  # replaced as a whole, never mutated
+        self.generation = 0
+        # Larger OCR model for cascade escalation (detector is None), swapped like active
+        self.escalation = None
+        self.escalation_generation = 0
+        # Called once on the loader thread before the first load (e.g. torch thread settings)
+        self.setup = setup
+        self.setup_done = False
+
+    def get_cached(self, key):
+        with self.lock:
+            pair = self.cache.get(key)
+            if pair is not None:
+                self.cache.move_to_end(key)
+            return pair
+
+    def _remember(self, key, pair):
+        with self.lock:
+            self.cache[key] = pair
+            self.cache.move_to_end(key)
+            active = self.active
+            active_key = (active.size, active.backend, active.device) if active else None
+            # Evict least recently used, but never the pair a stream is currently using
+            for old_key in list(self.cache):
+                if len(self.cache) <= self.cache_size:
+                    break
+                if old_key not in (key, active_key):
+                    del self.cache[old_key]
+
+    def _ensure_setup(self):
+        """Run the setup callback once, on whichever loader thread gets here first"""
+        with self.lock:
+            setup, self.setup_done = (None if self.setup_done else self.setup), True
+        if setup:
+            setup()
+
+    def get_detector(self, model_size, backend='pt', device=None):
+        """Detector of a size for a side task, reusing a cached pair's; a fresh one is not cached
+
+        Loading only the detector keeps the side task from pulling an OCR model into the LRU
+        and evicting a pair the user switches between.
+        """
+        self._ensure_setup()
+        resolved = device or default_device()
+        pair = self.get_cached((model_size, backend, resolved))
+        if pair is None:
+            pair = load_detector(self.base_dir, model_size, backend, resolved)
+        return pair.detector
+
+    def activate(self, pair):
+        """Make a loaded pair active; a single attribute assignment, so readers see old or new"""
+        self.active = pair
+
+    def load_async(self, model_size, backend='pt', device=None, warmup_size=None,
+                   on_progress=None, on_done=None, on_error=None):
+        """Load (or fetch from cache) a model pair in a background thread and activate it
+
+        New pairs are warmed up at warmup_size before they are activated.
+        Callbacks run on the loader thread; GUI callers should marshal them with root.after.
+        A newer request supersedes older ones still loading.
+        """
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+
+        def worker():
+            try:
+                self._ensure_setup()
+                # Resolving the device imports torch, so it happens here rather than on the caller's thread
+                resolved = device or default_device()
+                key = (model_size, backend, resolved)
+                pair = self.get_cached(key)
+                cached = pair is not None
+                if not cached:
+                    pair = load_model_pair(self.base_dir, model_size, backend, resolved, progress=on_progress)
+                    if warmup_size:
+                        if on_progress:
+                            on_progress(f"Warming up models at {warmup_size}px...")
+                        warmup_model_pair(pair, warmup_size)
+                    self._remember(key, pair)
+            except Exception as e:
+                if on_error and generation == self.generation:
+                    on_error(e)
+                return
+            # Only the most recent request gets to swap in its models
+            if generation == self.generation:
+                self.activate(pair)
+                if on_done:
+                    on_done(pair, cached)
+
+        thread = threading.Thread(target=worker, name=f"model-loader-{model_size}")
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def clear_escalation(self):
+        """Leave cascade mode; pending escalation loads are discarded"""
+        with self.lock:
+            self.escalation_generation += 1
+        self.escalation = None
+
+    def load_escalation_async(self, model_size, backend='pt', device=None, warmup_size=None,
+                              on_done=None, on_error=None):
+        """Load the OCR model used to re-read uncertain crops, reusing a cached pair's recognizer"""
+        with self.lock:
+            self.escalation_generation += 1
+            generation = self.escalation_generation
+
+        def worker():
+            try:
+                self._ensure_setup()
+                resolved = device or default_device()
+                cached = self.get_cached((model_size, backend, resolved))
+                if cached is not None:
+                    tier = cached._replace(detector=None)
+                else:
+                    tier = load_recognizer(self.base_dir, model_size, backend, resolved)
+                    if warmup_size:
+                        warmup_model_pair(tier, warmup_size)
+            except Exception as e:
+                if on_error and generation == self.escalation_generation:
+                    on_error(e)
+                return
+            if generation == self.escalation_generation:
+                self.escalation = tier
+                if on_done:
+                    on_done(tier, cached is not None)
+
+        thread = threading.Thread(target=worker, name=f"escalation-loader-{model_size}")
+        thread.daemon = True
+        thread.start()
+        return thread
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Crop-level OCR result cache keyed by perceptual hash
+A plate sitting at a gate produces nearly identical crops frame after frame. The cache keys
+each crop by a dHash of its normalized grayscale image plus a box-size bucket and returns the
+previous read for matching crops instead of running the OCR model again.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+def dhash(image, hash_size=8):
+    """Difference hash of an image as an int (hash_size * hash_size bits)"""
+    import cv2
+    import numpy as np
+
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    # Normalize contrast so lighting flicker does not change the hash
+    gray = cv2.equalizeHist(gray)
+    resized = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (resized[:, 1:] > resized[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+
+class OCRCache:
+    """Bounded LRU of OCR reads keyed by (size bucket, dHash)
+
+    max_distance is the hash tolerance in bits: 0 only reuses identical hashes, larger values
+    also reuse near-identical crops (faster, but may hold on to a stale read longer).
+    verify_every > 0 recomputes every Nth hit and counts disagreements with the cached read.
+    """
+
+    def __init__(self, capacity=256, max_distance=0, size_bucket=16, hash_size=8, verify_every=0):
+        self.capacity = capacity
+        self.max_distance = max_distance
+        self.size_bucket = size_bucket
+        self.hash_size = hash_size
+        self.verify_every = verify_every
+        self.entries = OrderedDict()
+        self.verifying = {}
+        self.lock = threading.Lock()
+        self.matches = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.verified = 0
+        self.mismatches = 0
+
+    def make_key(self, crop):
+        height, width = crop.shape[:2]
+        bucket = (width // self.size_bucket, height // self.size_bucket)
+        return bucket, dhash(crop, self.hash_size)
+
+    def _find(self, key):
+        """Exact match first, then the closest hash in the same size bucket within tolerance"""
+        if key in self.entries:
+            return key
+        if self.max_distance <= 0:
+            return None
+        bucket, crop_hash = key
+        best, best_distance = None, self.max_distance + 1
+        for other in self.entries:
+            if other[0] != bucket:
+                continue
+            distance = hamming(crop_hash, other[1])
+            if distance < best_distance:
+                best, best_distance = other, distance
+        return best
+
+    def lookup(self, crop):
+        """Return (cached read or None, key); pass the key to store() after a miss"""
+        key = self.make_key(crop)
+        with self.lock:
+            match = self._find(key)
+            if match is None:
+                self.misses += 1
+                return None, key
+            self.entries.move_to_end(match)
+            read = self.entries[match]
+            self.matches += 1
+            if self.verify_every and self.matches % self.verify_every == 0:
+                # Treat as a miss so the model runs, and compare in store()
+                self.verifying[key] = read
+                self.misses += 1
+                return None, key
+            self.hits += 1
+            return read, key
+
+    def store(self, key, read):
+        with self.lock:
+            expected = self.verifying.pop(key, None)
+            if expected is not None:
+                self.verified += 1
+                if expected[0] != read[0]:
+                    self.mismatches += 1
+            self.entries[key] = read
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop cached reads (e.g. after a model or threshold change)"""
+        with self.lock:
+            self.entries.clear()
+            self.verifying.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'verified': self.verified,
+                'mismatches': self.mismatches,
+            }
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Cascaded OCR across model sizes
+The fast (nano) OCR model reads every plate crop. A crop is re-read by a larger (s/m) model only
+when the fast read is uncertain: low confidence, rejected by the plate filter, or different from
+what the track has been reading. Most frames never touch the large model.
+"""
+
+import threading
+from collections import Counter
+
+from plate_pipeline import CHAR_MAP, recognize_crops
+
+
+def escalation_reason(read, min_confidence, validate=None, history=None, min_history=2):
+    """Why a fast read should be escalated ('low_confidence', 'invalid', 'disagrees') or None"""
+    text, confidence, _ = read
+    if not text or confidence < min_confidence:
+        return 'low_confidence'
+    if validate is not None and not validate(text):
+        return 'invalid'
+    if history:
+        plate, count = Counter(history).most_common(1)[0]
+        if count >= min_history and plate != text:
+            return 'disagrees'
+    return None
+
+
+class CascadeStats:
+    """Per-tier model calls and crops, plus escalation reasons"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = Counter()
+        self.crops = Counter()
+        self.reasons = Counter()
+        self.reads = 0  # crops read by the fast tier
+        self.changed = 0  # escalations that replaced the fast read with a different text
+
+    def record_call(self, tier, crops, fast=True):
+        with self.lock:
+            self.calls[tier] += 1
+            self.crops[tier] += crops
+            if fast:
+                self.reads += crops
+
+    def record_escalation(self, reason, changed):
+        with self.lock:
+            self.reasons[reason] += 1
+            self.changed += int(changed)
+
+    def snapshot(self):
+        with self.lock:
+            escalated = sum(self.reasons.values())
+            return {
+                'calls': dict(self.calls),
+                'crops': dict(self.crops),
+                'escalated': escalated,
+                'escalation_rate': escalated / self.reads if self.reads else 0.0,
+                'reasons': dict(self.reasons),
+                'changed': self.changed,
+            }
+
+
+def recognize_cascade(fast, escalation, crops, conf, image_size, min_detection_length=3,
+                      char_map=CHAR_MAP, min_confidence=0.6, validate=None, history=None,
+                      cache=None, stats=None, tiers=('n', 's')):
+    """Drop-in for recognize_crops: fast OCR on every crop, one batched escalation call for the
+    uncertain ones. An escalated read replaces the fast read unless it comes back empty.
+
+    With an OCRCache the final (possibly escalated) read is cached, so hits skip both tiers.
+    `history` holds recent reads of one plate (the first plate read in each frame), so it is only
+    compared with the first crop that has a read; other plates in the frame are not "disagreeing".
+    """
+    if not crops:
+        return []
+
+    reads = [None] * len(crops)
+    keys = [None] * len(crops)
+    pending = list(range(len(crops)))
+    if cache is not None:
+        pending = []
+        for i, crop in enumerate(crops):
+            reads[i], keys[i] = cache.lookup(crop)
+            if reads[i] is None:
+                pending.append(i)
+    if not pending:
+        return reads
+
+    fast_reads = recognize_crops(fast, [crops[i] for i in pending], conf, image_size,
+                                 min_detection_length, char_map)
+    if stats is not None:
+        stats.record_call(tiers[0], len(pending))
+
+    for i, read in zip(pending, fast_reads):
+        reads[i] = read
+    tracked = next((i for i, read in enumerate(reads) if read[0]), None)
+
+    escalate = []
+    for i in pending:
+        reason = escalation_reason(reads[i], min_confidence, validate, history if i == tracked else None)
+        if reason is not None:
+            escalate.append((i, reason))
+
+    if escalate and escalation is not None:
+        better = recognize_crops(escalation, [crops[i] for i, _ in escalate], conf, image_size,
+                                 min_detection_length, char_map)
+        if stats is not None:
+            stats.record_call(tiers[1], len(escalate), fast=False)
+        for (i, reason), read in zip(escalate, better):
+            changed = bool(read[0]) and read[0] != reads[i][0]
+            if read[0]:
+                reads[i] = read
+            if stats is not None:
+                stats.record_escalation(reason, changed)
+
+    if cache is not None:
+        for i in pending:
+            cache.store(keys[i], reads[i])
+    return reads
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Persistent plate index (SQLite)
+Every accepted read is stored with its source, frame number and media timestamp, so footage can
+be reviewed by querying plates instead of re-running recognition. Lookups stay index-bound
+at millions of rows:
+- exact:  same plate text (spaces and case ignored)
+- prefix: plate text starts with the query
+- fuzzy:  tolerant of typical OCR confusions: series letters that differ only in aspiration
+          (Ka/Kha, Ga/Gha, ...) and at most one wrong digit
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from collections import namedtuple
+
+from detection_store import plate_key
+from evaluate import edit_distance
+
+MATCH_MODES = ('prefix', 'exact', 'fuzzy')
+
+IndexHit = namedtuple('IndexHit', ['plate', 'source', 'frame_number', 'media_time', 'timestamp',
+                                   'confidence', 'distance'])
+
+# Aspirated series letters collapse to their plain form: chha -> cha, kha -> ka, ...
+_ASPIRATION = re.compile(r'(ch|[bdgjkst])h')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS reads (
+    id INTEGER PRIMARY KEY,
+    plate TEXT NOT NULL,
+    key TEXT NOT NULL,
+    source_id INTEGER NOT NULL REFERENCES sources(id),
+    frame_number INTEGER,
+    media_time REAL,
+    timestamp REAL NOT NULL,
+    confidence REAL
+);
+CREATE INDEX IF NOT EXISTS reads_key ON reads(key, timestamp);
+CREATE TABLE IF NOT EXISTS fuzzy (
+    variant TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (variant, key)
+) WITHOUT ROWID;
+"""
+
+# Candidate plates for a fuzzy query come from the variant table alone, one row per distinct plate
+FUZZY_CANDIDATES = "SELECT DISTINCT key FROM fuzzy WHERE variant IN ({marks})"
+
+
+def confusion_skeleton(key):
+    """Plate key with confusable letters merged (applied to stored and queried plates alike)"""
+    return _ASPIRATION.sub(r'\1', key)
+
+
+def fuzzy_variants(key):
+    """The skeleton plus one copy per digit with that digit wildcarded
+
+    Two keys share a variant exactly when their skeletons are equal or differ in one digit.
+    """
+    skeleton = confusion_skeleton(key)
+    variants = {skeleton}
+    for i, char in enumerate(skeleton):
+        if char.isdigit():
+            variants.add(skeleton[:i] + '?' + skeleton[i + 1:])
+    return sorted(variants)
+
+
+class PlateIndex:
+    """Thread-safe SQLite index of accepted reads"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate_fuzzy()
+        self.conn.executescript(SCHEMA)
+        self.source_ids = dict((path, source_id) for source_id, path in
+                               self.conn.execute("SELECT id, path FROM sources"))
+
+    def _migrate_fuzzy(self):
+        """Rebuild a per-read variant table from older databases as one row per distinct plate"""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(fuzzy)")]
+        if 'read_id' not in columns:
+            return
+        with self.conn:
+            self.conn.execute("DROP TABLE fuzzy")
+            self.conn.executescript(SCHEMA)
+            for key, in self.conn.execute("SELECT DISTINCT key FROM reads").fetchall():
+                self._add_variants(key)
+
+    def _add_variants(self, key):
+        self.conn.executemany("INSERT OR IGNORE INTO fuzzy (variant, key) VALUES (?, ?)",
+                              [(variant, key) for variant in fuzzy_variants(key)])
+
+    def _source_id(self, source):
+        source_id = self.source_ids.get(source)
+        if source_id is None:
+            self.conn.execute("INSERT OR IGNORE INTO sources (path) VALUES (?)", (source,))
+            source_id = self.conn.execute("SELECT id FROM sources WHERE path = ?", (source,)).fetchone()[0]
+            self.source_ids[source] = source_id
+        return source_id
+
+    def add(self, plate, source, frame_number, media_time, timestamp, confidence=0.0):
+        """Index one read; returns its row id"""
+        return self.add_many([(plate, source, frame_number, media_time, timestamp, confidence)])[0]
+
+    def add_many(self, reads):
+        """Index (plate, source, frame_number, media_time, timestamp, confidence) rows in one transaction"""
+        ids = []
+        with self.lock, self.conn:
+            for plate, source, frame_number, media_time, timestamp, confidence in reads:
+                key = plate_key(plate)
+                cursor = self.conn.execute(
+                    "INSERT INTO reads (plate, key, source_id, frame_number, media_time, timestamp, confidence) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (plate, key, self._source_id(source), frame_number, media_time, timestamp, confidence))
+                self._add_variants(key)
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM reads").fetchone()[0]
+
+    def search(self, text, mode='prefix', limit=200):
+        """IndexHits for a query, closest first for fuzzy and in plate/time order otherwise"""
+        if mode not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode: {mode}")
+        needle = plate_key(text)
+        if not needle:
+            return []
+        columns = ("SELECT r.plate, s.path, r.frame_number, r.media_time, r.timestamp, r.confidence, r.key "
+                   "FROM reads r JOIN sources s ON s.id = r.source_id ")
+        with self.lock:
+            if mode == 'exact':
+                rows = self.conn.execute(columns + "WHERE r.key = ? ORDER BY r.key, r.timestamp LIMIT ?",
+                                         (needle, limit)).fetchall()
+            elif mode == 'prefix':
+                # Range scan on the key index: needle <= key < needle with its last character bumped
+                upper = needle[:-1] + chr(ord(needle[-1]) + 1)
+                rows = self.conn.execute(columns + "WHERE r.key >= ? AND r.key < ? "
+                                         "ORDER BY r.key, r.timestamp LIMIT ?",
+                                         (needle, upper, limit)).fetchall()
+            else:
+                # Rank the distinct matching plates first, then fetch reads for the closest ones only,
+                # so a plate seen thousands of times cannot crowd out a closer one
+                variants = fuzzy_variants(needle)
+                marks = ", ".join("?" * len(variants))
+                keys = [key for key, in self.conn.execute(FUZZY_CANDIDATES.format(marks=marks), variants)]
+                distances = dict((key, edit_distance(key, needle)) for key in keys)
+                rows = []
+                for key in sorted(keys, key=lambda key: (distances[key], key)):
+                    if len(rows) >= limit:
+                        break
+                    rows += self.conn.execute(columns + "WHERE r.key = ? ORDER BY r.key, r.timestamp LIMIT ?",
+                                              (key, limit - len(rows))).fetchall()
+        hits = [IndexHit(plate, source, frame_number, media_time, timestamp, confidence,
+                         distances[key] if mode == 'fuzzy' else 0)
+                for plate, source, frame_number, media_time, timestamp, confidence, key in rows]
+        if mode == 'fuzzy':
+            hits.sort(key=lambda hit: (hit.distance, hit.timestamp))
+        return hits
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
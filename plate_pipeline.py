@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Shared license plate recognition logic
+Character mapping, text assembly, regex validation and batched detector/OCR passes used by
+the GUI, the recognition server and the benchmark tools.
+"""
+
+import re
+from array import array
+from datetime import datetime
+
+# Character mapping (OCR class id -> token)
+CHAR_MAP = {
+    0: '0', 1: '1', 2: '2', 3: '3', 4: '4', 5: '5', 6: '6', 7: '7', 8: '8', 9: '9',
+    10: 'Metro', 11: 'A', 12: 'Bha', 13: 'Cha', 14: 'Chha', 15: 'Da', 16: 'DA', 17: 'E',
+    18: 'Ga', 19: 'Gha', 20: 'Ha', 21: 'Ja', 22: 'Jha', 23: 'Ka', 24: 'Kha', 25: 'La',
+    26: 'Ma', 27: 'Na', 28: 'Pa', 29: 'Sa', 30: 'Sha', 31: 'Ta', 32: 'THA', 33: 'Tha',
+    34: 'U', 35: 'Bagerhat', 36: 'Bagura', 37: 'Bandarban', 38: 'Barguna', 39: 'Barisal',
+    40: 'Bhola', 41: 'Brahmanbaria', 42: 'Chandpur', 43: 'Chapainawabganj', 44: 'Chatto',
+    45: 'Chattogram', 46: 'Chuadanga', 47: 'Coxs Bazar', 48: 'Cumilla', 49: 'Dhaka',
+    50: 'Dinajpur', 51: 'Faridpur', 52: 'Feni', 53: 'Gaibandha', 54: 'Gazipur',
+    55: 'Gopalganj', 56: 'Habiganj', 57: 'Jamalpur', 58: 'Jessore', 59: 'Jhalokati',
+    60: 'Jhenaidah', 61: 'Joypurhat', 62: 'Khagrachari', 63: 'Khulna', 64: 'Kishoreganj',
+    65: 'Kurigram', 66: 'Kustia', 67: 'Lakshmipur', 68: 'Lalmonirhat', 69: 'Madaripur',
+    70: 'Magura', 71: 'Manikganj', 72: 'Meherpur', 73: 'Moulvibazar', 74: 'Mymensingh',
+    75: 'Naogaon', 76: 'Narail', 77: 'Narayanganj', 78: 'Narsingdi', 79: 'Natore',
+    80: 'Netrokona', 81: 'Nilphamari', 82: 'Noakhali', 83: 'Pabna', 84: 'panchagarh',
+    85: 'Patuakhali', 86: 'Pirojpur', 87: 'Raj', 88: 'Rajbari', 89: 'Rajshahi',
+    90: 'Rangamati', 91: 'Rangpur', 92: 'Satkhira', 93: 'Shariatpur', 94: 'Sherpur',
+    95: 'Sirajganj', 96: 'Sunamganj', 97: 'Sylhet', 98: 'Tangail', 99: 'Thakurgaon',
+    100: 'Dha', 101: 'Ba'
+}
+
+# Character categories
+CATEGORY_DIGIT, CATEGORY_METRO, CATEGORY_SERIES, CATEGORY_DISTRICT = range(4)
+CATEGORY_NAMES = ('digit', 'metro', 'series', 'district')
+
+
+def _char_category(class_id, token):
+    if 0 <= class_id < 10:
+        return CATEGORY_DIGIT
+    if token == 'Metro':
+        return CATEGORY_METRO
+    if 35 <= class_id < 100:
+        return CATEGORY_DISTRICT
+    return CATEGORY_SERIES
+
+
+def build_class_tables(char_map):
+    """Lookup tables indexed by class id: (tokens, categories); ids missing from the map read as '?'"""
+    size = max(char_map) + 1 if char_map else 0
+    tokens = tuple(char_map.get(i, '?') for i in range(size))
+    categories = tuple(_char_category(i, tokens[i]) for i in range(size))
+    return tokens, categories
+
+
+# Precomputed for the default map; plain tuples, since per-character indexing in Python is
+# faster on a tuple than on a NumPy array
+CHAR_TOKENS, CHAR_CATEGORIES = build_class_tables(CHAR_MAP)
+_class_tables = [(CHAR_MAP, (CHAR_TOKENS, CHAR_CATEGORIES))]
+
+
+def class_tables(char_map=CHAR_MAP):
+    """Tables for a char map, built once per map object"""
+    for known, tables in _class_tables:
+        if known is char_map:
+            return tables
+    tables = build_class_tables(char_map)
+    _class_tables.append((char_map, tables))
+    return tables
+
+# License plate format patterns
+LICENSE_PATTERNS = {
+    'standard': r'^[A-Za-z]+Metro[A-Za-z]+\s+\d{6}$',  # ChattoMetroGa 138707
+    'metro_basic': r'^[A-Za-z]+Metro\s+\d{6}$',        # DhakaMetro 115636
+    'district_simple': r'^(?!.*Metro)[A-Za-z]+\s+\d{2,6}$',  # Chatto 13 (excludes Metro)
+    'custom': r'',
+}
+
+DEFAULT_FILTER_SETTINGS = {
+    'enabled': True,
+    'pattern_type': 'standard',
+    'custom_pattern': '',
+    'allow_multiple_patterns': False,
+}
+
+
+def validate_plate(plate_text, filter_settings, license_patterns=LICENSE_PATTERNS):
+    """Validate license plate against regex patterns"""
+    if not filter_settings['enabled']:
+        return True  # If filter is disabled, all plates are valid
+
+    plate_text = plate_text.strip()
+    if not plate_text:
+        return False
+
+    if filter_settings['allow_multiple_patterns']:
+        # Check against all patterns
+        patterns_to_check = []
+        if filter_settings['pattern_type'] == 'custom':
+            if filter_settings['custom_pattern']:
+                patterns_to_check.append(filter_settings['custom_pattern'])
+        else:
+            # Check against all predefined patterns
+            patterns_to_check.extend([
+                license_patterns['standard'],
+                license_patterns['metro_basic'],
+                license_patterns['district_simple']
+            ])
+    else:
+        # Check against selected pattern only
+        if filter_settings['pattern_type'] == 'custom':
+            patterns_to_check = [filter_settings['custom_pattern']] if filter_settings['custom_pattern'] else []
+        else:
+            patterns_to_check = [license_patterns[filter_settings['pattern_type']]]
+
+    # Test against patterns
+    for pattern in patterns_to_check:
+        if pattern:  # Only test non-empty patterns
+            try:
+                if re.match(pattern, plate_text, re.IGNORECASE):
+                    return True
+            except re.error:
+                # Invalid regex pattern
+                continue
+
+    return False
+
+
+def extract_chars(char_results):
+    """Collect (center_x, class_id, confidence, xyxy) for every character box in OCR results"""
+    detected_chars = []
+    for char in char_results:
+        if not hasattr(char.boxes, 'xyxy') or len(char.boxes.xyxy) == 0:
+            continue
+        xyxy = char.boxes.xyxy.tolist()
+        classes = char.boxes.cls.tolist()
+        confs = char.boxes.conf.tolist()
+        for (cx1, cy1, cx2, cy2), class_id, conf in zip(xyxy, classes, confs):
+            detected_chars.append(((cx1 + cx2) / 2, int(class_id), float(conf), (cx1, cy1, cx2, cy2)))
+    return detected_chars
+
+
+def ordered_class_ids(detected_chars, char_map=CHAR_MAP):
+    """Class ids in plate order: letters left to right, then digits left to right"""
+    categories = class_tables(char_map)[1]
+    letters, digits = [], []
+    for char in detected_chars:
+        center_x, class_id = char[0], char[1]
+        if class_id < len(categories) and categories[class_id] == CATEGORY_DIGIT:
+            digits.append((center_x, class_id))
+        else:
+            letters.append((center_x, class_id))
+    letters.sort()
+    digits.sort()
+    return [c for _, c in letters] + [c for _, c in digits]
+
+
+def plate_text_from_ids(class_ids, char_map=CHAR_MAP):
+    """Display text for ordered class ids: letters, a space, then digits"""
+    tokens, categories = class_tables(char_map)
+    letters, digits = [], []
+    for class_id in class_ids:
+        if class_id >= len(tokens):
+            letters.append('?')
+        elif categories[class_id] == CATEGORY_DIGIT:
+            digits.append(tokens[class_id])
+        else:
+            letters.append(tokens[class_id])
+    return ("".join(letters) + " " + "".join(digits)).strip()
+
+
+def assemble_plate_text(detected_chars, char_map=CHAR_MAP):
+    """Letters (sorted left to right), a space, then digits (sorted left to right)"""
+    return plate_text_from_ids(ordered_class_ids(detected_chars, char_map), char_map)
+
+
+def read_confidence(detected_chars):
+    """Mean character confidence of a read"""
+    if not detected_chars:
+        return 0.0
+    return sum(c[2] for c in detected_chars) / len(detected_chars)
+
+
+def detect_plate_boxes(detector, frames, conf, image_size):
+    """Run the detector on a list of frames; returns integer xyxy boxes per frame"""
+    results = detector(frames, conf=conf, imgsz=image_size, verbose=False)
+    boxes_per_frame = []
+    for result in results:
+        boxes = []
+        if hasattr(result.boxes, 'xyxy') and len(result.boxes.xyxy) > 0:
+            boxes = [tuple(map(int, box)) for box in result.boxes.xyxy.tolist()]
+        boxes_per_frame.append(boxes)
+    return boxes_per_frame
+
+
+def recognize_crops(recognizer, crops, conf, image_size, min_detection_length=3, char_map=CHAR_MAP,
+                    cache=None):
+    """Run OCR on a batch of plate crops; returns (text, confidence, chars) per crop
+
+    text is '' when fewer than min_detection_length characters were found.
+    With an OCRCache, crops matching a cached crop reuse its read and skip the model.
+    """
+    if not crops:
+        return []
+
+    reads = [None] * len(crops)
+    keys = [None] * len(crops)
+    pending = list(range(len(crops)))
+    if cache is not None:
+        pending = []
+        for i, crop in enumerate(crops):
+            reads[i], keys[i] = cache.lookup(crop)
+            if reads[i] is None:
+                pending.append(i)
+
+    if pending:
+        results = recognizer([crops[i] for i in pending], conf=conf, imgsz=image_size, verbose=False)
+        for i, result in zip(pending, results):
+            chars = extract_chars([result])
+            text = ''
+            if len(chars) >= min_detection_length:
+                text = assemble_plate_text(chars, char_map)
+            reads[i] = (text, read_confidence(chars), chars)
+            if cache is not None:
+                cache.store(keys[i], reads[i])
+    return reads
+
+
+class DetectionRecord:
+    """Compact saved detection: int16 class ids, float epoch timestamp, float32 plate box
+
+    Plate text and formatted times are produced on demand at the UI and export edges.
+    """
+
+    __slots__ = ('class_ids', 'timestamp', 'confidence', 'box', 'filter_pattern', 'filter_enabled',
+                 'evidence_crop', 'evidence_context', 'source', 'frame_number', 'media_time', 'char_map')
+
+    def __init__(self, class_ids, timestamp, confidence=0.0, box=(), filter_pattern='',
+                 filter_enabled=True, evidence_crop=None, evidence_context=None, source=None,
+                 frame_number=None, media_time=None, char_map=CHAR_MAP):
+        self.class_ids = array('h', class_ids)
+        self.char_map = char_map  # the map the ids came from (shared, not copied)
+        self.timestamp = float(timestamp)
+        self.confidence = float(confidence)
+        self.box = array('f', box)
+        self.filter_pattern = filter_pattern
+        self.filter_enabled = filter_enabled
+        self.evidence_crop = evidence_crop
+        self.evidence_context = evidence_context
+        # Where the read came from: video path (or camera id), frame number and seconds into the video
+        self.source = source
+        self.frame_number = frame_number
+        self.media_time = media_time
+
+    @property
+    def plate(self):
+        return plate_text_from_ids(self.class_ids, self.char_map)
+
+    def time_text(self, fmt="%Y-%m-%d %H:%M:%S"):
+        return datetime.fromtimestamp(self.timestamp).strftime(fmt)
+
+    def to_dict(self):
+        """Export/JSON form; confidence is the OCR confidence of the read that was saved"""
+        data = {
+            'plate': self.plate,
+            'timestamp': self.time_text(),
+            'confidence': round(self.confidence, 4),
+            'filter_pattern': self.filter_pattern,
+            'filter_enabled': self.filter_enabled,
+        }
+        if self.evidence_crop is not None or self.evidence_context is not None:
+            data['evidence_crop'] = self.evidence_crop
+            data['evidence_context'] = self.evidence_context
+        if self.source is not None:
+            data['source'] = self.source
+            data['frame_number'] = self.frame_number
+            data['media_time'] = self.media_time
+        return data
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Dataset preparation: deterministic train/val split into the YOLO folder layout
+Replaces the dataset-process notebooks. The source folder is left untouched: files are hard-linked
+(falling back to a copy across filesystems) or copied in parallel, and every finished file is
+recorded in a manifest so an interrupted run picks up where it stopped.
+
+Usage:
+    python prepare_dataset.py SOURCE Bengali_License_Plate_Dataset --seed 42
+    python prepare_dataset.py SOURCE Only_License_Plate --stratify --mode copy
+    python prepare_dataset.py SOURCE Plate_Crops --ocr-crops --plate-class 0
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.bmp')
+SPLITS = ('train', 'val')
+MANIFEST = 'manifest.jsonl'
+SETTINGS = 'prepare_settings.json'
+
+Sample = namedtuple('Sample', ['stem', 'image', 'label', 'classes'])
+
+
+def read_label_classes(label_path):
+    """Class ids in a YOLO label file, in file order"""
+    classes = []
+    with open(label_path) as f:
+        for line in f:
+            parts = line.split()
+            if parts:
+                classes.append(int(float(parts[0])))
+    return classes
+
+
+def index_dataset(source_dir):
+    """One pass over the source folder: images that have a label file next to them"""
+    images, labels = {}, {}
+    with os.scandir(source_dir) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            stem, ext = os.path.splitext(entry.name)
+            if ext.lower() in IMAGE_EXTS:
+                images[stem] = entry.path
+            elif ext.lower() == '.txt':
+                labels[stem] = entry.path
+    return [Sample(stem, images[stem], labels[stem], tuple(read_label_classes(labels[stem])))
+            for stem in sorted(images) if stem in labels]
+
+
+def stratum(sample, class_counts):
+    """Stratify on the rarest class in the sample so rare classes land in both splits"""
+    if not sample.classes:
+        return None
+    return min(set(sample.classes), key=lambda c: (class_counts[c], c))
+
+
+def split_samples(samples, val_fraction=0.2, seed=0, stratify=False):
+    """Deterministic {stem: split} for a seed; independent of directory listing order"""
+    rng = random.Random(seed)
+    groups = defaultdict(list)
+    if stratify:
+        class_counts = Counter(c for sample in samples for c in sample.classes)
+        for sample in samples:
+            groups[stratum(sample, class_counts)].append(sample.stem)
+    else:
+        groups[None] = [sample.stem for sample in samples]
+
+    assignment = {}
+    for key in sorted(groups, key=lambda k: (k is None, k)):
+        stems = sorted(groups[key])
+        rng.shuffle(stems)
+        val_count = int(round(len(stems) * val_fraction))
+        for i, stem in enumerate(stems):
+            assignment[stem] = 'val' if i < val_count else 'train'
+    return assignment
+
+
+def place_file(src, dst, mode='link'):
+    """Hard-link or copy src to dst via a temporary name, so dst is either complete or absent"""
+    tmp = dst + '.part'
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    if mode == 'link':
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copy2(src, tmp)  # different filesystem, or links not supported
+    else:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+def load_manifest(output_dir):
+    """Names of the outputs finished by earlier runs"""
+    path = os.path.join(output_dir, MANIFEST)
+    done = set()
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)['name'])
+                except (ValueError, KeyError):
+                    continue  # torn last line of an interrupted run
+    return done
+
+
+def check_settings(output_dir, settings):
+    """Refuse to resume into an output made with different split settings"""
+    path = os.path.join(output_dir, SETTINGS)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            previous = json.load(f)
+        if previous != settings:
+            raise ValueError(f"{output_dir} was prepared with different settings: {previous}")
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(settings, f, indent=2)
+
+
+def sample_files(sample, split, output_dir):
+    """(src, dst) pairs for a sample in the YOLO images/labels layout"""
+    image_dst = os.path.join(output_dir, 'images', split, os.path.basename(sample.image))
+    label_dst = os.path.join(output_dir, 'labels', split, sample.stem + '.txt')
+    return [(sample.image, image_dst), (sample.label, label_dst)]
+
+
+def read_plate_boxes(label_path, width, height, plate_class=0):
+    """Pixel xyxy boxes of the plate class from a YOLO detection label file"""
+    boxes = []
+    with open(label_path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 5 or int(float(parts[0])) != plate_class:
+                continue
+            cx, cy, w, h = (float(v) for v in parts[1:5])
+            boxes.append((int(max(0, (cx - w / 2) * width)), int(max(0, (cy - h / 2) * height)),
+                          int(min(width, (cx + w / 2) * width)), int(min(height, (cy + h / 2) * height))))
+    return boxes
+
+
+def write_plate_crops(sample, split, output_dir, plate_class=0, padding=0.05):
+    """Cut every plate box of an image into images/<split>/<stem>_<k>.jpg; returns the crop count"""
+    import cv2
+
+    image = cv2.imread(sample.image)
+    if image is None:
+        raise ValueError(f"Unreadable image: {sample.image}")
+    height, width = image.shape[:2]
+    count = 0
+    for k, (x1, y1, x2, y2) in enumerate(read_plate_boxes(sample.label, width, height, plate_class)):
+        pad_x, pad_y = int((x2 - x1) * padding), int((y2 - y1) * padding)
+        crop = image[max(0, y1 - pad_y):min(height, y2 + pad_y), max(0, x1 - pad_x):min(width, x2 + pad_x)]
+        if crop.size == 0:
+            continue
+        dst = os.path.join(output_dir, 'images', split, f"{sample.stem}_{k}.jpg")
+        tmp = dst + '.part.jpg'
+        cv2.imwrite(tmp, crop)
+        os.replace(tmp, dst)
+        count += 1
+    return count
+
+
+def prepare(source_dir, output_dir, val_fraction=0.2, seed=0, stratify=False, mode='link',
+            ocr_crops=False, plate_class=0, workers=8, progress=None):
+    """Index, split and place the dataset; returns counts of processed/skipped samples per split"""
+    samples = index_dataset(source_dir)
+    if not samples:
+        raise FileNotFoundError(f"No labeled images in {source_dir}")
+    os.makedirs(output_dir, exist_ok=True)
+    check_settings(output_dir, {
+        'source': os.path.abspath(source_dir), 'val_fraction': val_fraction, 'seed': seed,
+        'stratify': stratify, 'ocr_crops': ocr_crops, 'plate_class': plate_class,
+    })
+    for split in SPLITS:
+        os.makedirs(os.path.join(output_dir, 'images', split), exist_ok=True)
+        if not ocr_crops:
+            os.makedirs(os.path.join(output_dir, 'labels', split), exist_ok=True)
+
+    assignment = split_samples(samples, val_fraction, seed, stratify)
+    done = load_manifest(output_dir)
+    counts = Counter()
+    todo = []
+    for sample in samples:
+        if sample.stem in done:
+            counts['skipped'] += 1
+        else:
+            todo.append(sample)
+
+    def work(sample):
+        split = assignment[sample.stem]
+        if ocr_crops:
+            return sample.stem, split, write_plate_crops(sample, split, output_dir, plate_class)
+        for src, dst in sample_files(sample, split, output_dir):
+            place_file(src, dst, mode)
+        return sample.stem, split, 1
+
+    with open(os.path.join(output_dir, MANIFEST), 'a', encoding='utf-8') as manifest, \
+            ThreadPoolExecutor(max(1, workers)) as pool:
+        futures = [pool.submit(work, sample) for sample in todo]
+        for finished, future in enumerate(as_completed(futures), 1):
+            try:
+                stem, split, outputs = future.result()
+            except Exception as e:
+                counts['failed'] += 1
+                print(f"Failed: {e}", file=sys.stderr)
+                continue
+            manifest.write(json.dumps({'name': stem, 'split': split, 'outputs': outputs}) + '\n')
+            counts[split] += 1
+            if finished % 500 == 0:
+                manifest.flush()
+                if progress:
+                    progress(finished, len(todo))
+    if progress:
+        progress(len(todo), len(todo))
+    return dict(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split a labeled image folder into the YOLO train/val layout")
+    parser.add_argument('source', help="folder with images and same-named YOLO .txt labels")
+    parser.add_argument('output', help="output dataset folder (images/{train,val}, labels/{train,val})")
+    parser.add_argument('--val', type=float, default=0.2, help="validation fraction")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--stratify', action='store_true',
+                        help="stratify the split by each image's rarest label class")
+    parser.add_argument('--mode', choices=['link', 'copy'], default='link',
+                        help="hard-link (falls back to copy across filesystems) or copy")
+    parser.add_argument('--ocr-crops', action='store_true',
+                        help="write plate crops cut from detection labels instead of copying images")
+    parser.add_argument('--plate-class', type=int, default=0, help="plate class id for --ocr-crops")
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    def progress(finished, total):
+        print(f"\r{finished}/{total} samples", end='' if finished < total else '\n', flush=True)
+
+    try:
+        counts = prepare(args.source, args.output, val_fraction=args.val, seed=args.seed,
+                         stratify=args.stratify, mode=args.mode, ocr_crops=args.ocr_crops,
+                         plate_class=args.plate_class, workers=args.workers, progress=progress)
+    except (FileNotFoundError, ValueError) as e:
+        parser.error(str(e))
+    print(f"✅ train {counts.get('train', 0)}, val {counts.get('val', 0)}, "
+          f"already done {counts.get('skipped', 0)}, failed {counts.get('failed', 0)}")
+
+
+if __name__ == "__main__":
+    main()
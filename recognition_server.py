@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Local HTTP recognition service for license plates
+Uses the same detector/OCR/char_map/filter logic as the GUI. Concurrent requests are
+coalesced into dynamically batched forward passes (up to --max-batch images, waiting at
+most --max-wait-ms for the batch to fill) and latency/throughput metrics are exposed.
+
+Endpoints:
+    POST /recognize?mode=image   body: encoded image (JPEG/PNG) of a full frame
+    POST /recognize?mode=crop    body: encoded image of an already cropped plate
+    GET  /metrics                JSON latency/throughput/batching metrics
+    GET  /health                 liveness check
+
+Usage:
+    python recognition_server.py --port 8080 --model-size n --max-batch 8 --max-wait-ms 10
+    python load_test_server.py --url http://127.0.0.1:8080 --concurrency 16
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import cv2
+import numpy as np
+
+from plate_pipeline import (CHAR_MAP, LICENSE_PATTERNS, DEFAULT_FILTER_SETTINGS, validate_plate,
+                            detect_plate_boxes, recognize_crops)
+from cpu_tuning import add_thread_arguments, settings_from_args, apply_thread_settings
+
+
+class RecognitionRequest:
+    """One image waiting for a batched forward pass"""
+
+    __slots__ = ('image', 'mode', 'enqueued', 'done', 'result', 'error')
+
+    def __init__(self, image, mode):
+        self.image = image
+        self.mode = mode
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ServerMetrics:
+    """Thread-safe request/batch counters and latency windows"""
+
+    def __init__(self, window=2000, rate_window=10.0):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.rate_window = rate_window
+        self.latencies = deque(maxlen=window)
+        self.queue_waits = deque(maxlen=window)
+        self.completions = deque()
+        self.batch_sizes = {}
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.inference_seconds = 0.0
+
+    def record_request(self, latency, ok=True):
+        now = time.perf_counter()
+        with self.lock:
+            self.requests += 1
+            if not ok:
+                self.errors += 1
+            self.latencies.append(latency)
+            self.completions.append(now)
+            while self.completions and now - self.completions[0] > self.rate_window:
+                self.completions.popleft()
+
+    def record_rejected(self):
+        with self.lock:
+            self.rejected += 1
+
+    def record_batch(self, size, seconds, waits):
+        with self.lock:
+            self.batches += 1
+            self.batched_items += size
+            self.inference_seconds += seconds
+            self.batch_sizes[size] = self.batch_sizes.get(size, 0) + 1
+            self.queue_waits.extend(waits)
+
+    @staticmethod
+    def _percentiles(values):
+        if not values:
+            return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+        ordered = sorted(values)
+        pick = lambda pct: 1000.0 * ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))]
+        return {'p50': pick(50), 'p95': pick(95), 'p99': pick(99)}
+
+    def snapshot(self, queue_depth=0):
+        now = time.perf_counter()
+        with self.lock:
+            recent = [t for t in self.completions if now - t <= self.rate_window]
+            return {
+                'uptime_s': time.time() - self.started,
+                'requests': self.requests,
+                'errors': self.errors,
+                'rejected': self.rejected,
+                'queue_depth': queue_depth,
+                'throughput_rps': len(recent) / self.rate_window,
+                'latency_ms': self._percentiles(self.latencies),
+                'queue_wait_ms': self._percentiles(self.queue_waits),
+                'batches': self.batches,
+                'mean_batch_size': self.batched_items / self.batches if self.batches else 0.0,
+                'batch_size_histogram': {str(k): v for k, v in sorted(self.batch_sizes.items())},
+                'mean_batch_inference_ms': 1000.0 * self.inference_seconds / self.batches if self.batches else 0.0,
+            }
+
+
+class RecognitionService:
+    """Runs a batch of requests through detector -> OCR -> text assembly -> filter"""
+
+    def __init__(self, models, conf=0.25, image_size=640, min_detection_length=3,
+                 filter_settings=None, license_patterns=LICENSE_PATTERNS, char_map=CHAR_MAP):
+        self.models = models
+        self.conf = conf
+        self.image_size = image_size
+        self.min_detection_length = min_detection_length
+        self.filter_settings = filter_settings or dict(DEFAULT_FILTER_SETTINGS)
+        self.license_patterns = license_patterns
+        self.char_map = char_map
+
+    def process_batch(self, requests):
+        """Fill in request.result for every request in the batch"""
+        # One detector call for every full frame in the batch
+        frame_requests = [r for r in requests if r.mode == 'image']
+        boxes_per_frame = []
+        if frame_requests:
+            boxes_per_frame = detect_plate_boxes(self.models.detector, [r.image for r in frame_requests],
+                                                 self.conf, self.image_size)
+
+        # One OCR call for every plate crop in the batch (detected or submitted directly)
+        crops, owners = [], []
+        for request, boxes in zip(frame_requests, boxes_per_frame):
+            request.result = []
+            for x1, y1, x2, y2 in boxes:
+                crop = request.image[y1:y2, x1:x2]
+                if crop.size > 0:
+                    crops.append(crop)
+                    owners.append((request, [x1, y1, x2, y2]))
+        for request in requests:
+            if request.mode == 'crop':
+                request.result = []
+                height, width = request.image.shape[:2]
+                crops.append(request.image)
+                owners.append((request, [0, 0, width, height]))
+
+        reads = recognize_crops(self.models.recognizer, crops, self.conf, self.image_size,
+                                self.min_detection_length, self.char_map)
+        for (request, box), (text, confidence, _) in zip(owners, reads):
+            if not text:
+                continue
+            request.result.append({
+                'plate': text,
+                'confidence': round(confidence, 4),
+                'box': box,
+                'valid': validate_plate(text, self.filter_settings, self.license_patterns),
+            })
+
+
+class DynamicBatcher:
+    """Coalesces queued requests into batches; one worker thread per model pair"""
+
+    def __init__(self, services, metrics, max_batch=8, max_wait_ms=10.0, queue_size=256):
+        self.services = services
+        self.metrics = metrics
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.running = True
+        self.threads = []
+        for i, service in enumerate(services):
+            thread = threading.Thread(target=self._run, args=(service,), name=f"batcher-{i}")
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, request):
+        """Queue a request; raises queue.Full when the server is saturated"""
+        self.queue.put_nowait(request)
+        return request
+
+    def _collect(self):
+        """Block for the first request, then wait up to max_wait for the batch to fill"""
+        try:
+            first = self.queue.get(timeout=0.5)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = first.enqueued + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self, service):
+        while self.running:
+            batch = self._collect()
+            if not batch:
+                continue
+            start = time.perf_counter()
+            try:
+                service.process_batch(batch)
+            except Exception as e:
+                for request in batch:
+                    request.error = str(e)
+            finished = time.perf_counter()
+            self.metrics.record_batch(len(batch), finished - start, [start - r.enqueued for r in batch])
+            for request in batch:
+                request.done.set()
+
+    def stop(self):
+        self.running = False
+        for thread in self.threads:
+            thread.join(timeout=2.0)
+
+
+class RecognitionHandler(BaseHTTPRequestHandler):
+    """HTTP front end; each connection thread blocks until its batch completes"""
+
+    server_version = "PlateRecognition/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif path == '/metrics':
+            self._send_json(200, self.server.metrics.snapshot(self.server.batcher.queue.qsize()))
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        parsed = urlparse(self.path)
+        if parsed.path != '/recognize':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        mode = parse_qs(parsed.query).get('mode', ['image'])[0]
+        if mode not in ('image', 'crop'):
+            self._send_json(400, {'error': "mode must be 'image' or 'crop'"})
+            return
+
+        header = self.headers.get('Content-Length')
+        if header is None:
+            self._send_json(411, {'error': 'Content-Length required'})
+            return
+        try:
+            length = int(header)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_json(400, {'error': 'invalid Content-Length'})
+            return
+        if length > self.server.max_body_bytes:
+            self._send_json(413, {'error': f'body larger than {self.server.max_body_bytes} bytes'})
+            return
+        data = self.rfile.read(length) if length else b''
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR) if data else None
+        if image is None:
+            self._send_json(400, {'error': 'body must be an encoded image'})
+            return
+
+        try:
+            request = self.server.batcher.submit(RecognitionRequest(image, mode))
+        except queue.Full:
+            self.server.metrics.record_rejected()
+            self._send_json(503, {'error': 'server busy'})
+            return
+
+        if not request.done.wait(self.server.request_timeout):
+            self.server.metrics.record_request(time.perf_counter() - start, ok=False)
+            self._send_json(504, {'error': 'timed out'})
+            return
+
+        latency = time.perf_counter() - start
+        self.server.metrics.record_request(latency, ok=request.error is None)
+        if request.error:
+            self._send_json(500, {'error': request.error})
+        else:
+            self._send_json(200, {'plates': request.result, 'latency_ms': round(1000.0 * latency, 2)})
+
+
+def create_server(services, host='127.0.0.1', port=8080, max_batch=8, max_wait_ms=10.0,
+                  queue_size=256, request_timeout=30.0, max_body_bytes=32 * 1024 * 1024, verbose=False):
+    """Build the HTTP server and its batcher (call serve_forever() to run)"""
+    metrics = ServerMetrics()
+    server = ThreadingHTTPServer((host, port), RecognitionHandler)
+    server.daemon_threads = True
+    server.metrics = metrics
+    server.batcher = DynamicBatcher(services, metrics, max_batch, max_wait_ms, queue_size)
+    server.request_timeout = request_timeout
+    server.max_body_bytes = max_body_bytes
+    server.verbose = verbose
+    return server
+
+
+def main():
+    from model_manager import load_model_pair, warmup_model_pair
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Local license plate recognition server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--model-size', default='s', choices=['n', 's', 'm'])
+    parser.add_argument('--backend', default='pt', help="pt, onnx, engine, openvino")
+    parser.add_argument('--device', default=None, help="cpu, cuda (default: auto)")
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--conf', type=float, default=0.25)
+    parser.add_argument('--max-batch', type=int, default=8)
+    parser.add_argument('--max-wait-ms', type=float, default=10.0)
+    parser.add_argument('--queue-size', type=int, default=256)
+    parser.add_argument('--max-body-mb', type=float, default=32.0, help="largest accepted request body")
+    parser.add_argument('--pattern', default='standard', choices=list(LICENSE_PATTERNS))
+    parser.add_argument('--custom-pattern', default='')
+    parser.add_argument('--allow-multiple-patterns', action='store_true')
+    parser.add_argument('--no-filter', action='store_true')
+    parser.add_argument('--verbose', action='store_true')
+    add_thread_arguments(parser)
+    args = parser.parse_args()
+
+    settings = settings_from_args(args, base_dir)
+    apply_thread_settings(settings)
+
+    filter_settings = {
+        'enabled': not args.no_filter,
+        'pattern_type': args.pattern,
+        'custom_pattern': args.custom_pattern,
+        'allow_multiple_patterns': args.allow_multiple_patterns,
+    }
+
+    # One model pair per inference worker; each is only used by its own batcher thread
+    services = []
+    for i in range(max(1, settings['inference_workers'])):
+        print(f"Loading model pair {i + 1} (Size: {args.model_size.upper()})...")
+        models = load_model_pair(base_dir, args.model_size, args.backend, args.device)
+        warmup_model_pair(models, args.imgsz, conf=args.conf)
+        services.append(RecognitionService(models, conf=args.conf, image_size=args.imgsz,
+                                           filter_settings=filter_settings))
+
+    server = create_server(services, args.host, args.port, args.max_batch, args.max_wait_ms,
+                           args.queue_size, max_body_bytes=int(args.max_body_mb * 1024 * 1024),
+                           verbose=args.verbose)
+    print(f"🚀 Serving on http://{args.host}:{args.port} "
+          f"({len(services)} worker(s), max batch {args.max_batch}, max wait {args.max_wait_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.batcher.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Virtualized saved-detections list
+A ttk.Treeview that only ever holds the visible page of a DetectionStore query. The scrollbar is
+driven by the query size instead of the widget's rows, and the page is re-rendered at most once
+per refresh tick, however many detections were saved in between.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from detection_store import parse_time_bound
+
+
+class DetectionListView:
+    """Paged view of a DetectionStore with plate text and time range filters"""
+
+    def __init__(self, parent, store, rows=8, refresh_ms=250):
+        self.store = store
+        self.rows = rows
+        self.refresh_ms = refresh_ms
+        self.offset = 0
+        self.follow = True  # stay on the newest rows until the user scrolls up
+        self.result = []
+        self.query = ('', None, None)
+        self.query_state = None
+        self.rendered = None
+
+        self.frame = ttk.Frame(parent)
+
+        filter_frame = ttk.Frame(self.frame)
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(filter_frame, text="Search:").grid(row=0, column=0, sticky=tk.W)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', lambda *args: self.apply_filters())
+        ttk.Entry(filter_frame, textvariable=self.search_var, width=14).grid(row=0, column=1, columnspan=3,
+                                                                             sticky=tk.W + tk.E, padx=(5, 0))
+        ttk.Label(filter_frame, text="From:").grid(row=1, column=0, sticky=tk.W, pady=(2, 0))
+        self.start_var = tk.StringVar()
+        start_entry = ttk.Entry(filter_frame, textvariable=self.start_var, width=10)
+        start_entry.grid(row=1, column=1, padx=(5, 0), pady=(2, 0))
+        ttk.Label(filter_frame, text="To:").grid(row=1, column=2, sticky=tk.W, padx=(5, 0), pady=(2, 0))
+        self.end_var = tk.StringVar()
+        end_entry = ttk.Entry(filter_frame, textvariable=self.end_var, width=10)
+        end_entry.grid(row=1, column=3, padx=(5, 0), pady=(2, 0))
+        for entry in (start_entry, end_entry):
+            entry.bind('<Return>', lambda event: self.apply_filters())
+            entry.bind('<FocusOut>', lambda event: self.apply_filters())
+
+        list_frame = ttk.Frame(self.frame)
+        list_frame.pack(fill=tk.X)
+        self.tree = ttk.Treeview(list_frame, columns=('time', 'plate'), show='headings',
+                                 height=rows, selectmode='extended')
+        self.tree.heading('time', text="Time")
+        self.tree.heading('plate', text="Plate")
+        self.tree.column('time', width=125, stretch=False)
+        self.tree.column('plate', width=140)
+        self.scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.on_scroll)
+        self.tree.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self.on_wheel)
+
+        self.count_label = ttk.Label(self.frame, text="", font=('Arial', 8))
+        self.count_label.pack(anchor=tk.W)
+
+        self.frame.after(self.refresh_ms, self.tick)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    # ---------------------------------------------------------------- filters
+    def apply_filters(self):
+        try:
+            start = parse_time_bound(self.start_var.get())
+            end = parse_time_bound(self.end_var.get(), end=True)
+        except ValueError as e:
+            self.count_label.config(text=str(e))
+            return
+        query = (self.search_var.get().strip(), start, end)
+        if query != self.query:
+            self.query = query
+            self.follow = True
+            self.refresh()
+
+    # -------------------------------------------------------------- scrolling
+    def on_scroll(self, action, amount, unit=None):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')"""
+        total = len(self.result)
+        if action == 'moveto':
+            self.offset = int(float(amount) * total)
+        elif action == 'scroll':
+            step = self.rows if unit == 'pages' else 1
+            self.offset += int(amount) * step
+        self.offset = max(0, min(self.offset, total - self.rows))
+        self.follow = self.offset >= total - self.rows
+        self.refresh()
+
+    def on_wheel(self, event):
+        if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0:
+            self.on_scroll('scroll', -1, 'units')
+        else:
+            self.on_scroll('scroll', 1, 'units')
+        return 'break'  # keep the surrounding panel from scrolling too
+
+    # -------------------------------------------------------------- rendering
+    def tick(self):
+        self.refresh()
+        self.frame.after(self.refresh_ms, self.tick)
+
+    def refresh(self):
+        """Re-run the query if the store changed and re-render the visible page if it changed"""
+        state = (self.store.version, self.query)
+        if state != self.query_state:
+            self.result = self.store.query(*self.query)
+            self.query_state = state
+        total = len(self.result)
+        if self.follow:
+            self.offset = max(0, total - self.rows)
+        self.offset = max(0, min(self.offset, total - self.rows))
+        page = self.result[self.offset:self.offset + self.rows]
+
+        if (page, self.store.version) == self.rendered:
+            return
+        selected = set(self.tree.selection())
+        self.tree.delete(*self.tree.get_children())
+        for record_id in page:
+            record = self.store.get(record_id)
+            if record is not None:
+                self.tree.insert('', tk.END, iid=str(record_id), values=(record.time_text(), record.plate))
+        keep = [iid for iid in selected if self.tree.exists(iid)]
+        if keep:
+            self.tree.selection_set(keep)
+        self.rendered = (page, self.store.version)
+
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + len(page)) / total)
+            self.count_label.config(text=f"{self.offset + 1}-{self.offset + len(page)} of {total} "
+                                         f"(store: {len(self.store)})")
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            self.count_label.config(text=f"0 shown (store: {len(self.store)})")
+
+    def selected_ids(self):
+        return [int(iid) for iid in self.tree.selection()]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for the two-pass archive scan helpers
+"""
+
+from archive_scan import (WindowedCaptureSource, sample_positions, hit_windows, window_frames,
+                          eta_seconds, format_duration, sparse_scan, CAP_PROP_POS_FRAMES)
+
+
+class FakeCapture:
+    """cv2.VideoCapture stand-in that returns the frame index as the frame"""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.position = 0
+        self.decoded = []
+        self.seeks = []
+
+    def grab(self):
+        if self.position >= self.frames:
+            return False
+        self.position += 1
+        return True
+
+    def read(self):
+        if self.position >= self.frames:
+            return False, None
+        self.decoded.append(self.position)
+        self.position += 1
+        return True, self.position - 1
+
+    def set(self, prop, value):
+        assert prop == CAP_PROP_POS_FRAMES
+        self.seeks.append(value)
+        self.position = value
+        return True
+
+    def release(self):
+        pass
+
+
+class FakeBoxes(list):
+    @property
+    def xyxy(self):
+        return self
+
+    def tolist(self):
+        return list(self)
+
+
+class FakeDetector:
+    """Finds a plate in the frames listed in `plates` (frames are their own indices)"""
+
+    def __init__(self, plates):
+        self.plates = set(plates)
+
+    def __call__(self, frames, **kwargs):
+        return [type('Result', (), {'boxes': FakeBoxes([[1, 2, 3, 4]] if frame in self.plates else [])})()
+                for frame in frames]
+
+
+def test_sampling_and_windows():
+    print("🧪 Testing archive scan sampling and hit windows...")
+    assert sample_positions(100, 30, 2) == [0, 15, 30, 45, 60, 75, 90]
+    assert sample_positions(5, 0, 2) == [0, 1, 2, 3, 4]
+    # Hits 15 and 30 overlap once widened; 90 stands alone and is clipped to the video
+    windows = hit_windows([90, 15, 30], fps=10, frame_count=100, before=1.0, after=2.0)
+    assert windows == [(5, 51), (80, 100)], windows
+    assert window_frames(windows) == 66
+    assert eta_seconds(0, 10, 5.0) is None
+    assert eta_seconds(5, 10, 5.0) == 5.0
+    assert format_duration(None) == "--:--"
+    assert format_duration(3725) == "1:02:05"
+    print("✅ Sampling and windows passed")
+
+
+def test_windowed_source():
+    print("🧪 Testing windowed capture source...")
+    cap = FakeCapture(40)
+    source = WindowedCaptureSource('archive', cap, [(5, 8), (20, 26)], frame_skip=2, max_grab=100)
+    frames = []
+    while True:
+        item = source.read()
+        if item is None:
+            break
+        frames.append(item.frame)
+        # frame_number counts frames from the start of the video, like CaptureSource
+        assert item.frame_number == item.frame + 1
+    assert frames == [5, 7, 20, 22, 24], frames
+    assert cap.decoded == frames  # frames outside the windows are only grabbed
+    progress = source.progress()
+    assert (progress.done, progress.total) == (9, 9), progress
+    print("✅ Windowed source passed")
+
+
+def test_dense_pass_after_sparse_pass():
+    print("🧪 Testing pass 2 on the capture pass 1 left near the end...")
+    cap = FakeCapture(100)
+    positions = sample_positions(100, fps=10, sample_fps=2)
+    hits = sparse_scan(cap, FakeDetector([50]), positions, conf=0.25, image_size=640, batch_size=4)
+    assert hits == [50], hits
+    assert cap.position == 96  # wherever pass 1 stopped, not the start of the video
+    windows = hit_windows(hits, fps=10, frame_count=100, before=0.5, after=0.5)
+    assert windows == [(45, 56)], windows
+
+    source = WindowedCaptureSource('archive', cap, windows, frame_skip=1)
+    items = []
+    while True:
+        item = source.read()
+        if item is None:
+            break
+        items.append(item)
+    assert [item.frame for item in items] == list(range(45, 56))
+    assert [item.frame_number for item in items] == list(range(46, 57))
+    assert cap.seeks[-1] == 45
+    print("✅ Dense pass after sparse pass passed")
+
+
+if __name__ == "__main__":
+    test_sampling_and_windows()
+    test_windowed_source()
+    test_dense_pass_after_sparse_pass()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for CPU threading settings and host profiles
+"""
+
+import argparse
+import json
+import os
+import socket
+import tempfile
+
+from cpu_tuning import (DEFAULT_THREAD_SETTINGS, PROFILE_FILE, add_thread_arguments, apply_process_settings,
+                        candidate_settings, format_affinity, load_host_profile, parse_affinity, save_host_profile,
+                        settings_from_args)
+
+
+def expect_error(error, call, *args):
+    try:
+        call(*args)
+    except error:
+        return
+    raise AssertionError(f"{call.__name__}{args} did not raise {error.__name__}")
+
+
+def test_parse_affinity():
+    print("🧪 Testing CPU affinity parsing...")
+    assert parse_affinity('') == set() and parse_affinity(None) == set()
+    assert parse_affinity('0-3,6') == {0, 1, 2, 3, 6}
+    assert parse_affinity(' 2 , 2-3,') == {2, 3}
+    expect_error(ValueError, parse_affinity, 'all')
+    expect_error(ValueError, parse_affinity, '3-0')
+    expect_error(ValueError, parse_affinity, '1-')
+    assert format_affinity({6, 0, 1, 2, 3}) == '0-3,6' and format_affinity([]) == ''
+    assert parse_affinity(format_affinity({1, 3, 4, 5, 9})) == {1, 3, 4, 5, 9}
+    # Bad specs fail before anything is applied (the GUI and CLI report this)
+    expect_error(ValueError, apply_process_settings, {'cpu_affinity': 'x'})
+    print("✅ CPU affinity parsing passed")
+
+
+def test_candidate_settings():
+    print("🧪 Testing auto-tune candidates...")
+    single = candidate_settings(cpu_count=1)
+    assert [(c['inference_workers'], c['torch_intra_threads'], c['torch_inter_threads']) for c in single] == \
+        [(1, 1, 1), (1, 1, 2)]
+    candidates = candidate_settings(cpu_count=8)
+    keys = [(c['inference_workers'], c['torch_intra_threads'], c['torch_inter_threads']) for c in candidates]
+    assert len(keys) == len(set(keys)) == 12
+    assert {c['inference_workers'] for c in candidates} == {1, 2, 4}
+    for c in candidates:
+        # Workers never oversubscribe the cores, and OpenCV only gets spare cores with one worker
+        assert c['inference_workers'] * c['torch_intra_threads'] <= 8
+        assert c['cv2_threads'] == (8 if c['inference_workers'] == 1 else 1)
+        assert set(c) == set(DEFAULT_THREAD_SETTINGS)
+    assert max(c['inference_workers'] for c in candidate_settings(cpu_count=3)) == 2
+
+    # Affinity layouts: all cores, plus the cores a worker count fills evenly when some would idle
+    even = candidate_settings(available_cores=range(8))
+    assert {c['cpu_affinity'] for c in even} == {''}
+    uneven = candidate_settings(available_cores=[0, 1, 2, 4, 5, 6])
+    layouts = {(c['inference_workers'], c['cpu_affinity']) for c in uneven}
+    assert layouts == {(1, ''), (2, ''), (4, ''), (4, '0-2,4')}, layouts
+    assert len(uneven) == len(candidate_settings(cpu_count=6)) + 2
+    print("✅ Auto-tune candidates passed")
+
+
+def test_profile_and_cli_precedence():
+    print("🧪 Testing profile and CLI precedence...")
+    parser = argparse.ArgumentParser()
+    add_thread_arguments(parser)
+    with tempfile.TemporaryDirectory() as tmp:
+        assert load_host_profile(tmp) is None
+        assert settings_from_args(parser.parse_args([]), tmp) == DEFAULT_THREAD_SETTINGS
+
+        tuned = dict(DEFAULT_THREAD_SETTINGS, torch_intra_threads=4, inference_workers=2)
+        save_host_profile(tmp, tuned, {'images_per_sec': 12.5})
+        with open(os.path.join(tmp, PROFILE_FILE)) as f:
+            profiles = json.load(f)
+        assert profiles[socket.gethostname()]['benchmark'] == {'images_per_sec': 12.5}
+
+        # Saved profile over defaults, explicit options over the profile
+        settings = settings_from_args(parser.parse_args(['--inference-workers', '3', '--cpu-affinity', '0-1']), tmp)
+        assert (settings['torch_intra_threads'], settings['inference_workers'], settings['cpu_affinity']) == \
+            (4, 3, '0-1')
+        ignored = settings_from_args(parser.parse_args(['--no-tuned-profile']), tmp)
+        assert ignored == DEFAULT_THREAD_SETTINGS
+
+        with open(os.path.join(tmp, PROFILE_FILE), 'w') as f:
+            f.write("{not json")
+        assert load_host_profile(tmp) is None
+    print("✅ Profile and CLI precedence passed")
+
+
+if __name__ == "__main__":
+    test_parse_affinity()
+    test_candidate_settings()
+    test_profile_and_cli_precedence()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for the saved-detection store and its indexes
+"""
+
+from datetime import datetime
+
+from detection_store import DetectionStore, parse_time_bound
+from plate_pipeline import DetectionRecord
+
+DHAKA_12 = [49, 10, 1, 2]       # DhakaMetro 12
+CHATTO_13 = [44, 1, 3]          # Chatto 13
+
+
+def make_store(count=1000, start=1_700_000_000.0):
+    store = DetectionStore()
+    for i in range(count):
+        ids = DHAKA_12 if i % 10 else CHATTO_13
+        store.add(DetectionRecord(ids, start + i))
+    return store
+
+
+def test_query_by_text_and_time():
+    store = make_store()
+    assert len(store) == 1000
+    assert len(store.query()) == 1000
+    chatto = store.query("chatto 13")
+    assert len(chatto) == 100
+    assert [store.get(i).timestamp for i in chatto] == sorted(store.get(i).timestamp for i in chatto)
+
+    start = 1_700_000_000.0
+    window = store.query(start=start + 100, end=start + 199)
+    assert len(window) == 100
+    assert len(store.query("Chatto", start=start + 100, end=start + 199)) == 10
+    assert store.query("Sylhet") == []
+    assert store.has_plate("DhakaMetro 12") and not store.has_plate("Sylhet 1")
+
+
+def test_remove_clear_and_out_of_order_add():
+    store = make_store(20)
+    version = store.version
+    ids = store.query("chatto")
+    store.remove(ids)
+    assert store.version > version
+    assert len(store) == 18 and not store.has_plate("Chatto 13")
+
+    late = store.add(DetectionRecord(CHATTO_13, 1_700_000_005.5))
+    assert store.query()[5] == late  # inserted in time order (after t+1..t+5)
+    assert [r.plate for r in store.all_records()].count("Chatto 13") == 1
+
+    store.clear()
+    assert len(store) == 0 and store.query() == []
+
+
+def test_parse_time_bound():
+    now = datetime(2025, 1, 15, 9, 0)
+    assert parse_time_bound("", now) is None
+    assert parse_time_bound("14:30", now) == datetime(2025, 1, 15, 14, 30).timestamp()
+    day_end = parse_time_bound("2025-01-15", now, end=True)
+    assert datetime(2025, 1, 15, 23, 59, 59).timestamp() < day_end < datetime(2025, 1, 16).timestamp()
+    try:
+        parse_time_bound("yesterday", now)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("invalid time must raise")
+
+
+if __name__ == "__main__":
+    test_query_by_text_and_time()
+    test_remove_clear_and_out_of_order_add()
+    test_parse_time_bound()
+    print("✅ Detection store tests passed")
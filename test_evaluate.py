@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script for the evaluation harness scoring helpers
+"""
+
+import os
+import tempfile
+
+from evaluate import edit_distance, filter_settings_for, label_plate_text, load_csv_samples, score
+
+
+def test_label_plate_text_orders_characters():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'plate.txt')
+        with open(path, 'w') as f:
+            # Dhaka(49) Metro(10) then 1 2, listed out of order
+            f.write("2 0.9 0.5 0.05 0.2\n10 0.4 0.5 0.1 0.2\n1 0.8 0.5 0.05 0.2\n49 0.1 0.5 0.2 0.2\n")
+        assert label_plate_text(path) == "DhakaMetro 12"
+
+
+def test_score_exact_match_and_cer():
+    outcomes = [
+        {'truth': "DhakaMetro 12", 'prediction': "dhakametro  12", 'filtered': False},
+        {'truth': "Chatto 13", 'prediction': "Chatto 18", 'filtered': False},
+        {'truth': "Chatto 13", 'prediction': "", 'filtered': True},
+    ]
+    result = score(outcomes)
+    assert result['samples'] == 3
+    assert abs(result['exact_match'] - 1 / 3) < 1e-9
+    assert abs(result['cer'] - (1 + 9) / (13 + 9 + 9)) < 1e-9
+    assert result['filtered_out'] == 1
+    assert edit_distance("kitten", "sitting") == 3
+
+
+def test_csv_samples_and_filter_settings():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'truth.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("image,plate\ncar1.jpg,DhakaMetro 115636\ncar2.jpg, Chatto 13 \n")
+        samples = load_csv_samples(path)
+        assert samples == [(os.path.join(tmp, 'car1.jpg'), "DhakaMetro 115636"),
+                           (os.path.join(tmp, 'car2.jpg'), "Chatto 13")]
+    assert not filter_settings_for('none')['enabled']
+    assert filter_settings_for('all')['allow_multiple_patterns']
+    assert filter_settings_for('metro_basic')['pattern_type'] == 'metro_basic'
+
+
+if __name__ == "__main__":
+    test_label_plate_text_orders_characters()
+    test_score_exact_match_and_cer()
+    test_csv_samples_and_filter_settings()
+    print("✅ Evaluation tests passed")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the evidence snapshot writer
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+
+try:
+    import numpy as np
+    from evidence_writer import EvidenceWriter, safe_filename
+except ImportError:  # evidence_writer encodes with cv2
+    raise unittest.SkipTest("cv2/numpy are not installed")
+
+
+def noise(height, width, seed):
+    return np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def test_paths_and_empty_crops():
+    print("🧪 Testing evidence paths...")
+    assert safe_filename("Dhaka Metro-Ga 12") == "Dhaka_Metro_Ga_12"
+    assert safe_filename("???") == "plate"
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = EvidenceWriter(tmp, max_bytes=0)
+        when = datetime(2025, 1, 15, 14, 30, 25)
+        crop_path, context_path = writer.submit("DhakaMetro Ga 12", noise(20, 60, 1), noise(720, 1280, 2), when)
+        assert crop_path == os.path.join(tmp, "2025", "01", "15", "143025_000000_DhakaMetro_Ga_12_crop.jpg")
+        assert context_path.endswith("_context.jpg")
+
+        # A crop cut from outside the frame is empty: no file, so no path in the saved record
+        empty_crop, context_only = writer.submit("Chatto 13", noise(0, 0, 3), noise(100, 100, 4), when)
+        assert empty_crop is None and context_only is not None
+        assert writer.submit("Chatto 13", None, None, when) == (None, None)
+        writer.close()
+
+        for path in (crop_path, context_path, context_only):
+            assert os.path.getsize(path) > 0, path
+        assert writer.stats()['saved'] == 2 and writer.stats()['errors'] == 0
+    print("✅ Evidence paths passed")
+
+
+def test_budget_eviction_and_backpressure():
+    print("🧪 Testing disk budget and pending limit...")
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = EvidenceWriter(tmp, max_bytes=20 * 1024)
+        paths = []
+        for i in range(10):
+            crop, _ = writer.submit(f"DhakaMetro {i}", noise(64, 64, i), None, datetime(2025, 1, 15, 14, 30, i))
+            paths.append(crop)
+        writer.close()
+        stats = writer.stats()
+        assert stats['evicted'] > 0 and stats['disk_mb'] * 1024 * 1024 <= 20 * 1024, stats
+        remaining = [path for path in paths if os.path.exists(path)]
+        assert remaining == paths[-len(remaining):]  # oldest go first
+
+        gate = threading.Event()
+        busy = EvidenceWriter(tmp, max_workers=1, max_pending=2)
+        busy.executor.submit(gate.wait)  # keep the pool busy
+        assert busy.submit("A 1", noise(8, 8, 0), None)[0] is not None
+        assert busy.submit("A 2", noise(8, 8, 0), None)[0] is not None
+        assert busy.submit("A 3", noise(8, 8, 0), None) == (None, None)
+        gate.set()
+        busy.close()
+        assert busy.stats()['dropped'] == 1 and busy.stats()['saved'] == 2
+    print("✅ Disk budget and pending limit passed")
+
+
+if __name__ == "__main__":
+    test_paths_and_empty_crops()
+    test_budget_eviction_and_backpressure()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared-memory frame transport (no inference processes are started)
+"""
+
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # frame_transport needs numpy, which comes with the GUI requirements
+    raise unittest.SkipTest("numpy is not installed")
+
+from frame_transport import FrameRing, ResultDescriptor, SharedMemoryInference
+
+
+def make_transport(slots=2, max_shape=(4, 6, 3)):
+    return SharedMemoryInference('.', workers=1, slots=slots, max_shape=max_shape)
+
+
+class FakeProcess:
+    def __init__(self, name, exitcode=None):
+        self.name = name
+        self.exitcode = exitcode
+        self.pid = None
+
+
+def test_ring_write_and_view():
+    print("🧪 Testing frame ring slots...")
+    ring = FrameRing(3, (4, 6, 3))
+    try:
+        frame = np.arange(2 * 5 * 3, dtype=np.uint8).reshape(2, 5, 3)
+        assert ring.write(1, frame) == (2, 5, 3)
+        assert np.array_equal(ring.view(1, (2, 5, 3)), frame)
+        # A second handle on the same block (as a worker has) sees the same pixels
+        other = FrameRing(3, (4, 6, 3), name=ring.name)
+        assert np.array_equal(other.view(1, (2, 5, 3)), frame)
+        other.shm.close()
+        try:
+            ring.write(0, np.zeros((5, 6, 3), dtype=np.uint8))
+            raise AssertionError("oversized frame was accepted")
+        except ValueError:
+            pass
+    finally:
+        ring.close()
+    print("✅ Frame ring passed")
+
+
+def test_oversized_frame_and_slot_release():
+    print("🧪 Testing oversized frames and slot release...")
+    transport = make_transport(slots=2)
+    try:
+        assert transport.submit('cam', 1, np.zeros((9, 9, 3), dtype=np.uint8), 10.0)
+        result = transport.get_result(timeout=5)
+        # Comes back as an error result so later sequence numbers are not held up
+        assert result.sequence == 0 and result.shape is None and "does not fit" in result.error
+        assert transport.frame(result) is None
+        transport.release(result)
+
+        frame = np.full((4, 6, 3), 7, dtype=np.uint8)
+        assert transport.submit('cam', 2, frame, 11.0)
+        assert transport.submit('cam', 3, frame, 12.0)
+        assert not transport.submit('cam', 4, frame, 13.0, block=False)  # every slot in flight
+        assert transport.submit('cam', 5, frame, 14.0, timeout=0.05) is False
+        task = transport.tasks.get(timeout=5)
+        transport.release(task)
+        assert transport.submit('cam', 6, frame, 15.0, block=False)
+        stats = transport.stats()
+        assert (stats['submitted'], stats['dropped'], stats['in_flight']) == (4, 2, 2), stats
+    finally:
+        transport.stop()
+    print("✅ Oversized frames and slot release passed")
+
+
+def test_results_in_submission_order():
+    print("🧪 Testing result reordering...")
+    transport = make_transport(slots=4)
+    try:
+        frames = [np.full((4, 6, 3), i, dtype=np.uint8) for i in range(3)]
+        for i, frame in enumerate(frames):
+            transport.submit('cam', i + 1, frame, 100.0 + i)
+        tasks = [transport.tasks.get(timeout=5) for _ in frames]
+        # Workers finish out of order
+        for task in reversed(tasks):
+            transport.results.put(ResultDescriptor(task.sequence, task.slot, task.source, task.frame_number,
+                                                   task.timestamp, task.shape, [], None))
+        numbers = []
+        while transport.pending():
+            result = transport.get_result(timeout=5)
+            assert transport.frame(result)[0, 0, 0] == result.frame_number - 1
+            numbers.append(result.frame_number)
+            transport.release(result)
+        assert numbers == [1, 2, 3], numbers
+        assert transport.get_result(timeout=0.05) is None
+    finally:
+        transport.stop()
+    print("✅ Result reordering passed")
+
+
+def test_dead_worker_fails_instead_of_hanging():
+    print("🧪 Testing dead inference processes...")
+    transport = make_transport(slots=2)
+    try:
+        frame = np.zeros((4, 6, 3), dtype=np.uint8)
+        transport.submit('cam', 1, frame, 1.0)
+        transport.processes = [FakeProcess('inference-0', exitcode=-9)]
+        try:
+            transport.get_result(timeout=5)
+            raise AssertionError("waited for a frame from a dead worker")
+        except RuntimeError as e:
+            assert "inference-0 exited with code -9" in str(e)
+        assert not transport.submit('cam', 2, frame, 2.0)
+        assert transport.failed
+    finally:
+        transport.stop()
+    print("✅ Dead inference processes passed")
+
+
+if __name__ == "__main__":
+    test_ring_write_and_view()
+    test_oversized_frame_and_slot_release()
+    test_results_in_submission_order()
+    test_dead_worker_fails_instead_of_hanging()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for hard-example mining
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+    from hard_example_miner import HardExampleMiner, yolo_label_lines
+except ImportError:  # the miner encodes crops with cv2
+    raise unittest.SkipTest("cv2/numpy are not installed")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def crop(value):
+    """A crop whose (injected) hash is its fill value repeated in every byte"""
+    return np.full((20, 60, 3), value, dtype=np.uint8)
+
+
+def fill_hash(image):
+    """Distinct fill values give hashes at least 8 bits apart"""
+    return int(image[0, 0, 0]) * 0x0101010101010101
+
+
+def make_miner(tmp, clock, **kwargs):
+    return HardExampleMiner(tmp, clock=clock, hash_crop=fill_hash, **kwargs)
+
+
+def test_yolo_labels():
+    print("🧪 Testing YOLO pre-labels...")
+    chars = [(15, 49, 0.9, (10, 0, 20, 10)), (45, 1, 0.8, (40, 5, 50, 15))]
+    assert yolo_label_lines(chars, 100, 20) == ["49 0.150000 0.250000 0.100000 0.500000",
+                                                "1 0.450000 0.500000 0.100000 0.500000"]
+    print("✅ YOLO pre-labels passed")
+
+
+def test_token_bucket():
+    print("🧪 Testing the sampling rate limit...")
+    clock = FakeClock()
+    with tempfile.TemporaryDirectory() as tmp:
+        miner = make_miner(tmp, clock, rate_per_minute=6)
+        accepted = [miner.submit(crop(i), [], 'unstable') for i in range(8)]
+        assert accepted == [True] * 6 + [False] * 2  # burst of up to rate_per_minute
+        clock.now += 10.0  # refills one sample per 10 s
+        assert miner.submit(crop(10), [], 'unstable')
+        assert not miner.submit(crop(11), [], 'unstable')
+        clock.now += 3600.0  # an idle hour does not bank more than one burst
+        assert sum(miner.submit(crop(20 + i), [], 'unstable') for i in range(10)) == 6
+        miner.close()
+        stats = miner.stats()
+    assert (stats['saved'], stats['rate_limited']) == (13, 7), stats
+    print("✅ Rate limit passed")
+
+
+def test_duplicates_and_queue_limit():
+    print("🧪 Testing duplicate suppression and the queue limit...")
+    clock = FakeClock()
+    with tempfile.TemporaryDirectory() as tmp:
+        miner = make_miner(tmp, clock, max_items=3, max_distance=4)
+        assert miner.submit(crop(1), [], 'invalid', text="first")
+        assert not miner.submit(crop(1), [], 'invalid')  # same hash
+        miner.hash_crop = lambda image: fill_hash(image) ^ 0b111  # 3 bits away: still the same plate
+        assert not miner.submit(crop(1), [], 'invalid')
+        miner.hash_crop = fill_hash
+        for i in range(2, 6):
+            assert miner.submit(crop(i), [(30, 5, 0.5, (0, 0, 10, 20))], 'invalid', text=f"read {i}")
+        miner.close()
+        stats = miner.stats()
+        assert (stats['saved'], stats['duplicates'], stats['queued'], stats['evicted']) == (5, 2, 3, 2), stats
+
+        # Only the newest samples are left, each with its image, labels and metadata
+        texts = []
+        for name in sorted(os.listdir(os.path.join(tmp, 'meta'))):
+            with open(os.path.join(tmp, 'meta', name), encoding='utf-8') as f:
+                texts.append(json.load(f)['text'])
+        assert texts == ["read 3", "read 4", "read 5"], texts
+        for folder in ('images', 'labels'):
+            assert len(os.listdir(os.path.join(tmp, folder))) == 3
+
+        # A restarted miner picks up the queue and keeps enforcing the limit
+        reopened = make_miner(tmp, clock, max_items=2)
+        reopened.close()
+        assert reopened.stats()['queued'] == 2 and len(os.listdir(os.path.join(tmp, 'images'))) == 2
+    print("✅ Duplicates and queue limit passed")
+
+
+if __name__ == "__main__":
+    test_yolo_labels()
+    test_token_bucket()
+    test_duplicates_and_queue_limit()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the perceptual-hash OCR cache
+"""
+
+import unittest
+
+from ocr_cache import OCRCache, dhash, hamming
+
+READ_A = ("DhakaMetroGa 123456", 0.91, [])
+READ_B = ("ChattoMetroKa 112233", 0.88, [])
+
+
+def keyed_cache(**kwargs):
+    """Cache whose 'crops' are precomputed (size bucket, hash) keys, so no image library is needed"""
+    cache = OCRCache(**kwargs)
+    cache.make_key = lambda crop: crop
+    return cache
+
+
+def test_hash_tolerance_and_size_buckets():
+    print("🧪 Testing hash tolerance and size buckets...")
+    assert hamming(0b1011, 0b0010) == 2
+    exact = keyed_cache(max_distance=0)
+    exact.store(((6, 2), 0b1111), READ_A)
+    assert exact.lookup(((6, 2), 0b1111))[0] == READ_A
+    assert exact.lookup(((6, 2), 0b1110))[0] is None  # one bit off is a miss without tolerance
+
+    tolerant = keyed_cache(max_distance=2)
+    tolerant.store(((6, 2), 0b1111), READ_A)
+    tolerant.store(((6, 2), 0b0000), READ_B)
+    assert tolerant.lookup(((6, 2), 0b1110))[0] == READ_A
+    assert tolerant.lookup(((6, 2), 0b0001))[0] == READ_B  # closest hash wins
+    assert tolerant.lookup(((6, 2), 0b110000))[0] == READ_B  # two bits: still within tolerance
+    assert tolerant.lookup(((6, 2), 0b111100))[0] is None
+    assert tolerant.lookup(((7, 2), 0b1111))[0] is None  # same hash, different plate size
+    stats = tolerant.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (3, 2, 2), stats
+    assert stats['hit_rate'] == 3 / 5
+    print("✅ Hash tolerance passed")
+
+
+def test_lru_eviction_and_verification():
+    print("🧪 Testing LRU eviction and verification...")
+    cache = keyed_cache(capacity=2)
+    cache.store(((1, 1), 1), READ_A)
+    cache.store(((1, 1), 2), READ_B)
+    assert cache.lookup(((1, 1), 1))[0] == READ_A  # touch 1, so 2 is the oldest
+    cache.store(((1, 1), 3), READ_A)
+    assert cache.lookup(((1, 1), 2))[0] is None
+    assert cache.lookup(((1, 1), 1))[0] == READ_A
+    assert cache.stats()['evictions'] == 1
+
+    verified = keyed_cache(verify_every=2)
+    key = ((1, 1), 7)
+    verified.store(key, READ_A)
+    assert verified.lookup(key)[0] == READ_A
+    read, key = verified.lookup(key)  # every 2nd match runs the model again
+    assert read is None
+    verified.store(key, READ_B)  # the model now disagrees with the cached read
+    assert verified.lookup(key)[0] == READ_B
+    stats = verified.stats()
+    assert (stats['verified'], stats['mismatches'], stats['hits'], stats['misses']) == (1, 1, 2, 1), stats
+
+    verified.clear()
+    assert verified.stats()['size'] == 0 and verified.lookup(key)[0] is None
+    print("✅ LRU eviction and verification passed")
+
+
+def test_dhash_ignores_brightness():
+    print("🧪 Testing dHash...")
+    try:
+        import numpy as np
+    except ImportError:
+        raise unittest.SkipTest("numpy/cv2 are not installed")
+    gradient = np.tile(np.arange(0, 200, 2, dtype=np.uint8), (30, 1))
+    flipped = gradient[:, ::-1].copy()
+    assert dhash(gradient) == dhash(np.clip(gradient.astype(int) + 40, 0, 255).astype(np.uint8))
+    assert hamming(dhash(gradient), dhash(flipped)) > 32
+    assert dhash(gradient, hash_size=4).bit_length() <= 16
+    print("✅ dHash passed")
+
+
+if __name__ == "__main__":
+    test_hash_tolerance_and_size_buckets()
+    test_lru_eviction_and_verification()
+    test_dhash_ignores_brightness()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared recognition pipeline helpers
+"""
+
+from plate_pipeline import (CHAR_MAP, CATEGORY_NAMES, CHAR_CATEGORIES, DEFAULT_FILTER_SETTINGS,
+                            DetectionRecord, assemble_plate_text, ordered_class_ids, validate_plate,
+                            recognize_crops)
+from ocr_cascade import CascadeStats, recognize_cascade
+
+
+class FakeTensor(list):
+    """Stands in for a torch tensor: supports len() and tolist()"""
+
+    def tolist(self):
+        return list(self)
+
+
+class FakeBoxes:
+    def __init__(self, chars):
+        # chars: (x1, class_id, conf)
+        self.xyxy = FakeTensor([[x, 0, x + 10, 20] for x, _, _ in chars])
+        self.cls = FakeTensor([c for _, c, _ in chars])
+        self.conf = FakeTensor([p for _, _, p in chars])
+
+
+class FakeResult:
+    def __init__(self, chars):
+        self.boxes = FakeBoxes(chars)
+
+
+class FakeRecognizer:
+    """Returns canned character boxes, one result per input crop"""
+
+    def __init__(self, per_crop):
+        self.per_crop = per_crop
+        self.calls = 0
+
+    def __call__(self, crops, **kwargs):
+        self.calls += 1
+        return [FakeResult(self.per_crop[i]) for i in range(len(crops))]
+
+
+def test_assemble_orders_letters_then_digits():
+    # Chatto(44) Metro(10) Ga(18) then 1 3 8 7 0 7, shuffled horizontally
+    chars = [(50, 10, 0.9), (10, 44, 0.9), (90, 18, 0.9),
+             (200, 1, 0.9), (210, 3, 0.9), (220, 8, 0.9), (230, 7, 0.9), (240, 0, 0.9), (250, 7, 0.9)]
+    assert assemble_plate_text(chars, CHAR_MAP) == "ChattoMetroGa 138707"
+
+
+def test_class_tables_and_detection_record():
+    assert [CATEGORY_NAMES[CHAR_CATEGORIES[c]] for c in (7, 10, 18, 49, 101)] == \
+        ['digit', 'metro', 'series', 'district', 'series']
+    chars = [(50, 10, 0.9), (10, 49, 0.9), (120, 2, 0.8), (110, 1, 0.8), (300, 250, 0.5)]
+    assert ordered_class_ids(chars) == [49, 10, 250, 1, 2]
+    assert assemble_plate_text(chars) == "DhakaMetro? 12"
+
+    record = DetectionRecord(ordered_class_ids(chars[:4]), 1736951425.0, confidence=0.85,
+                             box=(10, 20, 110, 60), filter_pattern='standard')
+    assert record.plate == "DhakaMetro 12"
+    assert record.class_ids.itemsize == 2 and record.box.itemsize == 4
+    exported = record.to_dict()
+    assert exported['plate'] == "DhakaMetro 12"
+    assert exported['confidence'] == 0.85
+    assert exported['timestamp'] == record.time_text()
+    assert 'evidence_crop' not in exported and 'source' not in exported
+    located = DetectionRecord(record.class_ids, record.timestamp, source='/videos/gate.mp4',
+                              frame_number=121, media_time=4.0).to_dict()
+    assert (located['source'], located['frame_number'], located['media_time']) == ('/videos/gate.mp4', 121, 4.0)
+
+    # Text comes from the char map the ids were produced with, not the default one
+    custom_map = dict(CHAR_MAP)
+    custom_map[10] = 'Mahanagar'
+    assert DetectionRecord(record.class_ids, record.timestamp, char_map=custom_map).plate == "DhakaMahanagar 12"
+    assert record.plate == "DhakaMetro 12"
+
+
+def test_validate_plate_matches_gui_filter():
+    settings = dict(DEFAULT_FILTER_SETTINGS)
+    assert validate_plate("ChattoMetroGa 138707", settings)
+    assert not validate_plate("Chatto 13", settings)
+
+    settings['allow_multiple_patterns'] = True
+    assert validate_plate("Chatto 13", settings)
+    assert validate_plate("DhakaMetro 115636", settings)
+    assert not validate_plate("Metro 123456", settings)
+
+    settings['enabled'] = False
+    assert validate_plate("anything", settings)
+
+
+def test_recognize_crops_single_batched_call():
+    recognizer = FakeRecognizer([
+        [(10, 49, 0.8), (40, 10, 0.6), (100, 1, 0.7), (110, 2, 0.9)],
+        [(10, 49, 0.8)],  # too short
+    ])
+    reads = recognize_crops(recognizer, ['crop-a', 'crop-b'], conf=0.25, image_size=640)
+    assert recognizer.calls == 1
+    assert reads[0][0] == "DhakaMetro 12"
+    assert abs(reads[0][1] - 0.75) < 1e-9
+    assert reads[1][0] == ''
+
+
+def test_cascade_escalates_only_uncertain_reads():
+    fast = FakeRecognizer([
+        [(10, 49, 0.9), (40, 10, 0.9), (100, 1, 0.9), (110, 2, 0.9)],  # DhakaMetro 12, confident
+        [(10, 49, 0.3), (40, 10, 0.3), (100, 1, 0.3), (110, 7, 0.3)],  # low confidence
+    ])
+    escalation = FakeRecognizer([
+        [(10, 49, 0.9), (40, 10, 0.9), (100, 1, 0.9), (110, 2, 0.9)],
+    ])
+    stats = CascadeStats()
+    reads = recognize_cascade(fast, escalation, ['crop-a', 'crop-b'], conf=0.25, image_size=640,
+                              min_confidence=0.6, stats=stats)
+    assert [r[0] for r in reads] == ["DhakaMetro 12", "DhakaMetro 12"]
+    snapshot = stats.snapshot()
+    assert snapshot['calls'] == {'n': 1, 's': 1}
+    assert snapshot['crops'] == {'n': 2, 's': 1}
+    assert snapshot['reasons'] == {'low_confidence': 1}
+    assert snapshot['changed'] == 1
+
+
+def test_cascade_escalates_on_filter_and_history():
+    confident = [(10, 49, 0.9), (40, 10, 0.9), (100, 1, 0.9), (110, 2, 0.9)]
+    fast = FakeRecognizer([confident])
+    escalation = FakeRecognizer([[]])  # empty escalated read keeps the fast read
+    stats = CascadeStats()
+
+    reads = recognize_cascade(fast, escalation, ['crop'], 0.25, 640, stats=stats,
+                              validate=lambda text: False)
+    assert reads[0][0] == "DhakaMetro 12"
+    reads = recognize_cascade(fast, escalation, ['crop'], 0.25, 640, stats=stats,
+                              history=["DhakaMetro 13"] * 3)
+    recognize_cascade(fast, escalation, ['crop'], 0.25, 640, stats=stats,
+                      history=["DhakaMetro 12"] * 3)
+    snapshot = stats.snapshot()
+    assert snapshot['reasons'] == {'invalid': 1, 'disagrees': 1}
+    assert snapshot['calls'] == {'n': 3, 's': 2}
+    assert snapshot['changed'] == 0
+
+
+def test_cascade_history_applies_to_first_plate_only():
+    plate_a = [(10, 49, 0.9), (40, 10, 0.9), (100, 1, 0.9), (110, 2, 0.9)]  # DhakaMetro 12
+    plate_b = [(10, 49, 0.9), (40, 10, 0.9), (100, 3, 0.9), (110, 4, 0.9)]  # DhakaMetro 34
+    stats = CascadeStats()
+    # The history tracks the first plate; the second plate in the same frame must not escalate
+    reads = recognize_cascade(FakeRecognizer([plate_a, plate_b]), FakeRecognizer([]), ['crop-a', 'crop-b'],
+                              0.25, 640, stats=stats, history=["DhakaMetro 12"] * 3)
+    assert [r[0] for r in reads] == ["DhakaMetro 12", "DhakaMetro 34"]
+    assert stats.snapshot()['escalated'] == 0
+    # An unreadable first crop leaves the history to the first plate that was read
+    escalation = FakeRecognizer([[], plate_a])
+    recognize_cascade(FakeRecognizer([[], plate_b]), escalation, ['blur', 'crop-b'],
+                      0.25, 640, stats=stats, history=["DhakaMetro 12"] * 3)
+    assert stats.snapshot()['reasons'] == {'low_confidence': 1, 'disagrees': 1}
+
+
+if __name__ == "__main__":
+    test_assemble_orders_letters_then_digits()
+    test_class_tables_and_detection_record()
+    test_validate_plate_matches_gui_filter()
+    test_recognize_crops_single_batched_call()
+    test_cascade_escalates_only_uncertain_reads()
+    test_cascade_escalates_on_filter_and_history()
+    test_cascade_history_applies_to_first_plate_only()
+    print("✅ Pipeline tests passed")
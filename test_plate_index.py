@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent plate index
+"""
+
+import os
+import sqlite3
+import tempfile
+
+from plate_index import FUZZY_CANDIDATES, PlateIndex, confusion_skeleton, fuzzy_variants
+
+
+def make_index(path):
+    index = PlateIndex(path)
+    index.add_many([
+        ("DhakaMetroGa 123456", "/videos/gate.mp4", 120, 4.0, 1000.0, 0.9),
+        ("DhakaMetroGha 123456", "/videos/gate.mp4", 900, 30.0, 1001.0, 0.8),   # aspiration misread
+        ("DhakaMetroGa 123457", "/videos/road.mp4", 45, 1.5, 1002.0, 0.85),     # one digit off
+        ("DhakaMetroGa 128457", "/videos/road.mp4", 300, 10.0, 1003.0, 0.7),    # two digits off
+        ("ChattoMetroKa 112233", "/videos/road.mp4", 600, 20.0, 1004.0, 0.95),
+    ])
+    return index
+
+
+def test_skeleton_and_variants():
+    print("🧪 Testing confusion skeletons...")
+    assert confusion_skeleton("dhakametrogha123") == confusion_skeleton("dakametroga123")
+    assert confusion_skeleton("chattochha1") == "chattocha1"
+    assert fuzzy_variants("ka12") == ["ka12", "ka1?", "ka?2"]
+    print("✅ Skeleton tests passed")
+
+
+def test_exact_prefix_fuzzy():
+    print("🧪 Testing plate index queries...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'index.sqlite')
+        index = make_index(path)
+        assert len(index) == 5
+
+        exact = index.search("dhaka metro ga 123456", mode='exact')
+        assert [(h.source, h.frame_number, h.media_time) for h in exact] == [("/videos/gate.mp4", 120, 4.0)]
+
+        prefix = index.search("DhakaMetroGa 12", mode='prefix')
+        assert [h.frame_number for h in prefix] == [120, 45, 300]
+        assert index.search("chatto", mode='prefix')[0].plate == "ChattoMetroKa 112233"
+
+        fuzzy = index.search("DhakaMetroGa 123456", mode='fuzzy')
+        assert [h.frame_number for h in fuzzy] == [120, 900, 45], fuzzy  # not the two-digit miss
+        assert fuzzy[0].distance == 0
+        assert index.search("", mode='fuzzy') == []
+        index.close()
+
+        # Persistent: a new process sees the same rows and keeps adding sources
+        reopened = PlateIndex(path)
+        reopened.add("ChattoMetroKa 112233", "/videos/new.mp4", 7, 0.2, 1005.0)
+        assert [h.source for h in reopened.search("chattometroka112233", mode='exact')] == \
+            ["/videos/road.mp4", "/videos/new.mp4"]
+        reopened.close()
+    print("✅ Plate index tests passed")
+
+
+def test_fuzzy_ranks_plates_before_reads():
+    print("🧪 Testing fuzzy ranking with a frequently seen neighbour...")
+    with tempfile.TemporaryDirectory() as tmp:
+        index = PlateIndex(os.path.join(tmp, 'index.sqlite'))
+        # A parked car one digit away is read every frame before the plate being looked for shows up
+        index.add_many([("DhakaMetroGa 123457", "/videos/lot.mp4", i, i / 25, 1000.0 + i, 0.9)
+                        for i in range(40)])
+        index.add("DhakaMetroGa 123456", "/videos/lot.mp4", 500, 20.0, 2000.0, 0.8)
+        hits = index.search("DhakaMetroGa 123456", mode='fuzzy', limit=5)
+        assert len(hits) == 5
+        assert (hits[0].frame_number, hits[0].distance) == (500, 0), hits[0]
+        assert [h.frame_number for h in hits[1:]] == [0, 1, 2, 3]
+
+        # Variants are stored per distinct plate, and picking candidates never reads the reads table
+        stored = index.conn.execute("SELECT COUNT(*) FROM fuzzy").fetchone()[0]
+        variants = fuzzy_variants("dhakametroga123456")
+        assert stored == 2 * len(variants), stored  # not 41 reads' worth
+        plan = index.conn.execute("EXPLAIN QUERY PLAN " + FUZZY_CANDIDATES.format(marks=", ".join("?" * len(variants))),
+                                  variants).fetchall()
+        assert all('reads' not in row[-1] for row in plan), plan
+        index.close()
+    print("✅ Fuzzy ranking passed")
+
+
+def test_migrates_per_read_variants():
+    print("🧪 Testing migration of an older fuzzy table...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'index.sqlite')
+        make_index(path).close()
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.execute("DROP TABLE fuzzy")
+            conn.execute("CREATE TABLE fuzzy (variant TEXT NOT NULL, read_id INTEGER NOT NULL, "
+                         "PRIMARY KEY (variant, read_id)) WITHOUT ROWID")
+        conn.close()
+        index = PlateIndex(path)
+        assert [h.frame_number for h in index.search("DhakaMetroGa 123456", mode='fuzzy')] == [120, 900, 45]
+        index.close()
+    print("✅ Fuzzy table migration passed")
+
+
+if __name__ == "__main__":
+    test_skeleton_and_variants()
+    test_exact_prefix_fuzzy()
+    test_fuzzy_ranks_plates_before_reads()
+    test_migrates_per_read_variants()
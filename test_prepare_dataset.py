@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for the dataset preparation tool
+"""
+
+import os
+import tempfile
+
+from prepare_dataset import MANIFEST, index_dataset, prepare, split_samples
+
+
+def make_source(root, count=20):
+    for i in range(count):
+        with open(os.path.join(root, f"img{i:03d}.jpg"), 'wb') as f:
+            f.write(b"fake image %d" % i)
+        with open(os.path.join(root, f"img{i:03d}.txt"), 'w') as f:
+            f.write(f"{i % 4} 0.5 0.5 0.2 0.1\n")
+    with open(os.path.join(root, "unlabeled.jpg"), 'wb') as f:
+        f.write(b"no label")
+
+
+def test_split_is_deterministic_and_stratified():
+    with tempfile.TemporaryDirectory() as source:
+        make_source(source)
+        samples = index_dataset(source)
+        assert len(samples) == 20
+        first = split_samples(samples, 0.2, seed=7, stratify=True)
+        assert first == split_samples(list(reversed(samples)), 0.2, seed=7, stratify=True)
+        assert list(first.values()).count('val') == 4
+        # One validation image per class
+        val_classes = sorted(s.classes[0] for s in samples if first[s.stem] == 'val')
+        assert val_classes == [0, 1, 2, 3]
+
+
+def test_prepare_links_files_and_resumes():
+    with tempfile.TemporaryDirectory() as source, tempfile.TemporaryDirectory() as output:
+        make_source(source)
+        counts = prepare(source, output, seed=1, workers=4)
+        assert counts['train'] + counts['val'] == 20
+        assert len(os.listdir(os.path.join(output, 'images', 'val'))) == counts['val']
+        assert len(os.listdir(os.path.join(output, 'labels', 'train'))) == counts['train']
+        assert os.path.exists(os.path.join(source, "img000.jpg"))  # source untouched
+
+        # Simulate an interrupted run: forget the last five entries
+        manifest_path = os.path.join(output, MANIFEST)
+        with open(manifest_path) as f:
+            lines = f.readlines()
+        with open(manifest_path, 'w') as f:
+            f.writelines(lines[:-5])
+        counts = prepare(source, output, seed=1, workers=4)
+        assert counts['skipped'] == 15
+        assert counts.get('train', 0) + counts.get('val', 0) == 5
+
+        try:
+            prepare(source, output, seed=2)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("resuming with a different seed must fail")
+
+
+if __name__ == "__main__":
+    test_split_is_deterministic_and_stratified()
+    test_prepare_links_files_and_resumes()
+    print("✅ Dataset preparation tests passed")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script for the recognition server's batching, metrics and request validation
+"""
+
+import http.client
+import json
+import queue
+import threading
+import time
+import unittest
+
+try:
+    import cv2  # noqa: F401 (recognition_server decodes request bodies with cv2)
+except ImportError:
+    raise unittest.SkipTest("cv2 is not installed")
+
+from recognition_server import DynamicBatcher, RecognitionRequest, ServerMetrics, create_server
+
+
+class FakeService:
+    """process_batch stand-in that records batch sizes and echoes each request's image"""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def process_batch(self, requests):
+        self.batches.append(len(requests))
+        if self.fail:
+            raise RuntimeError("model exploded")
+        for request in requests:
+            request.result = [{'plate': request.image}]
+
+
+def test_batcher_coalesces_and_times_out():
+    print("🧪 Testing dynamic batching...")
+    service = FakeService()
+    metrics = ServerMetrics()
+    batcher = DynamicBatcher([service], metrics, max_batch=4, max_wait_ms=200.0)
+    try:
+        # Six requests queued together: one full batch, then the rest after max_wait
+        requests = [batcher.submit(RecognitionRequest(f"plate-{i}", 'crop')) for i in range(6)]
+        for request in requests:
+            assert request.done.wait(5)
+        assert service.batches == [4, 2], service.batches
+        assert [r.result[0]['plate'] for r in requests] == [f"plate-{i}" for i in range(6)]
+
+        # A lone request waits at most max_wait for company
+        start = time.perf_counter()
+        request = batcher.submit(RecognitionRequest("alone", 'crop'))
+        assert request.done.wait(5)
+        assert 0.15 < time.perf_counter() - start < 2.0
+        assert service.batches[-1] == 1
+    finally:
+        batcher.stop()
+    snapshot = metrics.snapshot()
+    assert snapshot['batches'] == 3 and snapshot['batch_size_histogram'] == {'1': 1, '2': 1, '4': 1}
+    assert abs(snapshot['mean_batch_size'] - 7 / 3) < 1e-9
+    print("✅ Dynamic batching passed")
+
+
+def test_batcher_errors_and_saturation():
+    print("🧪 Testing batch errors and a full queue...")
+    batcher = DynamicBatcher([FakeService(fail=True)], ServerMetrics(), max_batch=2, max_wait_ms=1.0)
+    try:
+        request = batcher.submit(RecognitionRequest("x", 'crop'))
+        assert request.done.wait(5)
+        assert request.error == "model exploded" and request.result is None
+    finally:
+        batcher.stop()
+    stopped = DynamicBatcher([], ServerMetrics(), queue_size=1)  # no workers draining the queue
+    stopped.submit(RecognitionRequest("a", 'crop'))
+    try:
+        stopped.submit(RecognitionRequest("b", 'crop'))
+        raise AssertionError("queue accepted more than queue_size requests")
+    except queue.Full:
+        pass
+    print("✅ Batch errors passed")
+
+
+def test_metrics_snapshot():
+    print("🧪 Testing server metrics...")
+    metrics = ServerMetrics(rate_window=10.0)
+    for i in range(100):
+        metrics.record_request((i + 1) / 1000.0, ok=i % 10 != 0)
+    metrics.record_rejected()
+    metrics.record_batch(8, 0.02, [0.001] * 8)
+    snapshot = metrics.snapshot(queue_depth=3)
+    assert (snapshot['requests'], snapshot['errors'], snapshot['rejected']) == (100, 10, 1)
+    assert snapshot['queue_depth'] == 3
+    assert snapshot['throughput_rps'] == 10.0
+    assert snapshot['latency_ms'] == {'p50': 51.0, 'p95': 96.0, 'p99': 100.0}, snapshot['latency_ms']
+    assert abs(snapshot['queue_wait_ms']['p99'] - 1.0) < 1e-9
+    assert abs(snapshot['mean_batch_inference_ms'] - 20.0) < 1e-9
+    empty = ServerMetrics().snapshot()
+    assert empty['latency_ms'] == {'p50': 0.0, 'p95': 0.0, 'p99': 0.0} and empty['mean_batch_size'] == 0.0
+    print("✅ Server metrics passed")
+
+
+def test_content_length_validation():
+    print("🧪 Testing request body validation...")
+    server = create_server([FakeService()], port=0, max_body_bytes=1024)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def post(headers, body=b''):
+        conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+        conn.putrequest('POST', '/recognize?mode=crop')
+        for name, value in headers.items():
+            conn.putheader(name, value)
+        conn.endheaders(body)
+        response = conn.getresponse()
+        payload = json.loads(response.read())
+        conn.close()
+        return response.status, payload
+
+    try:
+        assert post({})[0] == 411
+        assert post({'Content-Length': 'lots'})[0] == 400
+        assert post({'Content-Length': '-5'})[0] == 400
+        assert post({'Content-Length': '4096'})[0] == 413  # rejected before reading the body
+        status, payload = post({'Content-Length': '4'}, b'nope')
+        assert status == 400 and payload['error'] == 'body must be an encoded image'
+    finally:
+        server.shutdown()
+        server.batcher.stop()
+        server.server_close()
+    print("✅ Request body validation passed")
+
+
+if __name__ == "__main__":
+    test_batcher_coalesces_and_times_out()
+    test_batcher_errors_and_saturation()
+    test_metrics_snapshot()
+    test_content_length_validation()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the asyncio source -> inference -> sink runtime
+"""
+
+import threading
+import time
+
+from async_runtime import AsyncRuntime, CaptureSource
+
+
+class FakeCapture:
+    """Minimal cv2.VideoCapture stand-in producing numbered frames"""
+
+    def __init__(self, frames, delay=0.0):
+        self.frames = frames
+        self.delay = delay
+        self.position = 0
+        self.released = False
+        self.decoded = 0
+
+    def grab(self):
+        if self.position >= self.frames:
+            return False
+        self.position += 1
+        return True
+
+    def read(self):
+        if self.delay:
+            time.sleep(self.delay)
+        if self.position >= self.frames:
+            return False, None
+        self.position += 1
+        self.decoded += 1
+        return True, self.position
+
+    def release(self):
+        self.released = True
+
+
+def test_file_source_processes_every_frame_in_order():
+    cap = FakeCapture(20)
+    results, events = [], []
+    runtime = AsyncRuntime(lambda item: item.frame * 10)
+    runtime.add_source(CaptureSource('video', cap, frame_skip=2))
+    runtime.add_result_callback(results.append)
+    runtime.add_sink('collect', events.append)
+    # Publish from the inference thread, like save_detection does
+    runtime.process = lambda item: (runtime.publish({'frame': item.frame}), item.frame * 10)[1]
+    runtime.start()
+    assert runtime.finished.wait(5.0)
+
+    assert results == [f * 10 for f in range(2, 21, 2)]
+    assert [e['frame'] for e in events] == list(range(2, 21, 2))
+    assert cap.decoded == 10, "skipped frames should only be grabbed"
+    assert cap.released
+    assert runtime.stats()['tasks']['inference']['count'] == 10
+
+
+def test_stop_cancels_source_and_releases_capture():
+    cap = FakeCapture(10_000, delay=0.001)
+    runtime = AsyncRuntime(lambda item: item.frame)
+    runtime.add_source(CaptureSource('camera', cap, live=True))
+    finished = threading.Event()
+    runtime.on_finished = finished.set
+    runtime.start()
+    runtime.ready.wait(2.0)
+    time.sleep(0.05)
+    runtime.stop(wait=True, timeout=5.0)
+
+    assert finished.is_set()
+    assert cap.released
+    assert cap.position < 10_000
+
+
+if __name__ == "__main__":
+    test_file_source_processes_every_frame_in_order()
+    test_stop_cancels_source_and_releases_capture()
+    print("✅ Runtime tests passed")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for tiled plate detection
+"""
+
+import unittest
+
+from tiled_detection import plan_tiles, merge_boxes, detect_tiled
+
+
+def covered(tiles, width, height, step=7):
+    """Every sampled pixel of the frame lies inside some tile"""
+    return all(any(x1 <= x < x2 and y1 <= y < y2 for x1, y1, x2, y2 in tiles)
+               for y in range(0, height, step) for x in range(0, width, step))
+
+
+def test_plan_tiles_covers_frame():
+    print("🧪 Testing tile planning...")
+    # Small frames are one tile
+    assert plan_tiles(800, 600, tile_size=640) == [(0, 0, 800, 600)]
+
+    tiles = plan_tiles(3840, 2160, tile_size=640, overlap=0.2)
+    assert len(tiles) == 8 * 4, len(tiles)
+    assert covered(tiles, 3840, 2160)
+    assert all(x2 - x1 == 640 and y2 - y1 == 640 for x1, y1, x2, y2 in tiles)
+    # Edge tiles are shifted inside the frame instead of running past it
+    assert max(x2 for _, _, x2, _ in tiles) == 3840 and max(y2 for _, _, _, y2 in tiles) == 2160
+    xs = sorted({x1 for x1, _, _, _ in tiles})
+    assert all(b - a <= 640 - 128 for a, b in zip(xs, xs[1:]))  # at least 20% overlap
+    print("✅ Tile planning passed")
+
+
+def test_plan_tiles_roi():
+    print("🧪 Testing tiles for a region of interest...")
+    tiles = plan_tiles(3840, 2160, tile_size=640, overlap=0.2, roi=(1000, 1500, 3000, 2400))
+    assert all(x1 >= 1000 and y1 >= 1500 and x2 <= 3000 and y2 <= 2160 for x1, y1, x2, y2 in tiles)
+    assert covered([(x1 - 1000, y1 - 1500, x2 - 1000, y2 - 1500) for x1, y1, x2, y2 in tiles], 2000, 660)
+    assert len(tiles) == 4 * 2, tiles
+    # Regions outside the frame or empty produce nothing
+    assert plan_tiles(1920, 1080, roi=(2000, 0, 2500, 500)) == []
+    assert plan_tiles(1920, 1080, roi=(100, 100, 100, 400)) == []
+    print("✅ ROI tiles passed")
+
+
+def test_merge_boxes():
+    print("🧪 Testing cross-tile merging...")
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        raise unittest.SkipTest("numpy is not installed")
+    assert merge_boxes([], []) == []
+    boxes = [
+        (100, 100, 200, 140),  # full plate
+        (102, 101, 201, 141),  # same plate from the overlapping tile
+        (100, 100, 140, 140),  # partial plate cut by a tile border, inside the full one
+        (500, 500, 600, 540),  # another plate
+    ]
+    keep = merge_boxes(boxes, [0.9, 0.8, 0.6, 0.7])
+    assert keep == [0, 3], keep
+    # The highest score wins among duplicates
+    keep = merge_boxes(boxes[:2] + boxes[3:], [0.6, 0.9, 0.7])
+    assert sorted(keep) == [1, 2], keep
+    # A partial box inside a kept one is dropped although their IoU is only 0.4
+    keep = merge_boxes([boxes[0], boxes[2]], [0.9, 0.5])
+    assert keep == [0]
+    # Boxes that only touch are both kept
+    assert sorted(merge_boxes([(0, 0, 10, 10), (10, 0, 20, 10)], [0.5, 0.5])) == [0, 1]
+    print("✅ Cross-tile merging passed")
+
+
+def test_detect_tiled_offsets_boxes():
+    print("🧪 Testing tiled detection...")
+    try:
+        import numpy as np
+    except ImportError:
+        raise unittest.SkipTest("numpy is not installed")
+
+    class Boxes:
+        def __init__(self, rows):
+            self.xyxy = np.array([r[:4] for r in rows], dtype=np.float32).reshape(-1, 4)
+            self.conf = np.array([r[4] for r in rows], dtype=np.float32)
+
+    def detector(crops, **kwargs):
+        # One plate at the same place in every tile
+        return [type('Result', (), {'boxes': Boxes([(10, 20, 90, 50, 0.9)])})() for _ in crops]
+
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    tiles = plan_tiles(1920, 1080)
+    boxes = detect_tiled(detector, frame, conf=0.25)
+    assert sorted(boxes) == sorted((x1 + 10, y1 + 20, x1 + 90, y1 + 50) for x1, y1, _, _ in tiles)
+    print("✅ Tiled detection passed")
+
+
+if __name__ == "__main__":
+    test_plan_tiles_covers_frame()
+    test_plan_tiles_roi()
+    test_merge_boxes()
+    test_detect_tiled_offsets_boxes()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for the annotated video recorder
+"""
+
+import tempfile
+import threading
+
+from video_recorder import VideoRecorder
+
+
+class FakeFrame:
+    def __init__(self, number, shape=(48, 64, 3)):
+        self.number = number
+        self.shape = shape
+
+
+class FakeWriters:
+    """open_writer stand-in that records which frames went into which file"""
+
+    def __init__(self, gate=None):
+        self.files = []
+        self.fps = []
+        self.gate = gate
+
+    def __call__(self, path, fps, size):
+        frames = []
+        self.files.append((path, size, frames))
+        self.fps.append(fps)
+        gate = self.gate
+
+        class Writer:
+            def write(self, frame):
+                if gate:
+                    gate.wait()
+                frames.append(frame.number)
+
+            def release(self):
+                pass
+        return Writer()
+
+
+def test_clip_with_pre_roll():
+    print("🧪 Testing clip recording with pre-roll...")
+    writers = FakeWriters()
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = VideoRecorder(tmp, mode='clips', fps=5, pre_roll=1.0, post_roll=1.0, open_writer=writers)
+        for i in range(10):
+            recorder.submit(FakeFrame(i), timestamp=100.0 + i * 0.2)
+        recorder.mark("DhakaMetro Ga 12", timestamp=101.8)
+        for i in range(10, 30):
+            recorder.submit(FakeFrame(i), timestamp=100.0 + i * 0.2)
+        recorder.close()
+        stats = recorder.stats()
+    # 5 pre-roll frames, then frames up to 1 s after the mark (t <= 102.8)
+    assert len(writers.files) == 1
+    path, size, frames = writers.files[0]
+    assert path.endswith("_DhakaMetro_Ga_12.mp4") and size == (64, 48)
+    assert frames == list(range(5, 15)), frames
+    assert stats['written'] == 10 and stats['files'] == 1 and stats['dropped'] == 0
+    print("✅ Clip recording passed")
+
+
+def test_never_blocks_when_encoder_is_slow():
+    print("🧪 Testing recorder backpressure...")
+    gate = threading.Event()
+    writers = FakeWriters(gate)
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = VideoRecorder(tmp, mode='full', fps=25, max_queue=8, open_writer=writers)
+        for i in range(100):
+            recorder.submit(FakeFrame(i))  # would hang here if submit waited for the encoder
+        stats = recorder.stats()
+        assert stats['skipped'] > 0 and stats['dropped'] > 0, stats
+        assert stats['queued'] <= 8
+        gate.set()
+        recorder.close()
+        stats = recorder.stats()
+    assert stats['written'] + stats['skipped'] + stats['dropped'] == 100, stats
+    assert writers.files[0][2] == sorted(writers.files[0][2])
+    print("✅ Backpressure passed")
+
+
+def test_pre_roll_does_not_crowd_out_the_clip():
+    print("🧪 Testing a pre-roll longer than the queue...")
+    gate = threading.Event()
+    writers = FakeWriters(gate)
+    with tempfile.TemporaryDirectory() as tmp:
+        # fps is only a starting guess: frames really arrive at 20 per second
+        recorder = VideoRecorder(tmp, mode='clips', fps=5, pre_roll=3.0, post_roll=1.0, max_queue=8,
+                                 open_writer=writers)
+        for i in range(100):
+            recorder.submit(FakeFrame(i), timestamp=100.0 + i * 0.05)
+        recorder.mark("DhakaMetro Ga 12", timestamp=104.95)
+        for i in range(100, 104):  # encoder is stuck on the pre-roll meanwhile
+            recorder.submit(FakeFrame(i), timestamp=100.0 + i * 0.05)
+        stats = recorder.stats()
+        assert (stats['queued'], stats['skipped'], stats['dropped']) == (4, 0, 0), stats
+        gate.set()
+        recorder.close()
+    assert writers.files[0][2] == list(range(40, 104))  # 3 s of pre-roll at the measured 20 FPS
+    assert abs(writers.fps[0] - 20.0) < 0.01, writers.fps
+    print("✅ Pre-roll budget passed")
+
+
+def test_full_session_uses_measured_rate():
+    print("🧪 Testing the measured frame rate...")
+    writers = FakeWriters()
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = VideoRecorder(tmp, mode='full', open_writer=writers)
+        for i in range(30):
+            recorder.submit(FakeFrame(i), timestamp=100.0 + i * 0.1)
+        recorder.close()
+        stats = recorder.stats()
+    assert abs(writers.fps[0] - 10.0) < 0.01, writers.fps  # not the 25 FPS default
+    assert writers.files[0][2] == list(range(30))
+    assert stats['written'] == 30
+    print("✅ Measured frame rate passed")
+
+
+if __name__ == "__main__":
+    test_clip_with_pre_roll()
+    test_never_blocks_when_encoder_is_slow()
+    test_pre_roll_does_not_crowd_out_the_clip()
+    test_full_session_uses_measured_rate()
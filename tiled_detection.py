@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Sliced (tiled) plate detection for high-resolution cameras
+Small, distant plates vanish when a 4K frame is downscaled to the detector's input size.
+Tiled mode splits the frame (or a region of interest) into overlapping detector-sized tiles,
+runs them through the detector as one batch and merges the boxes with cross-tile NMS.
+"""
+
+import math
+
+
+def _axis_starts(length, tile, overlap_px):
+    """Tile start offsets covering [0, length) with at least overlap_px overlap"""
+    if length <= tile:
+        return [0]
+    count = math.ceil((length - overlap_px) / (tile - overlap_px))
+    step = (length - tile) / (count - 1)
+    return [int(round(i * step)) for i in range(count)]
+
+
+def plan_tiles(width, height, tile_size=640, overlap=0.2, roi=None, min_scale=1.25):
+    """Return tiles (x1, y1, x2, y2) for a frame; the count adapts to the frame/ROI size
+
+    Regions no larger than min_scale * tile_size are processed as a single tile, since the
+    detector's own downscaling loses little there.
+    """
+    rx1, ry1, rx2, ry2 = roi if roi else (0, 0, width, height)
+    rx1, ry1 = max(0, rx1), max(0, ry1)
+    rx2, ry2 = min(width, rx2), min(height, ry2)
+    region_w, region_h = rx2 - rx1, ry2 - ry1
+    if region_w <= 0 or region_h <= 0:
+        return []
+    if max(region_w, region_h) <= tile_size * min_scale:
+        return [(rx1, ry1, rx2, ry2)]
+
+    overlap_px = min(int(tile_size * overlap), tile_size - 1)
+    tiles = []
+    for y in _axis_starts(region_h, tile_size, overlap_px):
+        for x in _axis_starts(region_w, tile_size, overlap_px):
+            tiles.append((rx1 + x, ry1 + y,
+                          rx1 + min(x + tile_size, region_w), ry1 + min(y + tile_size, region_h)))
+    return tiles
+
+
+def merge_boxes(boxes, scores, iou_threshold=0.5, containment_threshold=0.8):
+    """Cross-tile NMS: keep the highest-scoring box and drop overlapping ones
+
+    Besides IoU, a box mostly contained in a kept box is dropped too: a plate cut by a tile
+    border shows up as a smaller partial box inside the full one from the neighbouring tile.
+    """
+    if len(boxes) == 0:
+        return []
+    import numpy as np
+
+    boxes = np.asarray(boxes, dtype=np.float32)
+    scores = np.asarray(scores, dtype=np.float32)
+    areas = (boxes[:, 2] - boxes[:, 0]).clip(min=0) * (boxes[:, 3] - boxes[:, 1]).clip(min=0)
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(int(i))
+        rest = order[1:]
+        xx1 = np.maximum(boxes[i, 0], boxes[rest, 0])
+        yy1 = np.maximum(boxes[i, 1], boxes[rest, 1])
+        xx2 = np.minimum(boxes[i, 2], boxes[rest, 2])
+        yy2 = np.minimum(boxes[i, 3], boxes[rest, 3])
+        inter = (xx2 - xx1).clip(min=0) * (yy2 - yy1).clip(min=0)
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-6)
+        contained = inter / (np.minimum(areas[i], areas[rest]) + 1e-6)
+        order = rest[(iou <= iou_threshold) & (contained <= containment_threshold)]
+    return keep
+
+
+def detect_tiled(detector, frame, conf, tile_size=640, overlap=0.2, roi=None, iou_threshold=0.5):
+    """Detect plates tile by tile (one batched detector call); returns integer xyxy boxes"""
+    height, width = frame.shape[:2]
+    tiles = plan_tiles(width, height, tile_size, overlap, roi)
+    if not tiles:
+        return []
+
+    crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in tiles]
+    results = detector(crops, conf=conf, imgsz=tile_size, verbose=False)
+
+    boxes, scores = [], []
+    for (tx, ty, _, _), result in zip(tiles, results):
+        if not hasattr(result.boxes, 'xyxy') or len(result.boxes.xyxy) == 0:
+            continue
+        for (x1, y1, x2, y2), score in zip(result.boxes.xyxy.tolist(), result.boxes.conf.tolist()):
+            boxes.append((x1 + tx, y1 + ty, x2 + tx, y2 + ty))
+            scores.append(score)
+
+    if len(tiles) > 1:
+        keep = merge_boxes(boxes, scores, iou_threshold)
+        boxes = [boxes[i] for i in keep]
+    return [tuple(int(v) for v in box) for box in boxes]
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Annotated video recorder
+Writes the frames the GUI draws (plate boxes and text) to disk on a dedicated encoder thread
+behind a bounded queue, either the whole session or only clips around saved detections with a
+pre-roll buffer. It never blocks the caller: when the encoder falls behind, every other frame is
+skipped once the queue is half full, and frames are dropped when it is full. Files are written at
+the rate frames are actually submitted, measured from their timestamps.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+RECORD_MODES = ['clips', 'full']
+
+RATE_SAMPLES = 10  # frame intervals measured before a full-session file is opened
+
+
+def open_cv2_writer(path, fps, size, fourcc='mp4v'):
+    """cv2.VideoWriter for (width, height) frames; anything with write()/release() works as a writer"""
+    import cv2
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, size)
+    if not writer.isOpened():
+        raise RuntimeError(f"Could not open video writer for {path}")
+    return writer
+
+
+def fit_frame(frame, size):
+    """Resize a frame to the writer's (width, height) if the source size changed"""
+    if (frame.shape[1], frame.shape[0]) == size:
+        return frame
+    import cv2
+
+    return cv2.resize(frame, size)
+
+
+class VideoRecorder:
+    """Records annotated frames (whole session or clips around marks) off the detection thread"""
+
+    def __init__(self, output_dir, mode='clips', fps=25.0, pre_roll=3.0, post_roll=3.0, max_queue=64,
+                 open_writer=open_cv2_writer, extension='.mp4'):
+        if mode not in RECORD_MODES:
+            raise ValueError(f"Unknown recording mode: {mode}")
+        self.output_dir = output_dir
+        self.mode = mode
+        self.fps = fps if fps and fps > 0 else 25.0  # until the submit rate has been measured
+        self.pre_roll_seconds = pre_roll
+        self.post_roll = post_roll
+        self.max_queue = max_queue
+        self.open_writer = open_writer
+        self.extension = extension
+        os.makedirs(output_dir, exist_ok=True)
+
+        self.cond = threading.Condition()
+        self.items = deque()  # ('open', path) / ('frame', frame) / ('close',) for the encoder thread
+        self.queued_frames = 0
+        self.queued_pre_roll = 0  # buffered frames moved to the encoder; not limited by max_queue
+        # clips: frames before the next mark; full: frames held until the rate is known
+        self.pre_roll = deque(maxlen=max(1, int(round(pre_roll * self.fps))) if mode == 'clips' else RATE_SAMPLES)
+        self.last_timestamp = None
+        self.interval = None  # moving average of the time between submitted frames
+        self.rate_samples = 0
+        self.clip_until = None  # wall-clock end of the current clip (clips mode)
+        self.skip_next = False
+        self.closed = False
+
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.skipped = 0
+        self.files = 0
+        self.errors = 0
+        self.encode_seconds = 0.0
+
+        if mode == 'full':
+            self.items.append(('open', self._path('session')))
+        self.thread = threading.Thread(target=self._run, name="video-recorder", daemon=True)
+        self.thread.start()
+
+    def _path(self, label):
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        label = re.sub(r'\W+', '_', label).strip('_') or 'clip'
+        return os.path.join(self.output_dir, f"{stamp}_{label}{self.extension}")
+
+    # ------------------------------------------------------------ producers
+    def submit(self, frame, timestamp=None):
+        """Offer an annotated frame; returns True if it was queued for encoding (never blocks)"""
+        timestamp = timestamp or time.time()
+        with self.cond:
+            if self.closed:
+                return False
+            self.submitted += 1
+            self._measure(timestamp)
+            if self.mode == 'clips':
+                if self.clip_until is not None and timestamp > self.clip_until:
+                    self.clip_until = None
+                    self.items.append(('close',))
+                    self.cond.notify()
+                if self.clip_until is None:
+                    # Frames are not modified after drawing, so the pre-roll keeps references only
+                    self.pre_roll.append(frame)
+                    return False
+            elif self.rate_samples < RATE_SAMPLES and len(self.pre_roll) < RATE_SAMPLES:
+                self.pre_roll.append(frame)
+                return False
+            elif self.pre_roll:
+                self._queue_pre_roll()
+            return self._enqueue(frame)
+
+    def _measure(self, timestamp):
+        """Update the submit rate; in clips mode the pre-roll follows it (lock held)"""
+        if self.last_timestamp is not None:
+            interval = timestamp - self.last_timestamp
+            if 0 < interval < 5.0:  # pauses are not part of the frame rate
+                self.interval = interval if self.interval is None else 0.9 * self.interval + 0.1 * interval
+                self.rate_samples += 1
+                if self.mode == 'clips':
+                    size = max(1, int(round(self.pre_roll_seconds * self.frame_rate())))
+                    if size != self.pre_roll.maxlen:
+                        self.pre_roll = deque(self.pre_roll, maxlen=size)
+        self.last_timestamp = timestamp
+
+    def frame_rate(self):
+        """Measured submit rate, or the fps given at construction before there is a measurement"""
+        return 1.0 / self.interval if self.interval else self.fps
+
+    def _queue_pre_roll(self):
+        """Move buffered frames to the encoder (lock held)
+
+        They are already in memory, so they have their own budget instead of filling the queue
+        and causing the frames right after them to be dropped.
+        """
+        for frame in self.pre_roll:
+            self.items.append(('pre_roll', frame))
+        self.queued_pre_roll += len(self.pre_roll)
+        self.pre_roll.clear()
+        self.cond.notify()
+
+    def _enqueue(self, frame):
+        """Queue a frame, degrading to half rate at half capacity and dropping when full (lock held)"""
+        if self.queued_frames >= self.max_queue:
+            self.dropped += 1
+            return False
+        if self.queued_frames >= self.max_queue // 2:
+            self.skip_next = not self.skip_next
+            if self.skip_next:
+                self.skipped += 1
+                return False
+        else:
+            self.skip_next = False
+        self.items.append(('frame', frame))
+        self.queued_frames += 1
+        self.cond.notify()
+        return True
+
+    def mark(self, label='', timestamp=None):
+        """Start a clip (with the pre-roll) or extend the current one by post_roll seconds"""
+        if self.mode != 'clips':
+            return
+        timestamp = timestamp or time.time()
+        with self.cond:
+            if self.closed:
+                return
+            if self.clip_until is None:
+                self.items.append(('open', self._path(label)))
+                self._queue_pre_roll()
+            self.clip_until = max(self.clip_until or 0.0, timestamp + self.post_roll)
+
+    # --------------------------------------------------------------- encoder
+    def _run(self):
+        writer, path, size = None, None, None
+        while True:
+            with self.cond:
+                while not self.items and not self.closed:
+                    self.cond.wait()
+                if not self.items:
+                    break
+                item = self.items.popleft()
+                if item[0] == 'frame':
+                    self.queued_frames -= 1
+                elif item[0] == 'pre_roll':
+                    self.queued_pre_roll -= 1
+                fps = self.frame_rate()
+            try:
+                if item[0] in ('open', 'close'):
+                    if writer is not None:
+                        writer.release()
+                    writer, size = None, None
+                    path = item[1] if item[0] == 'open' else None
+                elif path is not None:
+                    frame = item[1]
+                    if writer is None:
+                        # Opened on the first frame, when the frame size is known
+                        size = (frame.shape[1], frame.shape[0])
+                        writer = self.open_writer(path, fps, size)
+                        with self.cond:
+                            self.files += 1
+                    start = time.perf_counter()
+                    writer.write(fit_frame(frame, size))
+                    with self.cond:
+                        self.encode_seconds += time.perf_counter() - start
+                        self.written += 1
+            except Exception as e:
+                with self.cond:
+                    self.errors += 1
+                print(f"Video recorder error: {e}")
+                writer, path = None, None  # skip the rest of this file
+        if writer is not None:
+            writer.release()
+
+    def stats(self):
+        """Counters for display in the GUI"""
+        with self.cond:
+            return {
+                'mode': self.mode,
+                'recording': self.mode == 'full' or self.clip_until is not None,
+                'submitted': self.submitted,
+                'written': self.written,
+                'queued': self.queued_frames,
+                'queued_pre_roll': self.queued_pre_roll,
+                'fps': self.frame_rate(),
+                'skipped': self.skipped,
+                'dropped': self.dropped,
+                'files': self.files,
+                'errors': self.errors,
+                'encode_fps': self.written / self.encode_seconds if self.encode_seconds else 0.0,
+            }
+
+    def close(self, timeout=10.0):
+        """Encode what is queued, finish the current file and stop the encoder thread"""
+        with self.cond:
+            if self.mode == 'full' and self.pre_roll:
+                self._queue_pre_roll()  # a session shorter than the rate measurement
+            self.closed = True
+            self.cond.notify()
+        self.thread.join(timeout)